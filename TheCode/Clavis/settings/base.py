@@ -7,7 +7,16 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 # ENVS
 SECRET_KEY = config("DJANGO_SECRET_KEY")
+# 정답 해시(HMAC) 키. SECRET_KEY 와 따로 두어 SECRET_KEY 를 바꿔도 정답 판정이 깨지지 않게 한다.
+# 이 키를 바꾸면 저장된 해시가 모두 맞지 않게 되므로 배포 직후 `manage.py rehash_answers` 를 실행해야 한다.
+ANSWER_HASH_KEY = config("ANSWER_HASH_KEY")
 GOOGLE_AUTH_CLIENT_ID = config("GOOGLE_AUTH_CLIENT_ID")
+GOOGLE_CERTS_URL = config("GOOGLE_CERTS_URL", default="https://www.googleapis.com/oauth2/v1/certs")
+ADMOB_VERIFIER_KEYS_URL = config(
+    "ADMOB_VERIFIER_KEYS_URL",
+    default="https://www.gstatic.com/admob/reward/verifier-keys.json",
+)
+ADMOB_VERIFIER_KEYS_TTL = config("ADMOB_VERIFIER_KEYS_TTL", default=86400, cast=int)
 
 DEBUG = config("DEBUG", default=False, cast=bool)
 
@@ -18,6 +27,90 @@ AWS_ACCESS_KEY_ID = config("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = config("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = config("AWS_REGION")
 AWS_STAGE_BUCKET = config("AWS_STAGE_BUCKET")
+STAGE_IMAGE_URL_BUCKET_SECONDS = config("STAGE_IMAGE_URL_BUCKET_SECONDS", default=600, cast=int)
+STAGE_IMAGE_URL_MIN_TTL = config("STAGE_IMAGE_URL_MIN_TTL", default=60, cast=int)
+
+# 공유 캐시 서버가 없으므로 Django 캐시는 프로세스마다 따로 두는 LocMemCache 다.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# 카탈로그 버전(contents.catalog)도 위 캐시에 있어서, 관리자 수정은 그 수정을 처리한 프로세스에만 바로 반영된다.
+# 다른 gunicorn 워커와 작업 워커(run_jobs)는 스냅샷이 이 시간(초)만큼 지나 다시 적재될 때 바뀐 정답/힌트를 본다.
+# 즉 이 값이 콘텐츠 수정이 모든 프로세스에 반영되기까지의 최대 지연이다.
+CATALOG_SNAPSHOT_TTL = config("CATALOG_SNAPSHOT_TTL", default=15, cast=int)
+CATALOG_MISS_RELOAD_INTERVAL = config("CATALOG_MISS_RELOAD_INTERVAL", default=5, cast=int)
+
+AUTH_USER_STATE_CACHE_TTL = config("AUTH_USER_STATE_CACHE_TTL", default=30, cast=int)
+AUTH_USER_STATE_CACHE_SIZE = config("AUTH_USER_STATE_CACHE_SIZE", default=10000, cast=int)
+
+REFRESH_TOKEN_PRUNE_BATCH_SIZE = config("REFRESH_TOKEN_PRUNE_BATCH_SIZE", default=1000, cast=int)
+REFRESH_TOKEN_PRUNE_SLEEP = config("REFRESH_TOKEN_PRUNE_SLEEP", default=0.1, cast=float)
+# run_jobs 워커가 이 간격(초)마다 정리 작업을 한 번 넣는다. 0 이면 넣지 않는다. (prune_refresh_tokens 명령을 cron 으로 돌릴 때)
+REFRESH_TOKEN_PRUNE_INTERVAL = config("REFRESH_TOKEN_PRUNE_INTERVAL", default=0, cast=int)
+REFRESH_TOKEN_REVOKED_RETENTION_DAYS = config("REFRESH_TOKEN_REVOKED_RETENTION_DAYS", default=7, cast=int)
+
+HINT_ACCESS_CACHE_TTL = config("HINT_ACCESS_CACHE_TTL", default=300, cast=int)
+HINT_ACCESS_CACHE_SIZE = config("HINT_ACCESS_CACHE_SIZE", default=10000, cast=int)
+ENTITLEMENT_CACHE_TTL = config("ENTITLEMENT_CACHE_TTL", default=60, cast=int)
+ENTITLEMENT_CACHE_SIZE = config("ENTITLEMENT_CACHE_SIZE", default=10000, cast=int)
+
+PROGRESS_SYNC_MAX_EVENTS = config("PROGRESS_SYNC_MAX_EVENTS", default=500, cast=int)
+
+LOGS_BATCH_MAX_BYTES = config("LOGS_BATCH_MAX_BYTES", default=256 * 1024, cast=int)
+LOGS_BATCH_MAX_DECOMPRESSED_BYTES = config("LOGS_BATCH_MAX_DECOMPRESSED_BYTES", default=2 * 1024 * 1024, cast=int)
+LOGS_BATCH_MAX_EVENTS = config("LOGS_BATCH_MAX_EVENTS", default=1000, cast=int)
+LOGS_BULK_CREATE_BATCH_SIZE = config("LOGS_BULK_CREATE_BATCH_SIZE", default=500, cast=int)
+LOGS_SINK_MODE = config("LOGS_SINK_MODE", default="async")
+LOGS_SINK_POLICY = config("LOGS_SINK_POLICY", default="drop")
+LOGS_SINK_MAX_SIZE = config("LOGS_SINK_MAX_SIZE", default=10000, cast=int)
+LOGS_SINK_FLUSH_INTERVAL = config("LOGS_SINK_FLUSH_INTERVAL", default=1.0, cast=float)
+LOGS_SINK_BLOCK_TIMEOUT = config("LOGS_SINK_BLOCK_TIMEOUT", default=0.05, cast=float)
+LOGS_PARTITION_MONTHS_AHEAD = config("LOGS_PARTITION_MONTHS_AHEAD", default=3, cast=int)
+LOGS_RETENTION_MONTHS = config("LOGS_RETENTION_MONTHS", default=12, cast=int)
+
+FUNNEL_CACHE_TTL = config("FUNNEL_CACHE_TTL", default=300, cast=int)
+
+# id 는 커밋 순서가 아니라 INSERT 순서로 정해지므로, 본 max(id) 는 이 시간이 지난 뒤에 반영한다. (analytics.rollups)
+ROLLUP_SAFETY_LAG_SECONDS = config("ROLLUP_SAFETY_LAG_SECONDS", default=300, cast=int)
+# 한 트랜잭션에서 반영하는 원본 행 수
+ROLLUP_CHUNK_SIZE = config("ROLLUP_CHUNK_SIZE", default=50000, cast=int)
+
+# 요청당 쿼리 수 예산. 키는 URL 패턴(fnmatch)이며 가장 긴 패턴이 적용된다. (utils.query_budget)
+QUERY_BUDGET_ENABLED = config("QUERY_BUDGET_ENABLED", default=False, cast=bool)
+# 예산을 넘으면 기본으로 오류를 낸다. 경고만 보려면 QUERY_BUDGET_RAISE=False 로 명시한다.
+QUERY_BUDGET_RAISE = config("QUERY_BUDGET_RAISE", default=True, cast=bool)
+QUERY_BUDGET_DEFAULT = config("QUERY_BUDGET_DEFAULT", default=10, cast=int)
+# API 예산은 토큰 상태 캐시가 비었을 때의 인증 조회 1개를 포함한다.
+QUERY_BUDGETS = {
+    "api/v1/*": 2,
+    "api/v1/auth/*/login/": 3,
+    "api/v1/auth/logout/all/": 3,
+    # 힌트 비트맵과 이용권을 둘 다 읽어야 하는 경우(이용권으로 열림, 잠김)
+    "api/v1/contents/*/hint/": 3,
+    "api/v1/logs/batch/": 3,
+    "api/v1/analytics/*": 3,
+    "admin/*": 8,
+}
+
+# 관리자 목록에서 정확히 세는 행 수 상한 (utils.admin.EstimatedCountPaginator)
+ADMIN_COUNT_LIMIT = config("ADMIN_COUNT_LIMIT", default=10000, cast=int)
+
+ADMOB_USER_ID_CACHE_TTL = config("ADMOB_USER_ID_CACHE_TTL", default=3600, cast=int)
+ADMOB_USER_ID_CACHE_SIZE = config("ADMOB_USER_ID_CACHE_SIZE", default=50000, cast=int)
+
+JOBS_BATCH_SIZE = config("JOBS_BATCH_SIZE", default=10, cast=int)
+JOBS_POLL_INTERVAL = config("JOBS_POLL_INTERVAL", default=1, cast=float)
+JOBS_MAX_ATTEMPTS = config("JOBS_MAX_ATTEMPTS", default=5, cast=int)
+JOBS_LOCK_TIMEOUT = config("JOBS_LOCK_TIMEOUT", default=300, cast=int)
+JOBS_RETRY_BASE_DELAY = config("JOBS_RETRY_BASE_DELAY", default=5, cast=int)
+JOBS_RETRY_MAX_DELAY = config("JOBS_RETRY_MAX_DELAY", default=3600, cast=int)
+# 끝난 작업의 보관 기간. 실패한 작업은 원인을 볼 수 있게 더 오래 둔다.
+JOBS_SUCCEEDED_RETENTION_DAYS = config("JOBS_SUCCEEDED_RETENTION_DAYS", default=7, cast=int)
+JOBS_FAILED_RETENTION_DAYS = config("JOBS_FAILED_RETENTION_DAYS", default=30, cast=int)
+JOBS_PRUNE_BATCH_SIZE = config("JOBS_PRUNE_BATCH_SIZE", default=1000, cast=int)
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -29,14 +122,18 @@ INSTALLED_APPS = [
     "rest_framework",
 
     "accounts",
+    "analytics",
     "commerce",
     "contents",
+    "jobs",
     "logs",
     "progress",
 ]
 
 
 MIDDLEWARE = [
+    # DEBUG 이고 QUERY_BUDGET_ENABLED 일 때만 동작한다.
+    "utils.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -48,7 +145,7 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
@@ -2,6 +2,7 @@ from .base import *
 from decouple import config, Csv
 
 DEBUG = True
+QUERY_BUDGET_ENABLED = config("QUERY_BUDGET_ENABLED", default=True, cast=bool)
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=Csv())
 
 DATABASES = {
@@ -5,6 +5,9 @@ urlpatterns = [
     path("api/v1/auth/", include("accounts.urls")),
     path("api/v1/contents/", include("contents.urls")),
     path("api/v1/commerce/", include("commerce.urls")),
+    path("api/v1/progress/", include("progress.urls")),
+    path("api/v1/logs/", include("logs.urls")),
+    path("api/v1/analytics/", include("analytics.urls")),
 
     path("admin/", admin.site.urls),
 ]
@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from .models import User, StoredRefreshToken
+from .tokens import hash_token
+from utils.admin import EstimatedCountMixin
 
 
 @admin.register(User)
@@ -118,7 +120,7 @@ class UserAdmin(admin.ModelAdmin):
 
 
 @admin.register(StoredRefreshToken)
-class StoredRefreshTokenAdmin(admin.ModelAdmin):
+class StoredRefreshTokenAdmin(EstimatedCountMixin, admin.ModelAdmin):
     ordering = ("-created_at",)
 
     class Media:
@@ -150,14 +152,16 @@ class StoredRefreshTokenAdmin(admin.ModelAdmin):
         "user__username",
         "user__email",
         "device_info",
-        "token",
+        "=token_hash",
     )
 
     list_per_page = 25
+    list_select_related = ("user",)
 
     readonly_fields = (
         "user",
-        "token",
+        "device_fingerprint",
+        "token_hash",
         "created_at",
     )
 
@@ -167,22 +171,31 @@ class StoredRefreshTokenAdmin(admin.ModelAdmin):
                 "user",
                 "session_scope",
                 "device_info",
+                "device_fingerprint",
             )
         }),
         ("토큰 상태", {
             "fields": (
                 "revoked",
+                "revoked_at",
                 "expires_at",
             )
         }),
         ("메타 정보", {
             "fields": (
-                "token",
+                "token_hash",
                 "created_at",
             )
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        # 원문 토큰으로 검색해도 digest 로 찾을 수 있게 한다.
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            queryset |= self.model.objects.filter(token_hash=hash_token(search_term.strip()))
+        return queryset, may_have_duplicates
+
     def _provider_color(self, provider):
         return {
             "apple": "#e74c3c",   # 빨강
@@ -0,0 +1,108 @@
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.models import User
+from accounts.tokens import TOKEN_VERSION_CLAIM, IS_ACTIVE_CLAIM
+from utils.cache import LocalTTLCache
+
+
+UserState = namedtuple("UserState", ["is_active", "token_version"])
+
+_user_states = LocalTTLCache(
+    ttl=settings.AUTH_USER_STATE_CACHE_TTL,
+    maxsize=settings.AUTH_USER_STATE_CACHE_SIZE,
+)
+
+
+def get_user_state(user_id):
+    state = _user_states.get(user_id)
+    if state is None:
+        row = (
+            User.objects.filter(pk=user_id)
+            .values_list("is_active", "token_version")
+            .first()
+        )
+        if row is None:
+            return None
+        state = UserState(*row)
+        _user_states.set(user_id, state)
+    return state
+
+
+def invalidate_user_state(user_id):
+    _user_states.delete(user_id)
+
+
+class ClaimsUser:
+    """
+    검증된 클레임만으로 만든 가벼운 사용자.
+    id 외의 속성에 처음 접근할 때 User 를 한 번 조회해 그 값을 돌려준다.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, is_active, token):
+        self.id = self.pk = user_id
+        self.is_active = is_active
+        self.token = token
+        self._user = None
+
+    def get_user(self):
+        if self._user is None:
+            self._user = User.objects.get(pk=self.id)
+        return self._user
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.get_user(), name)
+
+    def __eq__(self, other):
+        return isinstance(other, (ClaimsUser, User)) and self.pk == other.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return str(self.get_user())
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    매 요청마다 User 를 조회하는 대신 클레임과 워커 캐시의 (is_active, token_version) 으로 인증한다.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if not validated_token.get(IS_ACTIVE_CLAIM, True):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not state.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if validated_token.get(TOKEN_VERSION_CLAIM, 0) != state.token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        return ClaimsUser(user_id, state.is_active, validated_token)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def on_user_changed(sender, instance, **kwargs):
+    invalidate_user_state(instance.pk)
@@ -0,0 +1,126 @@
+import re
+import threading
+import time
+
+import requests
+from django.conf import settings
+from google.auth import jwt as google_jwt
+from requests.adapters import HTTPAdapter
+
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleCertStore:
+    """
+    Google ID Token 서명 인증서 캐시.
+    Cache-Control: max-age 만큼 보관하고, 만료 refresh_margin 초 전부터는
+    요청을 막지 않고 백그라운드 스레드에서 미리 갱신한다.
+    """
+
+    def __init__(
+        self,
+        certs_url,
+        session=None,
+        refresh_margin=300,
+        default_max_age=3600,
+        min_force_interval=30,
+        timeout=5,
+    ):
+        self.certs_url = certs_url
+        self.session = session or self._build_session()
+        self.refresh_margin = refresh_margin
+        self.default_max_age = default_max_age
+        self.min_force_interval = min_force_interval
+        self.timeout = timeout
+
+        self.fetch_count = 0
+
+        self._certs = None
+        self._expires_at = 0
+        self._fetched_at = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    @staticmethod
+    def _build_session():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _fetch(self):
+        response = self.session.get(self.certs_url, timeout=self.timeout)
+        response.raise_for_status()
+
+        match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else self.default_max_age
+
+        self.fetch_count += 1
+        self._certs = response.json()
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + max_age
+        return self._certs
+
+    def _refresh_in_background(self):
+        try:
+            with self._lock:
+                self._fetch()
+        except Exception as e:
+            print(f"Google cert refresh failed: {e}")
+        finally:
+            self._refreshing = False
+
+    def get_certs(self, force=False):
+        now = time.monotonic()
+        certs = self._certs
+
+        if certs is not None and not force and now < self._expires_at:
+            if now >= self._expires_at - self.refresh_margin and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._refresh_in_background, daemon=True).start()
+            return certs
+
+        with self._lock:
+            now = time.monotonic()
+            if self._certs is not None and now < self._expires_at:
+                # 알 수 없는 kid 로 강제 갱신을 반복 유도하지 못하도록 간격을 둔다.
+                if not force or now - self._fetched_at < self.min_force_interval:
+                    return self._certs
+            return self._fetch()
+
+
+class GoogleIdTokenVerifier:
+    def __init__(self, cert_store, audience, clock_skew_in_seconds=0):
+        self.cert_store = cert_store
+        self.audience = audience
+        self.clock_skew_in_seconds = clock_skew_in_seconds
+
+    def verify(self, token):
+        kid = google_jwt.decode_header(token).get("kid")
+
+        certs = self.cert_store.get_certs()
+        if kid not in certs:
+            # Google 이 키를 교체한 직후일 수 있으므로 한 번만 강제로 다시 받아 본다.
+            certs = self.cert_store.get_certs(force=True)
+
+        return google_jwt.decode(
+            token,
+            certs=certs,
+            audience=self.audience,
+            clock_skew_in_seconds=self.clock_skew_in_seconds,
+        )
+
+
+_verifier = None
+
+
+def get_google_verifier():
+    global _verifier
+    if _verifier is None:
+        _verifier = GoogleIdTokenVerifier(
+            GoogleCertStore(settings.GOOGLE_CERTS_URL),
+            settings.GOOGLE_AUTH_CLIENT_ID,
+        )
+    return _verifier
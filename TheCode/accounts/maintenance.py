@@ -0,0 +1,87 @@
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import StoredRefreshToken
+
+
+@dataclass
+class PruneStats:
+    batches: int = 0
+    deleted: int = 0
+    last_pk: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+
+def prunable_tokens(now=None, revoked_retention=None):
+    """
+    만료됐거나, 폐기된 지 revoked_retention 이상 지난 토큰.
+    revoked_at 이 없는 예전 행은 created_at 을 기준으로 한다.
+    """
+    now = now or timezone.now()
+    if revoked_retention is None:
+        revoked_retention = timedelta(days=settings.REFRESH_TOKEN_REVOKED_RETENTION_DAYS)
+    cutoff = now - revoked_retention
+
+    return StoredRefreshToken.objects.filter(
+        Q(expires_at__lt=now)
+        | Q(revoked=True, revoked_at__lt=cutoff)
+        | Q(revoked=True, revoked_at__isnull=True, created_at__lt=cutoff)
+    )
+
+
+def prune_refresh_tokens(
+    batch_size=None,
+    sleep=None,
+    max_batches=None,
+    now=None,
+    revoked_retention=None,
+    progress=None,
+):
+    """
+    pk 순서로 batch_size 개씩 잘라 짧은 트랜잭션으로 지운다.
+    배치 사이에 sleep 초 쉬어서 운영 중에도 잠금과 복제 지연이 길어지지 않게 한다.
+    """
+    batch_size = batch_size or settings.REFRESH_TOKEN_PRUNE_BATCH_SIZE
+    sleep = settings.REFRESH_TOKEN_PRUNE_SLEEP if sleep is None else sleep
+    now = now or timezone.now()
+
+    candidates = prunable_tokens(now, revoked_retention).order_by("pk")
+    stats = PruneStats()
+
+    while max_batches is None or stats.batches < max_batches:
+        # 이번 배치의 마지막 pk 를 구한 뒤 (last_pk, upper] 범위만 지운다.
+        upper = (
+            candidates.filter(pk__gt=stats.last_pk)
+            .values_list("pk", flat=True)[batch_size - 1:batch_size]
+            .first()
+        )
+
+        with transaction.atomic():
+            batch = candidates.filter(pk__gt=stats.last_pk)
+            if upper is not None:
+                batch = batch.filter(pk__lte=upper)
+            deleted, _ = batch.delete()
+
+        stats.batches += 1
+        stats.deleted += deleted
+        if progress:
+            progress(stats)
+
+        if upper is None:
+            break
+        stats.last_pk = upper
+
+        if sleep:
+            time.sleep(sleep)
+
+    return stats
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.maintenance import prune_refresh_tokens
+
+
+class Command(BaseCommand):
+    help = "만료되었거나 오래전에 폐기된 Refresh Token 을 배치 단위로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.REFRESH_TOKEN_PRUNE_BATCH_SIZE)
+        parser.add_argument("--sleep", type=float, default=settings.REFRESH_TOKEN_PRUNE_SLEEP)
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument(
+            "--revoked-retention-days",
+            type=int,
+            default=settings.REFRESH_TOKEN_REVOKED_RETENTION_DAYS,
+        )
+
+    def handle(self, *args, **options):
+        def progress(stats):
+            if options["verbosity"] >= 2:
+                self.stdout.write(
+                    f"batch={stats.batches} deleted={stats.deleted} "
+                    f"last_pk={stats.last_pk} elapsed={stats.elapsed:.1f}s"
+                )
+
+        stats = prune_refresh_tokens(
+            batch_size=options["batch_size"],
+            sleep=options["sleep"],
+            max_batches=options["max_batches"],
+            revoked_retention=timedelta(days=options["revoked_retention_days"]),
+            progress=progress,
+        )
+
+        rate = stats.deleted / stats.elapsed if stats.elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats.deleted}개 삭제 ({stats.batches} batches, {stats.elapsed:.1f}s, {rate:.0f} rows/s)"
+        ))
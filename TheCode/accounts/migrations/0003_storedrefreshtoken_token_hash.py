@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_alter_storedrefreshtoken_session_scope"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="storedrefreshtoken",
+            name="token_hash",
+            field=models.CharField(max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:40
+
+import hashlib
+
+from django.db import migrations
+
+
+def backfill_token_hash(apps, schema_editor):
+    StoredRefreshToken = apps.get_model("accounts", "StoredRefreshToken")
+
+    batch = []
+    for stored in StoredRefreshToken.objects.only("id", "token").iterator(
+        chunk_size=1000
+    ):
+        stored.token_hash = hashlib.sha256(stored.token.encode()).hexdigest()
+        batch.append(stored)
+        if len(batch) >= 1000:
+            StoredRefreshToken.objects.bulk_update(batch, ["token_hash"])
+            batch = []
+    if batch:
+        StoredRefreshToken.objects.bulk_update(batch, ["token_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_storedrefreshtoken_token_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_token_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_backfill_storedrefreshtoken_token_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="storedrefreshtoken",
+            name="token_hash",
+            field=models.CharField(max_length=64, unique=True),
+        ),
+        migrations.RemoveField(
+            model_name="storedrefreshtoken",
+            name="token",
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_user_token_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="storedrefreshtoken",
+            name="revoked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_storedrefreshtoken_revoked_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="storedrefreshtoken",
+            name="device_fingerprint",
+            field=models.CharField(max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:30
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Cast, Concat
+
+
+def backfill_device_fingerprint(apps, schema_editor):
+    # 기존 행은 어느 기기인지 알 수 없으므로 서로 겹치지 않는 값을 주고, 만료되면 정리 작업이 지운다.
+    StoredRefreshToken = apps.get_model("accounts", "StoredRefreshToken")
+    StoredRefreshToken.objects.filter(device_fingerprint__isnull=True).update(
+        device_fingerprint=Concat(
+            Value("legacy-"), Cast("id", output_field=models.CharField(max_length=64))
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_storedrefreshtoken_device_fingerprint"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_device_fingerprint, migrations.RunPython.noop),
+    ]
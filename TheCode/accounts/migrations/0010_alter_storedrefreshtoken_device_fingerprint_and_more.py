@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_backfill_storedrefreshtoken_device_fingerprint"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="storedrefreshtoken",
+            name="device_fingerprint",
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name="storedrefreshtoken",
+            constraint=models.UniqueConstraint(
+                fields=("user", "device_fingerprint", "session_scope"),
+                name="uniq_refresh_token_device_session",
+            ),
+        ),
+    ]
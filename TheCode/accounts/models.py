@@ -53,6 +53,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
 
+    # 값을 올리면 이전에 발급된 토큰이 모두 무효가 된다.
+    token_version = models.PositiveIntegerField(default=0)
+
     objects = UserManager()
 
     USERNAME_FIELD = "email"
@@ -66,13 +69,23 @@ class User(AbstractBaseUser, PermissionsMixin):
 
 class StoredRefreshToken(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="refresh_tokens")
-    token = models.CharField(max_length=500)
+    token_hash = models.CharField(max_length=64, unique=True)
     device_info = models.CharField(max_length=255, null=True, blank=True)
+    device_fingerprint = models.CharField(max_length=64)
     session_scope = models.CharField(max_length=20, default="local")
 
     revoked = models.BooleanField(default=False)
+    revoked_at = models.DateTimeField(null=True, blank=True)
     expires_at = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "device_fingerprint", "session_scope"],
+                name="uniq_refresh_token_device_session",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.username} / revoked={self.revoked}"
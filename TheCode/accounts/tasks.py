@@ -0,0 +1,10 @@
+from django.conf import settings
+
+from accounts.maintenance import prune_refresh_tokens
+from jobs.queue import task
+
+
+# REFRESH_TOKEN_PRUNE_INTERVAL 이 있으면 run_jobs 워커가 주기마다 한 번 넣는다. (웹 워커에서는 돌리지 않는다)
+@task("accounts.prune_refresh_tokens", max_attempts=1, interval=settings.REFRESH_TOKEN_PRUNE_INTERVAL)
+def prune_refresh_tokens_task(payload):
+    prune_refresh_tokens(max_batches=payload.get("max_batches"))
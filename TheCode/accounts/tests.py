@@ -1,3 +1,439 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+import threading
+import time
+from unittest import mock, skipUnless
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
-# Create your tests here.
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from google.auth import crypt, jwt as google_jwt
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts import google, views
+from accounts.maintenance import prune_refresh_tokens
+from accounts.authentication import ClaimsJWTAuthentication, invalidate_user_state
+from accounts.models import User, StoredRefreshToken
+from accounts.tokens import hash_token, revoke_refresh_token, rotate_refresh_token
+
+
+class AuthTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def login(self, **headers):
+        response = self.client.post("/api/v1/auth/dev/login/", **headers)
+        return response.data["data"]
+
+    def refresh(self, refresh_token):
+        return self.client.post("/api/v1/auth/refresh/", {"refresh_token": refresh_token})
+
+    def logout(self, refresh_token):
+        return self.client.post("/api/v1/auth/logout/", {"refresh_token": refresh_token})
+
+
+class RefreshTokenStorageTests(AuthTestCase):
+    def test_only_digest_is_stored(self):
+        refresh_token = self.login()["refresh_token"]
+
+        stored = StoredRefreshToken.objects.get()
+        self.assertEqual(stored.token_hash, hash_token(refresh_token))
+        self.assertNotIn(refresh_token, [str(v) for v in stored.__dict__.values()])
+
+    def test_refresh_and_logout_by_digest(self):
+        refresh_token = self.login()["refresh_token"]
+
+        self.assertEqual(self.refresh(refresh_token).status_code, 200)
+        self.assertEqual(self.logout(refresh_token).status_code, 200)
+        self.assertEqual(self.refresh(refresh_token).status_code, 401)
+
+    def test_unknown_token(self):
+        self.assertEqual(self.refresh("not-a-token").status_code, 401)
+        self.assertEqual(self.logout("not-a-token").status_code, 401)
+
+
+class DeviceSessionTests(AuthTestCase):
+    def test_relogin_on_same_device_rotates_in_place(self):
+        first = self.login(HTTP_X_DEVICE_ID="phone-1")["refresh_token"]
+        second = self.login(HTTP_X_DEVICE_ID="phone-1")["refresh_token"]
+
+        self.assertEqual(StoredRefreshToken.objects.count(), 1)
+        self.assertEqual(self.refresh(first).status_code, 401)
+        self.assertEqual(self.refresh(second).status_code, 200)
+
+    def test_relogin_after_logout_reactivates_session(self):
+        first = self.login(HTTP_X_DEVICE_ID="phone-1")["refresh_token"]
+        self.logout(first)
+
+        second = self.login(HTTP_X_DEVICE_ID="phone-1")["refresh_token"]
+        self.assertEqual(self.refresh(second).status_code, 200)
+        self.assertIsNone(StoredRefreshToken.objects.get().revoked_at)
+
+    def test_each_device_gets_its_own_session(self):
+        phone = self.login(HTTP_X_DEVICE_ID="phone-1")["refresh_token"]
+        tablet = self.login(HTTP_X_DEVICE_ID="tablet-1")["refresh_token"]
+
+        self.assertEqual(StoredRefreshToken.objects.count(), 2)
+        self.assertEqual(self.refresh(phone).status_code, 200)
+        self.assertEqual(self.refresh(tablet).status_code, 200)
+
+    def test_devices_without_device_id_do_not_share_a_session(self):
+        # 앱 User-Agent 는 기기마다 같으므로 X-Device-Id 가 없으면 로그인마다 세션을 따로 만든다.
+        phone = self.login(HTTP_USER_AGENT="okhttp/4.12.0")["refresh_token"]
+        tablet = self.login(HTTP_USER_AGENT="okhttp/4.12.0")["refresh_token"]
+
+        self.assertEqual(StoredRefreshToken.objects.count(), 2)
+        self.assertEqual(self.refresh(phone).status_code, 200)
+        self.assertEqual(self.refresh(tablet).status_code, 200)
+
+    def test_non_object_body_is_ignored(self):
+        # JSON 본문이 배열이어도 500 이 아니라 기기 id 없이 로그인한다.
+        response = self.client.post("/api/v1/auth/dev/login/", [1, 2], format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(StoredRefreshToken.objects.count(), 1)
+
+
+class LogoutTests(AuthTestCase):
+    def test_logout_is_single_update(self):
+        refresh_token = self.login()["refresh_token"]
+
+        with self.assertNumQueries(1):
+            self.assertIs(revoke_refresh_token(refresh_token), True)
+
+    def test_logout_all_devices(self):
+        phone = self.login(HTTP_X_DEVICE_ID="phone-1")
+        tablet = self.login(HTTP_X_DEVICE_ID="tablet-1")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {phone['access_token']}")
+        response = self.client.post("/api/v1/auth/logout/all/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["revoked_sessions"], 2)
+
+        self.assertEqual(self.refresh(phone["refresh_token"]).status_code, 401)
+        self.assertEqual(self.refresh(tablet["refresh_token"]).status_code, 401)
+        # token_version 이 올라가 이미 발급된 access token 도 거절된다.
+        self.assertEqual(self.client.get("/api/v1/auth/me/").status_code, 401)
+
+
+@mock.patch.object(views.api_settings, "ROTATE_REFRESH_TOKENS", True)
+class RefreshRotationTests(AuthTestCase):
+    def test_rotation_issues_new_refresh_token(self):
+        first = self.login()["refresh_token"]
+
+        response = self.refresh(first)
+        second = response.data["data"]["refresh_token"]
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(StoredRefreshToken.objects.get().token_hash, hash_token(second))
+        self.assertEqual(self.refresh(second).status_code, 200)
+
+    def test_replayed_token_is_rejected(self):
+        first = self.login()["refresh_token"]
+        self.refresh(first)
+
+        self.assertEqual(self.refresh(first).status_code, 401)
+
+    def test_stale_row_cannot_rotate_twice(self):
+        first = self.login()["refresh_token"]
+        stale = StoredRefreshToken.objects.select_related("user").get()
+
+        # 두 요청이 같은 행을 읽은 뒤 차례로 교체를 시도하면 두 번째는 조건부 UPDATE 가 0 행이 된다.
+        winner = rotate_refresh_token(stale, hash_token(first), stale.user)
+        loser = rotate_refresh_token(stale, hash_token(first), stale.user)
+
+        self.assertIsNotNone(winner)
+        self.assertIsNone(loser)
+        self.assertEqual(StoredRefreshToken.objects.get().token_hash, hash_token(str(winner)))
+
+
+@skipUnless(connection.vendor == "postgresql", "동시 요청은 행 잠금이 있는 PostgreSQL 에서만 확인할 수 있다.")
+class ConcurrentSessionTests(TransactionTestCase):
+    """
+    여러 스레드(각자 DB 연결)가 같은 refresh token 으로 동시에 요청한다.
+    """
+
+    threads = 8
+
+    def login(self):
+        return APIClient().post("/api/v1/auth/dev/login/").data["data"]["refresh_token"]
+
+    def race(self, path, refresh_token):
+        barrier = threading.Barrier(self.threads)
+        responses = []
+
+        def worker():
+            try:
+                barrier.wait()
+                responses.append(APIClient().post(path, {"refresh_token": refresh_token}))
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        self.assertEqual(len(responses), self.threads)
+        return responses
+
+    def test_concurrent_logout_revokes_once(self):
+        refresh_token = self.login()
+
+        responses = self.race("/api/v1/auth/logout/", refresh_token)
+
+        messages = [response.data["data"]["message"] for response in responses]
+        self.assertEqual(messages.count("로그아웃에 성공했습니다."), 1)
+        self.assertEqual(messages.count("이미 로그아웃 된 토큰입니다."), self.threads - 1)
+        self.assertTrue(StoredRefreshToken.objects.get().revoked)
+
+    @mock.patch.object(views.api_settings, "ROTATE_REFRESH_TOKENS", True)
+    def test_rotation_race_has_single_winner(self):
+        refresh_token = self.login()
+
+        responses = self.race("/api/v1/auth/refresh/", refresh_token)
+
+        winners = [response for response in responses if response.status_code == 200]
+        self.assertEqual(len(winners), 1)
+        self.assertEqual(sorted({response.status_code for response in responses}), [200, 401])
+        stored = StoredRefreshToken.objects.get()
+        self.assertEqual(stored.token_hash, hash_token(winners[0].data["data"]["refresh_token"]))
+
+
+class PruneRefreshTokenTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(provider="google", provider_user_id="prune")
+        now = timezone.now()
+        day = datetime.timedelta(days=1)
+
+        self.keep = [
+            self.token("live", expires_at=now + day),
+            self.token("recently-revoked", expires_at=now + day, revoked_at=now - day),
+        ]
+        self.drop = [
+            self.token(f"expired-{i}", expires_at=now - day) for i in range(5)
+        ] + [
+            self.token("long-revoked", expires_at=now + day, revoked_at=now - 30 * day),
+        ]
+
+    def token(self, name, expires_at, revoked_at=None):
+        return StoredRefreshToken.objects.create(
+            user=self.user,
+            token_hash=hash_token(name),
+            device_fingerprint=name,
+            expires_at=expires_at,
+            revoked=revoked_at is not None,
+            revoked_at=revoked_at,
+        ).pk
+
+    def test_prunes_in_batches(self):
+        batches = []
+        stats = prune_refresh_tokens(batch_size=2, sleep=0, progress=lambda s: batches.append(s.deleted))
+
+        self.assertEqual(stats.deleted, len(self.drop))
+        self.assertEqual(batches, [2, 4, 6, 6])
+        self.assertEqual(
+            sorted(StoredRefreshToken.objects.values_list("pk", flat=True)), sorted(self.keep)
+        )
+
+    def test_max_batches(self):
+        stats = prune_refresh_tokens(batch_size=2, sleep=0, max_batches=1)
+        self.assertEqual(stats.deleted, 2)
+
+    def test_command(self):
+        call_command("prune_refresh_tokens", "--sleep=0", stdout=io.StringIO())
+        self.assertEqual(StoredRefreshToken.objects.count(), len(self.keep))
+
+
+class ClaimsAuthenticationTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tokens = self.login()
+        self.user = User.objects.get(pk=self.tokens["user"]["id"])
+        invalidate_user_state(self.user.pk)
+
+    def authenticate(self):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {self.tokens['access_token']}"
+        )
+        return ClaimsJWTAuthentication().authenticate(request)
+
+    def me(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access_token']}")
+        return self.client.get("/api/v1/auth/me/")
+
+    def test_cached_state_needs_no_user_query(self):
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate()
+        self.assertEqual(user.id, self.user.id)
+
+    def test_full_user_is_loaded_lazily(self):
+        user, _ = self.authenticate()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "dev@test.com")
+            self.assertEqual(user.provider_user_id, "dev-google-user-001")
+
+    def test_me_returns_full_user(self):
+        response = self.me()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["user"]["email"], "dev@test.com")
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate()
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_token_version_bump_revokes_tokens(self):
+        self.user.token_version += 1
+        self.user.save()
+
+        self.assertEqual(self.me().status_code, 401)
+
+
+def make_signing_cert(kid):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    signer = crypt.RSASigner.from_string(key_pem, key_id=kid)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class CertServer:
+    """
+    Google 인증서 엔드포인트를 흉내 내는 로컬 서버
+    """
+
+    def __init__(self):
+        self.certs = {}
+        self.max_age = 3600
+        self.requests = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                body = json.dumps(stub.certs).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={stub.max_age}")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@override_settings(GOOGLE_AUTH_CLIENT_ID="test-client")
+class GoogleVerifierTests(AuthTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = CertServer()
+        cls.signer_a, cert_a = make_signing_cert("kid-a")
+        cls.signer_b, cls.cert_b = make_signing_cert("kid-b")
+        cls.cert_a = cert_a
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.server.certs = {"kid-a": self.cert_a}
+        self.server.max_age = 3600
+        self.server.requests = 0
+        self.store = google.GoogleCertStore(self.server.url, min_force_interval=0)
+        self.verifier = google.GoogleIdTokenVerifier(self.store, "test-client")
+
+    def id_token(self, signer, sub="google-sub-1"):
+        now = int(time.time())
+        return google_jwt.encode(signer, {
+            "iss": "https://accounts.google.com",
+            "aud": "test-client",
+            "sub": sub,
+            "email": "player@test.com",
+            "name": "player",
+            "iat": now,
+            "exp": now + 600,
+        }).decode()
+
+    def test_certs_are_fetched_once(self):
+        for _ in range(3):
+            self.assertEqual(self.verifier.verify(self.id_token(self.signer_a))["sub"], "google-sub-1")
+        self.assertEqual(self.server.requests, 1)
+
+    def test_unknown_kid_forces_single_refresh(self):
+        self.verifier.verify(self.id_token(self.signer_a))
+
+        self.server.certs = {"kid-a": self.cert_a, "kid-b": self.cert_b}
+        self.verifier.verify(self.id_token(self.signer_b))
+        self.assertEqual(self.server.requests, 2)
+
+        signer_c, _ = make_signing_cert("kid-c")
+        with self.assertRaises(ValueError):
+            self.verifier.verify(self.id_token(signer_c))
+        self.assertEqual(self.server.requests, 3)
+
+    def test_background_refresh_before_expiry(self):
+        self.server.max_age = 1
+        self.store.refresh_margin = 1
+        self.store.get_certs()
+
+        self.store.get_certs()
+        deadline = time.time() + 5
+        while self.server.requests < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_google_login_uses_verifier(self):
+        google._verifier = self.verifier
+        try:
+            response = self.client.post(
+                "/api/v1/auth/google/login/",
+                {"id_token": self.id_token(self.signer_a)},
+            )
+        finally:
+            google._verifier = None
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["user"]["email"], "player@test.com")
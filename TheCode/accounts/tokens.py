@@ -0,0 +1,121 @@
+import hashlib
+import secrets
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import StoredRefreshToken, User
+
+
+TOKEN_VERSION_CLAIM = "tv"
+IS_ACTIVE_CLAIM = "act"
+
+
+def hash_token(raw_token: str) -> str:
+    """
+    Refresh Token 원문은 저장하지 않고 SHA-256 digest 로만 저장/조회한다.
+    """
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+def issue_refresh_token(user):
+    """
+    access token 은 refresh token 의 클레임을 복사하므로 둘 다 아래 클레임을 갖는다.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh[TOKEN_VERSION_CLAIM] = user.token_version
+    refresh[IS_ACTIVE_CLAIM] = user.is_active
+    return refresh
+
+
+def device_fingerprint(request):
+    """
+    앱이 보내는 X-Device-Id 로 기기를 구분한다.
+    없으면 로그인마다 새 값을 쓴다. 앱의 User-Agent(okhttp, Dart 등)는 기기마다 같아서
+    User-Agent 로 구분하면 다른 기기의 세션을 덮어써 로그아웃시키게 된다.
+    """
+    device_id = request.headers.get("X-Device-Id")
+    # 본문이 JSON 객체가 아닐 수도 있다. (배열, 숫자 등)
+    if not device_id and isinstance(request.data, dict):
+        device_id = request.data.get("device_id")
+    if device_id:
+        source = f"id:{device_id}"
+    else:
+        source = f"login:{secrets.token_hex(16)}"
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def store_refresh_token(user, refresh, request, session_scope):
+    """
+    (user, 기기, session_scope) 마다 세션 한 행만 유지한다.
+    같은 기기에서 다시 로그인하면 INSERT ... ON CONFLICT DO UPDATE 한 번으로 토큰을 교체하므로,
+    이전 토큰은 같은 문장 안에서 더 이상 조회되지 않게 된다.
+    """
+    StoredRefreshToken.objects.bulk_create(
+        [
+            StoredRefreshToken(
+                user=user,
+                device_fingerprint=device_fingerprint(request),
+                session_scope=session_scope,
+                token_hash=hash_token(str(refresh)),
+                device_info=request.headers.get("User-Agent", "")[:255],
+                revoked=False,
+                revoked_at=None,
+                expires_at=datetime.fromtimestamp(int(refresh["exp"]), tz=dt_timezone.utc),
+            )
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "device_fingerprint", "session_scope"],
+        update_fields=["token_hash", "device_info", "revoked", "revoked_at", "expires_at"],
+    )
+
+
+def revoke_refresh_token(raw_token):
+    """
+    조건부 UPDATE 한 번으로 세션을 폐기한다. 동시에 로그아웃해도 한 요청만 행을 바꾼다.
+    반환값: 폐기했으면 True, 이미 폐기된 토큰이면 False, 없는 토큰이면 None.
+    """
+    token_hash = hash_token(raw_token)
+    updated = StoredRefreshToken.objects.filter(token_hash=token_hash, revoked=False).update(
+        revoked=True,
+        revoked_at=timezone.now(),
+    )
+    if updated:
+        return True
+    if StoredRefreshToken.objects.filter(token_hash=token_hash).exists():
+        return False
+    return None
+
+
+def revoke_all_refresh_tokens(user_id):
+    """
+    사용자의 모든 세션을 한 번의 UPDATE 로 폐기하고 token_version 을 올려
+    이미 발급된 access token 도 함께 무효화한다.
+    """
+    with transaction.atomic():
+        revoked = StoredRefreshToken.objects.filter(user_id=user_id, revoked=False).update(
+            revoked=True,
+            revoked_at=timezone.now(),
+        )
+        User.objects.filter(pk=user_id).update(token_version=F("token_version") + 1)
+    return revoked
+
+
+def rotate_refresh_token(stored, old_token_hash, user):
+    """
+    token_hash 가 그대로일 때만 새 토큰으로 바꾼다.
+    같은 refresh token 으로 동시에 요청하거나 재사용하면 한 요청만 성공하고 나머지는 None 을 받는다.
+    """
+    refresh = issue_refresh_token(user)
+    updated = StoredRefreshToken.objects.filter(
+        pk=stored.pk,
+        token_hash=old_token_hash,
+        revoked=False,
+    ).update(
+        token_hash=hash_token(str(refresh)),
+        expires_at=datetime.fromtimestamp(int(refresh["exp"]), tz=dt_timezone.utc),
+    )
+    return refresh if updated else None
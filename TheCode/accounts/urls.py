@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import GoogleLoginView, DevTestLoginView, RefreshTokenView, LogoutView, MeView
+from .views import GoogleLoginView, DevTestLoginView, RefreshTokenView, LogoutView, LogoutAllView, MeView
 
 urlpatterns = [
     path("google/login/", GoogleLoginView.as_view()),
     path("dev/login/", DevTestLoginView.as_view()),
     path("refresh/", RefreshTokenView.as_view()),
     path("logout/", LogoutView.as_view()),
+    path("logout/all/", LogoutAllView.as_view()),
     path("me/", MeView.as_view()),
 ]
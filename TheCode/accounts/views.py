@@ -1,14 +1,21 @@
-from datetime import datetime, timezone as dt_timezone
 from django.utils import timezone
-from django.conf import settings
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 
 from accounts.models import User, StoredRefreshToken
-from google.oauth2 import id_token as google_id_token
-from google.auth.transport import requests as google_requests
+from accounts.authentication import invalidate_user_state
+from accounts.tokens import (
+    hash_token,
+    issue_refresh_token,
+    store_refresh_token,
+    revoke_refresh_token,
+    revoke_all_refresh_tokens,
+    rotate_refresh_token,
+)
+from accounts.google import get_google_verifier
 from utils.response import success_response, error_response
 
 
@@ -21,11 +28,7 @@ class GoogleLoginView(APIView):
             return error_response("id_token 값이 필요합니다.", status=400)
 
         try:
-            decoded = google_id_token.verify_oauth2_token(
-                token,
-                google_requests.Request(),
-                settings.GOOGLE_AUTH_CLIENT_ID,
-            )
+            decoded = get_google_verifier().verify(token)
         except Exception as e:
             return error_response(
                 "유효하지 않은 Google ID Token입니다.",
@@ -55,22 +58,10 @@ class GoogleLoginView(APIView):
             },
         )
 
-        refresh = RefreshToken.for_user(user)
+        refresh = issue_refresh_token(user)
         access = refresh.access_token
 
-
-        expires_at_dt = datetime.fromtimestamp(
-            int(refresh["exp"]),
-            tz=dt_timezone.utc,
-        )
-
-        StoredRefreshToken.objects.create(
-            user=user,
-            token=str(refresh),
-            device_info=request.headers.get("User-Agent", ""),
-            session_scope="google",
-            expires_at=expires_at_dt,
-        )
+        store_refresh_token(user, refresh, request, session_scope="google")
 
         return success_response(
             message="로그인에 성공했습니다.",
@@ -98,22 +89,10 @@ class DevTestLoginView(APIView):
             },
         )
 
-        refresh = RefreshToken.for_user(user)
+        refresh = issue_refresh_token(user)
         access = refresh.access_token
 
-        expires_at_dt = datetime.fromtimestamp(
-            int(refresh["exp"]),
-            tz=dt_timezone.utc,
-        )
-        
-        StoredRefreshToken.objects.create(
-            user=user,
-            token=str(refresh),
-            device_info=request.headers.get("User-Agent", ""),
-            session_scope="google",
-            expires_at=expires_at_dt,
-        )
-
+        store_refresh_token(user, refresh, request, session_scope="google")
 
         return success_response(
             message="DEV 테스트 로그인에 성공했습니다.",
@@ -138,9 +117,10 @@ class RefreshTokenView(APIView):
         if not refresh_token_str:
             return error_response("refresh_token 값이 필요합니다.", status=400)
 
+        token_hash = hash_token(refresh_token_str)
         try:
-            stored = StoredRefreshToken.objects.get(
-                token=refresh_token_str,
+            stored = StoredRefreshToken.objects.select_related("user").get(
+                token_hash=token_hash,
                 revoked=False,
             )
         except StoredRefreshToken.DoesNotExist:
@@ -154,12 +134,27 @@ class RefreshTokenView(APIView):
         except TokenError:
             return error_response("유효하지 않은 Refresh Token입니다.", status=401)
 
-        access = refresh.access_token
+        if not api_settings.ROTATE_REFRESH_TOKENS:
+            return success_response(
+                message="Access Token 재발급에 성공했습니다.",
+                data={
+                    "access_token": str(refresh.access_token),
+                },
+            )
+
+        if not stored.user.is_active:
+            return error_response("유효하지 않은 Refresh Token입니다.", status=401)
+
+        # 조회 이후 다른 요청이 먼저 교체했다면 조건부 UPDATE 가 0 행이 되어 재사용으로 본다.
+        rotated = rotate_refresh_token(stored, token_hash, stored.user)
+        if rotated is None:
+            return error_response("이미 사용된 Refresh Token입니다.", status=401)
 
         return success_response(
             message="Access Token 재발급에 성공했습니다.",
             data={
-                "access_token": str(access),
+                "access_token": str(rotated.access_token),
+                "refresh_token": str(rotated),
             },
         )
     
@@ -172,25 +167,26 @@ class LogoutView(APIView):
         if not refresh_token:
             return error_response("refresh_token 값이 필요합니다.", status=400)
 
-        try:
-            stored = StoredRefreshToken.objects.get(token=refresh_token)
-        except StoredRefreshToken.DoesNotExist:
+        revoked = revoke_refresh_token(refresh_token)
+        if revoked is None:
             return error_response("유효하지 않은 Refresh Token입니다.", status=401)
+        if not revoked:
+            return success_response(message="이미 로그아웃 된 토큰입니다.")
 
-        try:
-            refresh = RefreshToken(refresh_token)
-        except TokenError:
-            stored.revoked = True
-            stored.save(update_fields=["revoked"])
-            return success_response(message="로그아웃에 성공했습니다.")
+        return success_response(message="로그아웃에 성공했습니다.")
 
-        if stored.revoked:
-            return success_response(message="이미 로그아웃 된 토큰입니다.")
 
-        stored.revoked = True
-        stored.save(update_fields=["revoked"])
+class LogoutAllView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        return success_response(message="로그아웃에 성공했습니다.")
+    def post(self, request):
+        revoked = revoke_all_refresh_tokens(request.user.id)
+        invalidate_user_state(request.user.id)
+
+        return success_response(
+            message="모든 기기에서 로그아웃했습니다.",
+            data={"revoked_sessions": revoked},
+        )
 
 
 
@@ -0,0 +1,145 @@
+from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.utils.html import format_html
+
+from utils.admin import select_related_filter
+from .funnel import get_funnels
+from .models import DailyActiveUsers, EpisodeFunnel, RollupWatermark, StageDailyStats
+
+
+class RollupAdmin(admin.ModelAdmin):
+    """
+    집계 테이블은 build_rollups 만 쓰므로 관리자 화면에서는 조회만 한다.
+    """
+
+    class Media:
+        css = {
+            "all": ("admin/custom.css",)
+        }
+
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailyActiveUsers)
+class DailyActiveUsersAdmin(RollupAdmin):
+    ordering = ("-date", "platform", "app_version")
+
+    list_display = (
+        "date",
+        "platform_display",
+        "app_version_display",
+        "colored_users",
+    )
+
+    list_filter = (
+        "date",
+        "platform",
+    )
+
+    search_fields = (
+        "=app_version",
+    )
+
+    @admin.display(description="Platform", ordering="platform")
+    def platform_display(self, obj):
+        if obj.platform == DailyActiveUsers.TOTAL:
+            return format_html('<span style="color:#8e44ad; font-weight:700;">{}</span>', "전체")
+        return obj.platform
+
+    @admin.display(description="App Version", ordering="app_version")
+    def app_version_display(self, obj):
+        return obj.app_version or "-"
+
+    @admin.display(description="Users", ordering="users")
+    def colored_users(self, obj):
+        return format_html(
+            '<span style="color:#2ecc71; font-weight:600;">{}</span>',
+            obj.users,
+        )
+
+
+@admin.register(StageDailyStats)
+class StageDailyStatsAdmin(RollupAdmin):
+    ordering = ("-date", "stage__episode__code", "stage__stage_no")
+    list_select_related = ("stage__episode__series",)
+
+    list_display = (
+        "date",
+        "stage_display",
+        "entries",
+        "completed_entries",
+        "median_dwell",
+        "p90_dwell",
+        "colored_ad_watches",
+    )
+
+    list_filter = (
+        "date",
+        ("stage__episode", select_related_filter("series")),
+    )
+
+    def _format_seconds(self, seconds):
+        if seconds is None:
+            return "-"
+        minutes, seconds = divmod(int(round(seconds)), 60)
+        return f"{minutes}분 {seconds:02d}초" if minutes else f"{seconds}초"
+
+    @admin.display(description="Stage", ordering="stage__stage_no")
+    def stage_display(self, obj):
+        return f"{obj.stage.episode.code} - {obj.stage.stage_no}"
+
+    @admin.display(description="Median Dwell", ordering="median_dwell_seconds")
+    def median_dwell(self, obj):
+        return self._format_seconds(obj.median_dwell_seconds)
+
+    @admin.display(description="P90 Dwell", ordering="p90_dwell_seconds")
+    def p90_dwell(self, obj):
+        return self._format_seconds(obj.p90_dwell_seconds)
+
+    @admin.display(description="Ad Watches", ordering="ad_watches")
+    def colored_ad_watches(self, obj):
+        return format_html(
+            '<span style="color:{}; font-weight:600;">{}</span>',
+            "#f39c12" if obj.ad_watches else "#7f8c8d",
+            obj.ad_watches,
+        )
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(RollupAdmin):
+    ordering = ("name",)
+
+    list_display = (
+        "name",
+        "last_id",
+        "seen_id",
+        "seen_at",
+        "updated_at",
+    )
+
+
+@admin.register(EpisodeFunnel)
+class EpisodeFunnelAdmin(RollupAdmin):
+    """
+    목록 대신 캐시된 퍼널 보고서를 보여 준다. (?refresh=1 이면 다시 계산)
+    """
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        report = get_funnels(refresh=request.GET.get("refresh") == "1")
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "에피소드 퍼널",
+            "opts": self.model._meta,
+            "report": report,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, "admin/analytics/episode_funnel.html", context)
@@ -0,0 +1,34 @@
+from math import ceil, floor
+
+from django.db.models import Aggregate, FloatField
+
+
+class PercentileCont(Aggregate):
+    """
+    PostgreSQL percentile_cont. 다른 DB 에서는 percentile() 로 직접 계산한다.
+    """
+
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    allow_distinct = False
+
+    def __init__(self, expression, fraction, output_field=None, **extra):
+        if not 0 <= fraction <= 1:
+            raise ValueError("fraction 은 0 과 1 사이여야 합니다.")
+        super().__init__(
+            expression,
+            fraction=float(fraction),
+            output_field=output_field or FloatField(),
+            **extra,
+        )
+
+
+def percentile(values, fraction):
+    """
+    정렬된 값 목록에서 percentile_cont 와 같은 방식(선형 보간)으로 구한다.
+    """
+    if not values:
+        return None
+    position = (len(values) - 1) * fraction
+    low, high = floor(position), ceil(position)
+    return values[low] + (values[high] - values[low]) * (position - low)
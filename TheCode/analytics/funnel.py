@@ -0,0 +1,174 @@
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from analytics.aggregates import percentile
+from contents.catalog import get_catalog
+from progress.models import UserEpisodeProgress
+from utils.cache import LocalTTLCache
+
+
+_cache = LocalTTLCache(ttl=settings.FUNNEL_CACHE_TTL, maxsize=1)
+_CACHE_KEY = "episode_funnels"
+
+
+@dataclass
+class StageFunnel:
+    stage_no: int
+    # highest_stage_no 가 이 스테이지 이상인 플레이어
+    reached: int = 0
+    # 이 스테이지에서 멈춘(클리어하지 못한) 플레이어
+    stalled: int = 0
+    reach_rate: float = 0.0
+
+
+@dataclass
+class EpisodeFunnel:
+    episode_id: int
+    code: str
+    title: str
+    players: int = 0
+    cleared: int = 0
+    clear_rate: float = 0.0
+    median_clear_seconds: float | None = None
+    stages: list = field(default_factory=list)
+
+
+@dataclass
+class FunnelReport:
+    computed_at: object
+    episodes: list
+
+    def as_dict(self):
+        return {
+            "computed_at": self.computed_at,
+            "episodes": [asdict(episode) for episode in self.episodes],
+        }
+
+
+_GROUPING_SETS_SQL = """
+SELECT
+    episode_id,
+    highest_stage_no,
+    GROUPING(highest_stage_no) AS is_total,
+    COUNT(*) AS players,
+    COUNT(*) FILTER (WHERE is_cleared) AS cleared,
+    PERCENTILE_CONT(0.5) WITHIN GROUP (
+        ORDER BY EXTRACT(EPOCH FROM cleared_at - started_at)::float8
+    ) FILTER (WHERE is_cleared AND cleared_at IS NOT NULL) AS median_clear_seconds
+FROM {table}
+GROUP BY GROUPING SETS ((episode_id, highest_stage_no), (episode_id))
+"""
+
+
+def _fetch_postgresql():
+    """
+    (episode_id, highest_stage_no) 분포와 에피소드 합계/클리어 시간 중앙값을 한 번의 집계 쿼리로 구한다.
+    """
+    buckets, totals = defaultdict(dict), {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _GROUPING_SETS_SQL.format(table=connection.ops.quote_name(UserEpisodeProgress._meta.db_table))
+        )
+        for episode_id, stage_no, is_total, players, cleared, median in cursor.fetchall():
+            if is_total:
+                totals[episode_id] = (players, cleared, median)
+            else:
+                buckets[episode_id][stage_no] = (players, cleared)
+    return buckets, totals
+
+
+def _fetch_fallback():
+    """
+    GROUPING SETS / percentile_cont 가 없는 DB (SQLite, 개발용).
+    행을 한 번 읽어 와 파이썬에서 센다. 쿼리 수가 PostgreSQL 과 같아 쿼리 예산을 DB 와 관계없이 확인할 수 있다.
+    """
+    counts = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    durations = defaultdict(list)
+    for episode_id, stage_no, is_cleared, started_at, cleared_at in (
+        UserEpisodeProgress.objects.order_by()
+        .values_list("episode_id", "highest_stage_no", "is_cleared", "started_at", "cleared_at")
+        .iterator()
+    ):
+        bucket = counts[episode_id][stage_no]
+        bucket[0] += 1
+        if is_cleared:
+            bucket[1] += 1
+            if cleared_at is not None:
+                durations[episode_id].append((cleared_at - started_at).total_seconds())
+
+    buckets, totals = defaultdict(dict), {}
+    for episode_id, episode_counts in counts.items():
+        buckets[episode_id] = {stage_no: tuple(bucket) for stage_no, bucket in episode_counts.items()}
+        totals[episode_id] = (
+            sum(players for players, _ in episode_counts.values()),
+            sum(cleared for _, cleared in episode_counts.values()),
+            percentile(sorted(durations[episode_id]), 0.5),
+        )
+    return buckets, totals
+
+
+def _rate(count, total):
+    return round(count / total, 4) if total else 0.0
+
+
+def compute_funnels():
+    """
+    카탈로그의 모든 에피소드에 대해 스테이지별 도달/이탈 인원, 클리어율, 클리어 시간 중앙값을 계산한다.
+    """
+    if connection.vendor == "postgresql":
+        buckets, totals = _fetch_postgresql()
+    else:
+        buckets, totals = _fetch_fallback()
+
+    episodes = []
+    for entry in sorted(get_catalog().episodes.values(), key=lambda e: (e.series_id, e.code)):
+        players, cleared, median = totals.get(entry.id, (0, 0, None))
+        episode_buckets = buckets.get(entry.id, {})
+        funnel = EpisodeFunnel(
+            episode_id=entry.id,
+            code=entry.code,
+            title=entry.title,
+            players=players,
+            cleared=cleared,
+            clear_rate=_rate(cleared, players),
+            median_clear_seconds=median,
+        )
+
+        # highest_stage_no 분포를 뒤에서부터 누적하면 각 스테이지에 도달한 인원이 된다.
+        last_stage_no = max(entry.stage_nos, default=0)
+        reached = sum(count for stage_no, (count, _) in episode_buckets.items() if stage_no > last_stage_no)
+        stages = []
+        for stage_no in sorted(entry.stage_nos, reverse=True):
+            count, stage_cleared = episode_buckets.get(stage_no, (0, 0))
+            reached += count
+            stages.append(
+                StageFunnel(
+                    stage_no=stage_no,
+                    reached=reached,
+                    stalled=count - stage_cleared,
+                    reach_rate=_rate(reached, players),
+                )
+            )
+        funnel.stages = stages[::-1]
+        episodes.append(funnel)
+
+    return FunnelReport(computed_at=timezone.now(), episodes=episodes)
+
+
+def get_funnels(refresh=False):
+    """
+    FUNNEL_CACHE_TTL 동안 워커 캐시에 둔 결과를 돌려준다.
+    """
+    report = None if refresh else _cache.get(_CACHE_KEY)
+    if report is None:
+        report = compute_funnels()
+        _cache.set(_CACHE_KEY, report)
+    return report
+
+
+def invalidate_funnels():
+    _cache.delete(_CACHE_KEY)
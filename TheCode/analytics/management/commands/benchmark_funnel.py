@@ -0,0 +1,116 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from analytics.funnel import compute_funnels
+from contents import catalog
+from contents.models import Series, Episode, Stage
+from progress.models import UserEpisodeProgress
+
+
+class Command(BaseCommand):
+    help = (
+        "가짜 진행 데이터(기본 100만 행)를 넣고 퍼널 계산 시간을 잰 뒤 모두 롤백합니다. "
+        "운영 DB 가 아닌 곳에서 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--episodes", type=int, default=10)
+        parser.add_argument("--stages", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        with transaction.atomic():
+            started = time.monotonic()
+            rows = self._populate(rng, options)
+            self.stdout.write(f"{rows}개 진행 행 생성 ({time.monotonic() - started:.1f}s, {connection.vendor})")
+
+            catalog.invalidate_catalog()
+            catalog.get_catalog()
+
+            timings, queries = [], 0
+            for _ in range(options["repeat"]):
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.monotonic()
+                    compute_funnels()
+                    timings.append(time.monotonic() - started)
+                queries = len(ctx.captured_queries)
+
+            self.stdout.write(self.style.SUCCESS(
+                f"compute_funnels: min {min(timings) * 1000:.0f}ms, "
+                f"median {statistics.median(timings) * 1000:.0f}ms, "
+                f"{queries} queries/run ({options['repeat']} runs)"
+            ))
+
+            transaction.set_rollback(True)
+
+        catalog.invalidate_catalog()
+
+    def _populate(self, rng, options):
+        episodes_count, stages_count = options["episodes"], options["stages"]
+        batch_size = options["batch_size"]
+
+        series = Series.objects.create(code="BENCH", title="Funnel Benchmark")
+        episodes = []
+        for no in range(1, episodes_count + 1):
+            episode = Episode.objects.create(
+                series=series,
+                code=f"BENCH{no}",
+                title=f"Benchmark {no}",
+                price_unlock_stages=0,
+                price_unlock_with_adfree=0,
+            )
+            Stage.objects.bulk_create([
+                Stage(episode=episode, stage_no=stage_no, title=str(stage_no), image_key="", answer_text="a")
+                for stage_no in range(1, stages_count + 1)
+            ])
+            episodes.append(episode.id)
+
+        users_count = -(-options["rows"] // episodes_count)
+        users = User.objects.bulk_create(
+            [User(provider="bench", provider_user_id=f"bench-{i}") for i in range(users_count)],
+            batch_size=batch_size,
+        )
+        if users[0].pk is None:
+            users = User.objects.filter(provider="bench").only("id")
+
+        now = timezone.now()
+        created, batch = 0, []
+        for user in users:
+            for episode_id in episodes:
+                if created + len(batch) >= options["rows"]:
+                    break
+                batch.append(self._progress(rng, user.id, episode_id, stages_count, now))
+                if len(batch) >= batch_size:
+                    UserEpisodeProgress.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+        UserEpisodeProgress.objects.bulk_create(batch)
+        return created + len(batch)
+
+    def _progress(self, rng, user_id, episode_id, stages_count, now):
+        # 스테이지마다 일정 확률로 이탈하는 분포
+        highest = 1
+        while highest < stages_count and rng.random() < 0.93:
+            highest += 1
+        cleared = highest == stages_count and rng.random() < 0.8
+        return UserEpisodeProgress(
+            user_id=user_id,
+            episode_id=episode_id,
+            current_stage_no=highest,
+            highest_stage_no=highest,
+            is_cleared=cleared,
+            cleared_at=now + timedelta(seconds=rng.randint(300, 7200)) if cleared else None,
+        )
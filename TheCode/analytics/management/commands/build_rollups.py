@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.rollups import ROLLUPS, build_rollups, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "로그/광고 원본에서 새로 들어온 행이 속한 날짜만 다시 집계합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            action="append",
+            choices=[rollup.name for rollup in ROLLUPS],
+            help="지정한 집계만 실행합니다. (여러 번 지정 가능)",
+        )
+        parser.add_argument("--since", help="YYYY-MM-DD. 워터마크와 관계없이 이 날짜부터 다시 집계합니다.")
+        parser.add_argument("--until", help="YYYY-MM-DD. --since 와 함께 사용합니다. (기본: 오늘)")
+
+    def handle(self, *args, **options):
+        if options["since"]:
+            try:
+                since = date.fromisoformat(options["since"])
+                until = date.fromisoformat(options["until"]) if options["until"] else None
+            except ValueError:
+                raise CommandError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+            days = rebuild_rollups(since, until, names=options["only"])
+            if not days:
+                raise CommandError("--until 이 --since 보다 이릅니다.")
+            self.stdout.write(self.style.SUCCESS(f"{len(days)}일 다시 집계 ({days[0]} ~ {days[-1]})"))
+            return
+
+        for name, days in build_rollups(names=options["only"]).items():
+            self.stdout.write(f"{name}: {', '.join(map(str, days)) or '새 데이터 없음'}")
+        self.stdout.write(self.style.SUCCESS("완료"))
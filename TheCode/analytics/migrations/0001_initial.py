@@ -0,0 +1,99 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("contents", "0002_acceptedanswer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("last_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DailyActiveUsers",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("platform", models.CharField(blank=True, max_length=20)),
+                ("app_version", models.CharField(blank=True, max_length=50)),
+                ("users", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "platform", "app_version"),
+                        name="analytics_dau_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="StageDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("entries", models.PositiveIntegerField(default=0)),
+                ("completed_entries", models.PositiveIntegerField(default=0)),
+                ("median_dwell_seconds", models.FloatField(blank=True, null=True)),
+                ("p90_dwell_seconds", models.FloatField(blank=True, null=True)),
+                ("ad_watches", models.PositiveIntegerField(default=0)),
+                (
+                    "stage",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="contents.stage",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["stage", "date"], name="analytics_stage_daily_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "stage"), name="analytics_stage_daily_unique"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+        ("contents", "0002_acceptedanswer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EpisodeFunnel",
+            fields=[],
+            options={
+                "verbose_name": "에피소드 퍼널",
+                "verbose_name_plural": "에피소드 퍼널",
+                "proxy": True,
+                "indexes": [],
+                "constraints": [],
+            },
+            bases=("contents.episode",),
+        ),
+    ]
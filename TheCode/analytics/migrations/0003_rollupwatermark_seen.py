@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_episodefunnel"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rollupwatermark",
+            name="seen_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="rollupwatermark",
+            name="seen_id",
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
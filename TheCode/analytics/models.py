@@ -0,0 +1,75 @@
+from django.db import models
+
+from contents.models import Episode, Stage
+
+
+class RollupWatermark(models.Model):
+    """
+    집계마다 어디까지(원본 테이블의 id) 반영했는지 기록한다.
+    seen_id 는 seen_at 에 본 max(id) 로, ROLLUP_SAFETY_LAG_SECONDS 가 지나면 그 id 까지 반영한다.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    seen_id = models.BigIntegerField(default=0)
+    seen_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} (~{self.last_id})"
+
+
+class DailyActiveUsers(models.Model):
+    # platform, app_version 이 모두 빈 값인 행은 그날 전체 사용자 수다. (플랫폼/버전별 합계와 다를 수 있다)
+    TOTAL = ""
+
+    date = models.DateField()
+    platform = models.CharField(max_length=20, blank=True)
+    app_version = models.CharField(max_length=50, blank=True)
+    users = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "platform", "app_version"],
+                name="analytics_dau_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.platform or '전체'} {self.app_version}: {self.users}"
+
+
+class StageDailyStats(models.Model):
+    date = models.DateField()
+    stage = models.ForeignKey(Stage, on_delete=models.CASCADE, related_name="daily_stats")
+
+    entries = models.PositiveIntegerField(default=0)
+    # exited_at 이 있는 입장만 체류 시간 통계에 들어간다.
+    completed_entries = models.PositiveIntegerField(default=0)
+    median_dwell_seconds = models.FloatField(null=True, blank=True)
+    p90_dwell_seconds = models.FloatField(null=True, blank=True)
+
+    ad_watches = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "stage"], name="analytics_stage_daily_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["stage", "date"], name="analytics_stage_daily_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.stage}"
+
+
+class EpisodeFunnel(Episode):
+    """
+    관리자 화면에 에피소드 퍼널 메뉴를 두기 위한 프록시. (테이블 없음)
+    """
+
+    class Meta:
+        proxy = True
+        verbose_name = "에피소드 퍼널"
+        verbose_name_plural = "에피소드 퍼널"
@@ -0,0 +1,246 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Max
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from analytics.aggregates import PercentileCont, percentile
+from analytics.models import DailyActiveUsers, RollupWatermark, StageDailyStats
+from commerce.models import AdEvent
+from logs.models import AppAccessLog, StageActivityLog
+
+
+def day_range(day):
+    """
+    현재 시간대(TIME_ZONE) 기준 하루의 [시작, 끝) 시각. 원본 테이블에는 범위 조건으로만 조회한다.
+    """
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def rebuild_daily_active_users(day):
+    start, end = day_range(day)
+    logs = AppAccessLog.objects.filter(occurred_at__gte=start, occurred_at__lt=end).order_by()
+
+    rows = [
+        DailyActiveUsers(date=day, **row)
+        for row in logs.values("platform", "app_version").annotate(users=Count("user_id", distinct=True))
+    ]
+    total = logs.aggregate(users=Count("user_id", distinct=True))["users"]
+    if total:
+        rows.append(
+            DailyActiveUsers(
+                date=day,
+                platform=DailyActiveUsers.TOTAL,
+                app_version=DailyActiveUsers.TOTAL,
+                users=total,
+            )
+        )
+
+    DailyActiveUsers.objects.filter(date=day).delete()
+    DailyActiveUsers.objects.bulk_create(rows)
+    return len(rows)
+
+
+def _seconds(duration):
+    return None if duration is None else duration.total_seconds()
+
+
+def _dwell_stats(logs):
+    """
+    스테이지별 {entries, completed_entries, median_dwell_seconds, p90_dwell_seconds}.
+    PostgreSQL 은 percentile_cont 로 한 번에 구하고, 그 밖의 DB 는 체류 시간을 읽어 와 계산한다.
+    """
+    counts = logs.values("stage_id").annotate(entries=Count("id"), completed_entries=Count("exited_at"))
+
+    if connection.vendor == "postgresql":
+        dwell = ExpressionWrapper(F("exited_at") - F("entered_at"), output_field=DurationField())
+        rows = counts.annotate(
+            median=PercentileCont(dwell, 0.5, output_field=DurationField()),
+            p90=PercentileCont(dwell, 0.9, output_field=DurationField()),
+        )
+        return {
+            row["stage_id"]: {
+                "entries": row["entries"],
+                "completed_entries": row["completed_entries"],
+                "median_dwell_seconds": _seconds(row["median"]),
+                "p90_dwell_seconds": _seconds(row["p90"]),
+            }
+            for row in rows
+        }
+
+    durations = defaultdict(list)
+    for stage_id, entered_at, exited_at in logs.filter(exited_at__isnull=False).values_list(
+        "stage_id", "entered_at", "exited_at"
+    ):
+        durations[stage_id].append((exited_at - entered_at).total_seconds())
+
+    stats = {}
+    for row in counts:
+        values = sorted(durations[row["stage_id"]])
+        stats[row["stage_id"]] = {
+            "entries": row["entries"],
+            "completed_entries": row["completed_entries"],
+            "median_dwell_seconds": percentile(values, 0.5),
+            "p90_dwell_seconds": percentile(values, 0.9),
+        }
+    return stats
+
+
+def _upsert_stage_stats(day, values_by_stage, fields, empty):
+    """
+    (date, stage) 행에서 fields 만 덮어쓴다. 다른 집계가 채운 칸은 건드리지 않는다.
+    이번에 값이 없는 스테이지는 empty 로 되돌린다.
+    """
+    StageDailyStats.objects.filter(date=day).exclude(stage_id__in=values_by_stage).update(**empty)
+    StageDailyStats.objects.bulk_create(
+        [StageDailyStats(date=day, stage_id=stage_id, **values) for stage_id, values in values_by_stage.items()],
+        update_conflicts=True,
+        unique_fields=["date", "stage"],
+        update_fields=fields,
+    )
+    return len(values_by_stage)
+
+
+def rebuild_stage_dwell(day):
+    start, end = day_range(day)
+    logs = StageActivityLog.objects.filter(entered_at__gte=start, entered_at__lt=end).order_by()
+    return _upsert_stage_stats(
+        day,
+        _dwell_stats(logs),
+        fields=["entries", "completed_entries", "median_dwell_seconds", "p90_dwell_seconds"],
+        empty={
+            "entries": 0,
+            "completed_entries": 0,
+            "median_dwell_seconds": None,
+            "p90_dwell_seconds": None,
+        },
+    )
+
+
+def rebuild_stage_ad_watches(day):
+    start, end = day_range(day)
+    rows = (
+        AdEvent.objects.filter(watched_at__gte=start, watched_at__lt=end)
+        .order_by()
+        .values("stage_id")
+        .annotate(ad_watches=Count("id"))
+    )
+    return _upsert_stage_stats(
+        day,
+        {row["stage_id"]: {"ad_watches": row["ad_watches"]} for row in rows},
+        fields=["ad_watches"],
+        empty={"ad_watches": 0},
+    )
+
+
+@dataclass(frozen=True)
+class Rollup:
+    name: str
+    model: type
+    time_field: str
+    rebuild: object
+
+
+ROLLUPS = (
+    Rollup("daily_active_users", AppAccessLog, "occurred_at", rebuild_daily_active_users),
+    Rollup("stage_dwell", StageActivityLog, "entered_at", rebuild_stage_dwell),
+    Rollup("stage_ad_watches", AdEvent, "watched_at", rebuild_stage_ad_watches),
+)
+
+
+def affected_days(rollup, after_id, upto_id):
+    return sorted(
+        rollup.model.objects.filter(id__gt=after_id, id__lte=upto_id)
+        .order_by()
+        .annotate(day=TruncDate(rollup.time_field))
+        .values_list("day", flat=True)
+        .distinct()
+    )
+
+
+def _safe_id(rollup, now):
+    """
+    이번 실행에서 반영해도 되는 id 상한.
+    PostgreSQL 의 id 는 커밋이 아니라 INSERT 때 정해지므로, max(id) 를 본 순간에도 그보다 작은 id 가
+    아직 커밋되지 않았을 수 있다. 그래서 본 max(id) 를 seen_id 로 남겨 두고,
+    ROLLUP_SAFETY_LAG_SECONDS 가 지나 그 사이의 트랜잭션이 모두 끝난 뒤에야 그 id 까지 반영한다.
+    """
+    lag = timedelta(seconds=settings.ROLLUP_SAFETY_LAG_SECONDS)
+    with transaction.atomic():
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=rollup.name)
+        last_seen = rollup.model.objects.aggregate(last=Max("id"))["last"] or 0
+        if not lag:
+            return last_seen
+
+        safe_id = watermark.last_id
+        if watermark.seen_at is None or watermark.seen_at <= now - lag:
+            if watermark.seen_at is not None:
+                safe_id = max(safe_id, watermark.seen_id)
+            watermark.seen_id, watermark.seen_at = last_seen, now
+            watermark.save(update_fields=["seen_id", "seen_at", "updated_at"])
+    return safe_id
+
+
+def _chunk_end(rollup, after_id, upto_id):
+    """
+    after_id 다음부터 ROLLUP_CHUNK_SIZE 번째 행의 id. 남은 행이 그보다 적으면 upto_id.
+    """
+    size = settings.ROLLUP_CHUNK_SIZE
+    ids = rollup.model.objects.filter(id__gt=after_id, id__lte=upto_id).order_by("id").values_list("id", flat=True)
+    return next(iter(ids[size - 1 : size]), upto_id)
+
+
+def run_rollup(rollup, now=None):
+    """
+    워터마크 이후에 들어온 행이 속한 날짜만 원본에서 다시 집계한다.
+    날짜 단위로 통째로 다시 계산하므로 같은 구간을 여러 번 돌려도 결과가 같다.
+    ROLLUP_CHUNK_SIZE 행씩 나눠 각자의 트랜잭션에서 반영하고 워터마크를 옮기므로,
+    처음 실행처럼 밀린 행이 많아도 한 트랜잭션이 길어지지 않는다.
+    워터마크 행을 잠그므로 같은 구간을 동시에 두 번 집계하지 않는다.
+    반환값: 다시 집계한 날짜 목록
+    """
+    upto_id = _safe_id(rollup, now or timezone.now())
+
+    days = set()
+    while True:
+        with transaction.atomic():
+            watermark = RollupWatermark.objects.select_for_update().get(name=rollup.name)
+            if watermark.last_id >= upto_id:
+                break
+
+            end_id = _chunk_end(rollup, watermark.last_id, upto_id)
+            chunk_days = affected_days(rollup, watermark.last_id, end_id)
+            for day in chunk_days:
+                rollup.rebuild(day)
+            days.update(chunk_days)
+
+            watermark.last_id = end_id
+            watermark.save(update_fields=["last_id", "updated_at"])
+    return sorted(days)
+
+
+def build_rollups(names=None, now=None):
+    """
+    반환값: {집계 이름: 다시 집계한 날짜 목록}
+    """
+    return {rollup.name: run_rollup(rollup, now) for rollup in ROLLUPS if not names or rollup.name in names}
+
+
+def rebuild_rollups(since, until=None, names=None):
+    """
+    워터마크와 관계없이 since ~ until 날짜를 다시 집계한다. (보관 기간 정리나 과거 데이터 보정 뒤)
+    """
+    until = until or timezone.localdate()
+    days = [since + timedelta(days=offset) for offset in range((until - since).days + 1)]
+    for rollup in ROLLUPS:
+        if names and rollup.name not in names:
+            continue
+        with transaction.atomic():
+            for day in days:
+                rollup.rebuild(day)
+    return days
@@ -0,0 +1,7 @@
+from analytics.rollups import build_rollups
+from jobs.queue import task
+
+
+@task("analytics.build_rollups", max_attempts=1)
+def build_rollups_task(payload):
+    build_rollups(names=payload.get("only"))
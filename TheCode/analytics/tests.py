@@ -0,0 +1,279 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.aggregates import percentile
+from analytics.funnel import compute_funnels, get_funnels, invalidate_funnels
+from analytics.models import DailyActiveUsers, RollupWatermark, StageDailyStats
+from analytics.rollups import affected_days, build_rollups
+from commerce.models import AdEvent
+from contents import catalog
+from contents.models import Series, Episode, Stage
+from logs.models import AppAccessLog, StageActivityLog
+from progress.models import UserEpisodeProgress
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+@override_settings(ROLLUP_SAFETY_LAG_SECONDS=0)
+class RollupTests(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(provider="google", provider_user_id=f"player{i}") for i in range(3)
+        ]
+
+        series = Series.objects.create(code="S1", title="Series")
+        episode = Episode.objects.create(
+            series=series,
+            code="EP1",
+            title="Episode",
+            price_unlock_stages=1000,
+            price_unlock_with_adfree=2000,
+        )
+        self.stage = Stage.objects.create(
+            episode=episode, stage_no=1, title="One", image_key="", answer_text="a"
+        )
+
+    def app_log(self, user, occurred_at, platform="android", app_version="1.0.0"):
+        return AppAccessLog.objects.create(
+            user=user,
+            event_type="app_open",
+            platform=platform,
+            app_version=app_version,
+            occurred_at=occurred_at,
+        )
+
+    def stage_log(self, user, entered_at, seconds=None):
+        return StageActivityLog.objects.create(
+            user=user,
+            stage=self.stage,
+            entered_at=entered_at,
+            exited_at=entered_at + timedelta(seconds=seconds) if seconds is not None else None,
+        )
+
+    def dau(self, day, platform="", app_version=""):
+        return DailyActiveUsers.objects.get(date=day, platform=platform, app_version=app_version).users
+
+    def test_daily_active_users(self):
+        a, b, c = self.users
+        day = date(2026, 3, 2)
+        # KST 기준 날짜로 묶인다. (UTC 3/1 16:00 = KST 3/2 01:00)
+        self.app_log(a, utc(2026, 3, 1, 16))
+        self.app_log(a, utc(2026, 3, 2, 1))
+        self.app_log(a, utc(2026, 3, 2, 2), app_version="1.1.0")
+        self.app_log(b, utc(2026, 3, 2, 3), platform="ios")
+        self.app_log(c, utc(2026, 3, 2, 16))
+
+        build_rollups()
+
+        self.assertEqual(self.dau(day, "android", "1.0.0"), 1)
+        self.assertEqual(self.dau(day, "android", "1.1.0"), 1)
+        self.assertEqual(self.dau(day, "ios", "1.0.0"), 1)
+        # 버전을 바꾼 사용자는 전체에서 한 번만 센다.
+        self.assertEqual(self.dau(day), 2)
+        self.assertEqual(self.dau(date(2026, 3, 3)), 1)
+
+    def test_runs_are_incremental_and_idempotent(self):
+        a, b, _ = self.users
+        self.app_log(a, utc(2026, 3, 2, 1))
+        self.app_log(a, utc(2026, 3, 5, 1))
+
+        self.assertEqual(build_rollups()["daily_active_users"], [date(2026, 3, 2), date(2026, 3, 5)])
+        self.assertEqual(build_rollups()["daily_active_users"], [])
+
+        # 늦게 도착한 과거 이벤트는 그 날짜만 다시 집계한다.
+        late = self.app_log(b, utc(2026, 3, 2, 2))
+        self.assertEqual(build_rollups()["daily_active_users"], [date(2026, 3, 2)])
+        self.assertEqual(self.dau(date(2026, 3, 2)), 2)
+        self.assertEqual(RollupWatermark.objects.get(name="daily_active_users").last_id, late.id)
+
+        # 워터마크를 되돌려 같은 구간을 다시 돌려도 결과가 같다.
+        RollupWatermark.objects.update(last_id=0)
+        build_rollups()
+        self.assertEqual(self.dau(date(2026, 3, 2)), 2)
+        self.assertEqual(DailyActiveUsers.objects.filter(date=date(2026, 3, 2)).count(), 2)
+
+    @override_settings(ROLLUP_SAFETY_LAG_SECONDS=300)
+    def test_ids_wait_for_safety_lag(self):
+        a, b, _ = self.users
+        in_flight = self.app_log(b, utc(2026, 3, 2, 1))
+        first = self.app_log(a, utc(2026, 3, 5, 1))
+        # 더 작은 id 의 트랜잭션이 아직 커밋되지 않은 상황
+        in_flight_id = in_flight.id
+        in_flight.delete()
+        now = utc(2026, 3, 10)
+
+        self.assertEqual(build_rollups(now=now)["daily_active_users"], [])
+
+        # 그 행이 뒤늦게 커밋된다.
+        AppAccessLog.objects.create(
+            id=in_flight_id,
+            user=b,
+            event_type="app_open",
+            platform="android",
+            app_version="1.0.0",
+            occurred_at=utc(2026, 3, 2, 1),
+        )
+        self.assertEqual(build_rollups(now=now + timedelta(seconds=60))["daily_active_users"], [])
+
+        self.assertEqual(
+            build_rollups(now=now + timedelta(seconds=300))["daily_active_users"],
+            [date(2026, 3, 2), date(2026, 3, 5)],
+        )
+        self.assertEqual(self.dau(date(2026, 3, 2)), 1)
+        self.assertEqual(RollupWatermark.objects.get(name="daily_active_users").last_id, first.id)
+
+    @override_settings(ROLLUP_CHUNK_SIZE=2)
+    def test_backlog_is_applied_in_chunks(self):
+        for day in range(1, 6):
+            self.app_log(self.users[0], utc(2026, 3, day, 1))
+
+        with mock.patch("analytics.rollups.affected_days", wraps=affected_days) as affected:
+            days = build_rollups(names=["daily_active_users"])["daily_active_users"]
+
+        self.assertEqual(affected.call_count, 3)
+        self.assertEqual(days, [date(2026, 3, day) for day in range(1, 6)])
+        self.assertEqual(
+            RollupWatermark.objects.get(name="daily_active_users").last_id,
+            AppAccessLog.objects.latest("id").id,
+        )
+
+    def test_stage_dwell_and_ad_watches(self):
+        user = self.users[0]
+        entered_at = utc(2026, 3, 2, 1)
+        for seconds in (60, 120, 180, 240, 300, None):
+            self.stage_log(user, entered_at, seconds)
+        for i in range(2):
+            AdEvent.objects.create(user=user, stage=self.stage, transaction_id=f"tx{i}")
+
+        build_rollups()
+
+        stats = StageDailyStats.objects.get(date=date(2026, 3, 2), stage=self.stage)
+        self.assertEqual((stats.entries, stats.completed_entries), (6, 5))
+        self.assertEqual(stats.median_dwell_seconds, 180)
+        self.assertAlmostEqual(stats.p90_dwell_seconds, 276)
+
+        ads = StageDailyStats.objects.exclude(ad_watches=0).get()
+        self.assertEqual(ads.ad_watches, 2)
+
+    def test_dwell_rebuild_keeps_ad_watches(self):
+        AdEvent.objects.create(user=self.users[0], stage=self.stage, transaction_id="tx")
+        build_rollups()
+        day = StageDailyStats.objects.get().date
+
+        entered_at = datetime.combine(day, datetime.min.time(), tzinfo=dt_timezone(timedelta(hours=9)))
+        self.stage_log(self.users[0], entered_at + timedelta(hours=1), 30)
+        build_rollups()
+
+        stats = StageDailyStats.objects.get()
+        self.assertEqual((stats.entries, stats.ad_watches), (1, 1))
+
+    def test_command_rebuilds_date_range(self):
+        self.app_log(self.users[0], utc(2026, 3, 2, 1))
+        out = StringIO()
+
+        call_command("build_rollups", "--since", "2026-03-01", "--until", "2026-03-03", stdout=out)
+
+        self.assertEqual(self.dau(date(2026, 3, 2)), 1)
+        self.assertFalse(RollupWatermark.objects.exists())
+        self.assertIn("3일", out.getvalue())
+
+    def test_percentile_matches_percentile_cont(self):
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(percentile([5], 0.9), 5)
+        self.assertEqual(percentile([1, 2, 3, 4], 0.5), 2.5)
+
+    def test_admin_reads_rollups(self):
+        admin_user = User.objects.create_superuser(email="admin@example.com", username="admin", password="pw")
+        self.client.force_login(admin_user)
+        self.app_log(self.users[0], utc(2026, 3, 2, 1))
+        self.stage_log(self.users[0], utc(2026, 3, 2, 1), 30)
+        build_rollups()
+
+        for name in ("dailyactiveusers", "stagedailystats", "rollupwatermark"):
+            response = self.client.get(f"/admin/analytics/{name}/")
+            self.assertEqual(response.status_code, 200, name)
+
+
+class FunnelTests(TestCase):
+    def setUp(self):
+        catalog.invalidate_catalog()
+        invalidate_funnels()
+
+        series = Series.objects.create(code="S1", title="Series")
+        self.episode = Episode.objects.create(
+            series=series,
+            code="EP1",
+            title="Episode",
+            price_unlock_stages=1000,
+            price_unlock_with_adfree=2000,
+        )
+        for no in (1, 2, 3):
+            Stage.objects.create(
+                episode=self.episode, stage_no=no, title=str(no), image_key="", answer_text="a"
+            )
+        Episode.objects.create(
+            series=series,
+            code="EP2",
+            title="Empty",
+            price_unlock_stages=1000,
+            price_unlock_with_adfree=2000,
+        )
+
+        started_at = utc(2026, 3, 1)
+        for i, (highest, cleared) in enumerate([(1, False), (2, False), (3, False), (3, True)]):
+            user = User.objects.create_user(provider="google", provider_user_id=f"player{i}")
+            UserEpisodeProgress.objects.create(
+                user=user,
+                episode=self.episode,
+                highest_stage_no=highest,
+                current_stage_no=highest,
+                is_cleared=cleared,
+                cleared_at=started_at + timedelta(minutes=10) if cleared else None,
+            )
+        UserEpisodeProgress.objects.update(started_at=started_at)
+
+    def test_funnel(self):
+        report = compute_funnels()
+        funnel, empty = report.episodes
+
+        self.assertEqual((funnel.players, funnel.cleared, funnel.clear_rate), (4, 1, 0.25))
+        self.assertEqual(funnel.median_clear_seconds, 600)
+        self.assertEqual([s.reached for s in funnel.stages], [4, 3, 2])
+        self.assertEqual([s.stalled for s in funnel.stages], [1, 1, 1])
+        self.assertEqual(funnel.stages[1].reach_rate, 0.75)
+        self.assertEqual((empty.players, empty.stages), (0, []))
+
+    def test_single_aggregate_pass(self):
+        catalog.get_catalog()
+        # PostgreSQL 은 GROUPING SETS 한 번, SQLite 는 행을 한 번 읽어 온다.
+        with self.assertNumQueries(1):
+            compute_funnels()
+
+    def test_cached_until_refresh(self):
+        first = get_funnels()
+        with self.assertNumQueries(0):
+            self.assertIs(get_funnels(), first)
+        self.assertIsNot(get_funnels(refresh=True), first)
+
+    def test_endpoint_is_staff_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(provider_user_id="player0"))
+        self.assertEqual(client.get("/api/v1/analytics/funnel/").status_code, 403)
+
+        client.force_authenticate(User.objects.create_superuser(email="a@example.com", username="admin"))
+        response = client.get("/api/v1/analytics/funnel/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["episodes"][0]["stages"][0]["reached"], 4)
+
+    def test_admin_view(self):
+        self.client.force_login(User.objects.create_superuser(email="a@example.com", username="admin"))
+        response = self.client.get("/admin/analytics/episodefunnel/")
+        self.assertContains(response, "EP1 - Episode")
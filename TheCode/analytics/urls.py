@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import EpisodeFunnelView
+
+urlpatterns = [
+    path("funnel/", EpisodeFunnelView.as_view()),
+]
@@ -0,0 +1,20 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from analytics.funnel import get_funnels
+from utils.response import success_response
+
+
+class EpisodeFunnelView(APIView):
+    """
+    에피소드별 스테이지 도달/이탈 퍼널. (staff 전용, ?refresh=1 이면 캐시를 무시한다)
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        report = get_funnels(refresh=request.query_params.get("refresh") == "1")
+        return success_response(
+            message="에피소드 퍼널입니다.",
+            data=report.as_dict(),
+        )
@@ -1,20 +1,24 @@
 from django.contrib import admin
 from .models import AdEvent, UserStageHintAccess, UserEntitlement
+from utils.admin import EstimatedCountMixin
 
 @admin.register(AdEvent)
-class AdEventAdmin(admin.ModelAdmin):
+class AdEventAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = ('user', 'stage', 'transaction_id', 'watched_at')
-    search_fields = ('user__social_id', 'transaction_id')
+    list_select_related = ('user', 'stage__episode__series')
+    search_fields = ('user__provider_user_id', '=transaction_id')
     list_filter = ('watched_at',)
 
 @admin.register(UserStageHintAccess)
 class UserStageHintAccessAdmin(admin.ModelAdmin):
     list_display = ('user', 'stage', 'unlocked_at')
-    search_fields = ('user__social_id', 'stage__name')
+    list_select_related = ('user', 'stage__episode__series')
+    search_fields = ('user__provider_user_id', 'stage__title')
     list_filter = ('unlocked_at',)
 
 @admin.register(UserEntitlement)
 class UserEntitlementAdmin(admin.ModelAdmin):
     list_display = ('user', 'entitlement_type', 'granted_at', 'expires_at')
-    search_fields = ('user__social_id', 'entitlement_type')
-    list_filter = ('entitlement_type', 'granted_at')
\ No newline at end of file
+    list_select_related = ('user',)
+    search_fields = ('user__provider_user_id', 'entitlement_type')
+    list_filter = ('entitlement_type', 'granted_at')
@@ -0,0 +1,125 @@
+import base64
+import threading
+import time
+
+import requests
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.serialization import load_der_public_key
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+class AdMobKeyStore:
+    """
+    AdMob SSV 검증 공개키 캐시.
+    verifier-keys.json 을 ttl 동안 보관하며, key_id 별로 파싱된 EllipticCurvePublicKey 를 들고 있는다.
+    갱신은 한 번에 한 스레드만 수행하고, 기다리던 스레드는 그 결과를 그대로 사용한다.
+    """
+
+    def __init__(self, keys_url, session=None, ttl=86400, min_force_interval=30, timeout=5):
+        self.keys_url = keys_url
+        self.session = session or self._build_session()
+        self.ttl = ttl
+        self.min_force_interval = min_force_interval
+        self.timeout = timeout
+
+        self.fetch_count = 0
+
+        self._keys = None
+        self._expires_at = 0
+        self._fetched_at = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_session():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=1)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _fetch(self):
+        response = self.session.get(self.keys_url, timeout=self.timeout)
+        response.raise_for_status()
+
+        keys = {}
+        for key in response.json()["keys"]:
+            public_key = load_der_public_key(base64.b64decode(key["base64_der"]))
+            if isinstance(public_key, ec.EllipticCurvePublicKey):
+                keys[str(key["key_id"])] = public_key
+
+        self.fetch_count += 1
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + self.ttl
+        self._generation += 1
+        return keys
+
+    def _refresh(self, seen_generation, force):
+        with self._lock:
+            # 기다리는 동안 다른 스레드가 이미 갱신했다면 그 결과를 쓴다.
+            if self._generation != seen_generation and self._keys is not None:
+                return self._keys
+
+            now = time.monotonic()
+            if self._keys is not None and now < self._expires_at:
+                # 알 수 없는 key_id 로 강제 갱신을 반복 유도하지 못하도록 간격을 둔다.
+                if not force or now - self._fetched_at < self.min_force_interval:
+                    return self._keys
+            return self._fetch()
+
+    def get_keys(self, force=False):
+        keys, generation = self._keys, self._generation
+        if keys is not None and not force and time.monotonic() < self._expires_at:
+            return keys
+        return self._refresh(generation, force)
+
+    def get_key(self, key_id):
+        key_id = str(key_id)
+        key = self.get_keys().get(key_id)
+        if key is None:
+            # AdMob 이 키를 교체한 직후일 수 있으므로 한 번만 강제로 다시 받아 본다.
+            key = self.get_keys(force=True).get(key_id)
+        return key
+
+
+def signed_message(query_string):
+    """
+    AdMob 은 signature, key_id 를 마지막에 붙이고 그 앞부분까지를 서명한다.
+    """
+    return query_string.split("&signature=")[0].encode("utf-8")
+
+
+def verify_admob_signature(query_string, signature, key_id, key_store=None):
+    key_store = key_store or get_admob_key_store()
+
+    try:
+        public_key = key_store.get_key(key_id)
+    except Exception as e:
+        print(f"AdMob verifier keys fetch failed: {e}")
+        return False
+    if public_key is None:
+        return False
+
+    try:
+        sig_bytes = base64.urlsafe_b64decode(signature + "===")
+        public_key.verify(sig_bytes, signed_message(query_string), ec.ECDSA(hashes.SHA256()))
+    except (InvalidSignature, ValueError):
+        return False
+    return True
+
+
+_key_store = None
+
+
+def get_admob_key_store():
+    global _key_store
+    if _key_store is None:
+        _key_store = AdMobKeyStore(
+            settings.ADMOB_VERIFIER_KEYS_URL,
+            ttl=settings.ADMOB_VERIFIER_KEYS_TTL,
+        )
+    return _key_store
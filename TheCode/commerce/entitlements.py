@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from commerce.models import UserEntitlement
+from utils.cache import LocalTTLCache
+
+
+# 광고 없이 모든 힌트를 볼 수 있는 이용권
+AD_FREE_ENTITLEMENTS = ("ad_free", "premium_pass")
+
+_REQUEST_ATTR = "_active_entitlements"
+
+
+class ActiveEntitlements:
+    """
+    사용자 한 명의 유효한 이용권. entitlement_type → 만료 시각(None 이면 무기한).
+    캐시에 남아 있는 동안 만료될 수 있으므로 조회할 때마다 만료 시각을 다시 비교한다.
+    """
+
+    __slots__ = ("expires",)
+
+    def __init__(self, expires=None):
+        self.expires = expires or {}
+
+    def has(self, entitlement_type, now=None):
+        if entitlement_type not in self.expires:
+            return False
+        expires_at = self.expires[entitlement_type]
+        return expires_at is None or expires_at > (now or timezone.now())
+
+    def has_any(self, entitlement_types, now=None):
+        now = now or timezone.now()
+        return any(self.has(t, now) for t in entitlement_types)
+
+    def next_expiry(self):
+        return min((e for e in self.expires.values() if e is not None), default=None)
+
+
+_cache = LocalTTLCache(
+    ttl=settings.ENTITLEMENT_CACHE_TTL,
+    maxsize=settings.ENTITLEMENT_CACHE_SIZE,
+)
+
+
+def load_entitlements(user_id, now=None):
+    now = now or timezone.now()
+    rows = UserEntitlement.objects.filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now),
+        user_id=user_id,
+    ).values_list("entitlement_type", "expires_at")
+
+    expires = {}
+    for entitlement_type, expires_at in rows:
+        # 같은 종류가 여러 건이면 가장 늦게 끝나는 것을 쓴다.
+        current = expires.get(entitlement_type, expires_at)
+        if current is None or expires_at is None:
+            expires[entitlement_type] = None
+        else:
+            expires[entitlement_type] = max(current, expires_at)
+    return ActiveEntitlements(expires)
+
+
+def get_cached_entitlements(user_id):
+    entitlements = _cache.get(user_id)
+    if entitlements is None:
+        now = timezone.now()
+        entitlements = load_entitlements(user_id, now)
+
+        ttl = settings.ENTITLEMENT_CACHE_TTL
+        next_expiry = entitlements.next_expiry()
+        if next_expiry is not None:
+            ttl = max(0, min(ttl, (next_expiry - now).total_seconds()))
+        _cache.set(user_id, entitlements, ttl=ttl)
+    return entitlements
+
+
+def get_entitlements(user):
+    """
+    요청 동안은 user 객체에 붙여 두고 재사용한다.
+    ClaimsUser 는 없는 속성에 접근하면 User 를 조회하므로 getattr 대신 __dict__ 를 본다.
+    """
+    entitlements = vars(user).get(_REQUEST_ATTR)
+    if entitlements is None:
+        entitlements = get_cached_entitlements(user.id)
+        setattr(user, _REQUEST_ATTR, entitlements)
+    return entitlements
+
+
+def has_entitlement(user, entitlement_type):
+    return get_entitlements(user).has(entitlement_type)
+
+
+def has_entitlements(user, entitlement_types):
+    """
+    여러 이용권을 한 번에 확인한다. {entitlement_type: bool}
+    """
+    entitlements = get_entitlements(user)
+    now = timezone.now()
+    return {t: entitlements.has(t, now) for t in entitlement_types}
+
+
+def is_ad_free(user):
+    return get_entitlements(user).has_any(AD_FREE_ENTITLEMENTS)
+
+
+def invalidate_entitlements(user_id):
+    _cache.delete(user_id)
+
+
+@receiver(post_save, sender=UserEntitlement)
+@receiver(post_delete, sender=UserEntitlement)
+def on_entitlement_changed(sender, instance, **kwargs):
+    invalidate_entitlements(instance.user_id)
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from commerce.entitlements import is_ad_free
+from commerce.models import UserStageHintAccess
+from utils.cache import LocalTTLCache
+
+
+class HintAccess:
+    """
+    사용자 한 명이 광고로 연 힌트.
+    unlocked 는 episode_id 별 비트맵이며, stage_no 번째 비트가 1 이면 열람 가능하다.
+    광고 보상은 작업 워커(run_jobs)에서 기록되므로 웹 워커의 비트맵은 그 자리에서 갱신되지 않는다.
+    잠금으로 보이는 힌트는 hint_unlock 이 DB 로 확인한 뒤에 이 워커의 비트맵에 반영한다.
+    """
+
+    __slots__ = ("unlocked",)
+
+    def __init__(self, unlocked=None):
+        self.unlocked = unlocked or {}
+
+    def can_view(self, episode_id, stage_no):
+        return bool(self.unlocked.get(episode_id, 0) >> stage_no & 1)
+
+    def grant(self, episode_id, stage_no):
+        self.unlocked[episode_id] = self.unlocked.get(episode_id, 0) | (1 << stage_no)
+
+
+_cache = LocalTTLCache(
+    ttl=settings.HINT_ACCESS_CACHE_TTL,
+    maxsize=settings.HINT_ACCESS_CACHE_SIZE,
+)
+
+
+def load_hint_access(user_id):
+    access = HintAccess()
+    rows = UserStageHintAccess.objects.filter(user_id=user_id).values_list(
+        "stage__episode_id", "stage__stage_no"
+    )
+    for episode_id, stage_no in rows:
+        access.grant(episode_id, stage_no)
+    return access
+
+
+def get_hint_access(user_id):
+    access = _cache.get(user_id)
+    if access is None:
+        access = load_hint_access(user_id)
+        _cache.set(user_id, access)
+    return access
+
+
+# 힌트를 볼 수 있는 근거. 힌트 응답의 ETag 에 넣어, 근거가 바뀌면 재검증이 304 로 끝나지 않게 한다.
+UNLOCKED_BY_AD = "ad"
+UNLOCKED_BY_ENTITLEMENT = "entitlement"
+
+
+def hint_unlock(user, stage):
+    """
+    stage 는 contents.catalog.StageEntry. 힌트를 볼 수 있는 근거를 돌려주고, 잠금이면 None.
+    캐시(광고 비트맵, 이용권)에서 열려 있으면 DB 를 조회하지 않는다.
+    캐시에 잠금으로 남아 있어도 다른 워커에서 방금 해제됐을 수 있으므로, 잠금일 때만 DB 로 한 번 확인한다.
+    """
+    cached = _cache.get(user.id)
+    access = cached if cached is not None else get_hint_access(user.id)
+    if access.can_view(stage.episode_id, stage.stage_no):
+        return UNLOCKED_BY_AD
+
+    if is_ad_free(user):
+        return UNLOCKED_BY_ENTITLEMENT
+
+    # 이번 요청에서 DB 로부터 읽은 비트맵이면 다시 확인할 필요가 없다.
+    if cached is None:
+        return None
+    if UserStageHintAccess.objects.filter(user_id=user.id, stage_id=stage.id).exists():
+        access.grant(stage.episode_id, stage.stage_no)
+        return UNLOCKED_BY_AD
+    return None
+
+
+def invalidate_hint_access(user_id):
+    _cache.delete(user_id)
+
+
+@receiver(post_delete, sender=UserStageHintAccess)
+def on_access_changed(sender, instance, **kwargs):
+    invalidate_hint_access(instance.user_id)
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("commerce", "0002_alter_userentitlement_unique_together_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userentitlement",
+            index=models.Index(
+                condition=models.Q(("expires_at__isnull", True)),
+                fields=["user", "entitlement_type"],
+                name="commerce_ent_permanent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userentitlement",
+            index=models.Index(
+                fields=["user", "expires_at"], name="commerce_ent_user_expiry_idx"
+            ),
+        ),
+    ]
@@ -23,4 +23,15 @@ class UserEntitlement(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     entitlement_type = models.CharField(max_length=50) 
     granted_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField(null=True, blank=True)
\ No newline at end of file
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 만료된 이력이 쌓여도 무기한 이용권 조회는 이 작은 인덱스만 본다.
+            models.Index(
+                fields=["user", "entitlement_type"],
+                condition=models.Q(expires_at__isnull=True),
+                name="commerce_ent_permanent_idx",
+            ),
+            models.Index(fields=["user", "expires_at"], name="commerce_ent_user_expiry_idx"),
+        ]
\ No newline at end of file
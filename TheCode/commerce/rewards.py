@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from accounts.models import User
+from commerce.models import AdEvent, UserStageHintAccess
+from utils.cache import LocalTTLCache
+
+
+_user_ids = LocalTTLCache(
+    ttl=settings.ADMOB_USER_ID_CACHE_TTL,
+    maxsize=settings.ADMOB_USER_ID_CACHE_SIZE,
+)
+
+
+def resolve_user_id(provider_user_id):
+    user_id = _user_ids.get(provider_user_id)
+    if user_id is None:
+        user_id = (
+            User.objects.filter(provider_user_id=provider_user_id)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if user_id is None:
+            return None
+        _user_ids.set(provider_user_id, user_id)
+    return user_id
+
+
+def record_ad_reward(user_id, stage, transaction_id):
+    """
+    광고 보상 한 건을 기록하고 힌트를 연다. stage 는 contents.catalog.StageEntry.
+    transaction_id 로 이미 처리한 콜백인지 확인하므로, 재전송된 콜백은 조회 한 번으로 끝나고
+    힌트 테이블은 건드리지 않는다. 동시에 들어온 같은 콜백은 get_or_create 가 unique 제약으로 하나만 남긴다.
+    반환값: 새로 기록했으면 True, 이미 처리된 transaction_id 이면 False.
+    """
+    with transaction.atomic():
+        ad_event, created = AdEvent.objects.get_or_create(
+            transaction_id=transaction_id,
+            defaults={"user_id": user_id, "stage_id": stage.id},
+        )
+        if not created:
+            return False
+
+        UserStageHintAccess.objects.bulk_create(
+            [UserStageHintAccess(user_id=user_id, stage_id=stage.id, ad_event=ad_event)],
+            ignore_conflicts=True,
+        )
+    return True
+
+
+@receiver(post_delete, sender=User)
+def on_user_deleted(sender, instance, **kwargs):
+    _user_ids.delete(instance.provider_user_id)
@@ -0,0 +1,19 @@
+from commerce.rewards import resolve_user_id, record_ad_reward
+from contents import catalog
+from jobs.queue import PermanentError, task
+
+
+AD_REWARD_TASK = "commerce.record_ad_reward"
+
+
+@task(AD_REWARD_TASK, priority=10)
+def record_ad_reward_task(payload):
+    stage = catalog.get_stage(payload["episode_id"], payload["stage_no"])
+    if stage is None:
+        raise PermanentError("Stage not found")
+
+    user_id = resolve_user_id(payload["provider_user_id"])
+    if user_id is None:
+        raise PermanentError("User not found")
+
+    record_ad_reward(user_id, stage, payload["transaction_id"])
@@ -1,3 +1,336 @@
+import base64
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode
+from unittest import mock
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.authentication import ClaimsUser
+from accounts.models import User
+from commerce import admob, entitlements, hint_access, rewards
+from commerce.models import AdEvent, UserEntitlement, UserStageHintAccess
+from contents import catalog
+from commerce.tasks import AD_REWARD_TASK, record_ad_reward_task
+from contents.models import Series, Episode, Stage
+from jobs.models import Job
+from jobs.queue import enqueue, run_pending
+
+
+class SigningKey:
+    def __init__(self, key_id):
+        self.key_id = key_id
+        self.private_key = ec.generate_private_key(ec.SECP256R1())
+
+    def as_json(self):
+        der = self.private_key.public_key().public_bytes(
+            serialization.Encoding.DER,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        return {"key_id": self.key_id, "base64_der": base64.b64encode(der).decode()}
+
+    def sign(self, params):
+        message = urlencode(params)
+        signature = self.private_key.sign(message.encode(), ec.ECDSA(hashes.SHA256()))
+        signature = base64.urlsafe_b64encode(signature).decode().rstrip("=")
+        return f"{message}&signature={signature}&key_id={self.key_id}"
+
+
+class KeyServer:
+    """
+    AdMob verifier-keys.json 을 흉내 내는 로컬 서버
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.delay = 0
+        self.requests = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                time.sleep(stub.delay)
+                body = json.dumps({"keys": [key.as_json() for key in stub.keys]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/verifier-keys.json"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class AdMobTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = KeyServer()
+        cls.key_a = SigningKey(1001)
+        cls.key_b = SigningKey(1002)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.keys = [self.key_a]
+        self.server.delay = 0
+        self.server.requests = 0
+        self.store = admob.AdMobKeyStore(self.server.url, min_force_interval=0)
+
+    def callback(self, key, transaction_id="tx-1", custom_data="EP1|2"):
+        return key.sign({
+            "ad_network": "5450213213286189855",
+            "ad_unit": "1234567890",
+            "custom_data": custom_data,
+            "reward_amount": "1",
+            "reward_item": "hint",
+            "timestamp": "1700000000000",
+            "transaction_id": transaction_id,
+            "user_id": "player",
+        })
+
+    def verify(self, query_string):
+        _, signature = query_string.split("&signature=")
+        signature, key_id = signature.split("&key_id=")
+        return admob.verify_admob_signature(query_string, signature, key_id, key_store=self.store)
+
+
+class AdMobKeyStoreTests(AdMobTestCase):
+    def test_keys_are_fetched_once(self):
+        for i in range(3):
+            self.assertTrue(self.verify(self.callback(self.key_a, transaction_id=f"tx-{i}")))
+        self.assertEqual(self.server.requests, 1)
+
+    def test_tampered_callback_is_rejected(self):
+        query_string = self.callback(self.key_a).replace("reward_amount=1", "reward_amount=100")
+        self.assertFalse(self.verify(query_string))
+
+    def test_unknown_key_id_forces_single_refresh(self):
+        self.verify(self.callback(self.key_a))
+
+        self.server.keys = [self.key_a, self.key_b]
+        self.assertTrue(self.verify(self.callback(self.key_b)))
+        self.assertEqual(self.server.requests, 2)
+
+        self.assertFalse(self.verify(self.callback(SigningKey(9999))))
+        self.assertEqual(self.server.requests, 3)
+
+    def test_concurrent_cold_start_fetches_once(self):
+        self.server.delay = 0.2
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(self.verify(self.callback(self.key_a)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [True] * 8)
+        self.assertEqual(self.server.requests, 1)
+
+    def test_ttl_expiry_refetches(self):
+        self.store.ttl = 0
+        self.verify(self.callback(self.key_a))
+        self.verify(self.callback(self.key_a))
+        self.assertEqual(self.server.requests, 2)
+
+
+class AdMobSSVViewTests(AdMobTestCase):
+    def setUp(self):
+        super().setUp()
+        catalog.invalidate_catalog()
+        admob._key_store = self.store
+        self.addCleanup(setattr, admob, "_key_store", None)
+
+        self.user = User.objects.create_user(provider="google", provider_user_id="player")
+        series = Series.objects.create(code="S1", title="Series")
+        episode = Episode.objects.create(
+            series=series,
+            code="EP1",
+            title="Episode",
+            price_unlock_stages=1000,
+            price_unlock_with_adfree=2000,
+        )
+        self.stage = Stage.objects.create(
+            episode=episode, stage_no=2, title="Two", image_key="", answer_text="Banana"
+        )
+        hint_access.invalidate_hint_access(self.user.id)
+        rewards._user_ids.clear()
+
+    def get(self, query_string):
+        return self.client.get(f"/api/v1/commerce/admob-ssv/?{query_string}")
+
+    def statements(self, ctx):
+        # 테스트는 트랜잭션 안에서 돌기 때문에 생기는 SAVEPOINT 는 세지 않는다.
+        return [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+
+    def test_signed_callback_grants_hint(self):
+        response = self.get(self.callback(self.key_a))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(UserStageHintAccess.objects.exists())
+
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertTrue(UserStageHintAccess.objects.filter(user=self.user, stage=self.stage).exists())
+
+    def test_invalid_signature_is_rejected(self):
+        query_string = self.callback(self.key_a).replace("custom_data=EP1%7C2", "custom_data=EP1%7C3")
+        response = self.get(query_string)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    def test_callback_is_acknowledged_with_one_insert(self):
+        catalog.get_catalog()
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.get(self.callback(self.key_a)).status_code, 200)
+        self.assertEqual(len(self.statements(ctx)), 1)
+
+    def test_retried_callback_is_recorded_once(self):
+        query_string = self.callback(self.key_a)
+
+        self.assertEqual(self.get(query_string).status_code, 200)
+        self.assertEqual(self.get(query_string).status_code, 200)
+        self.assertEqual(Job.objects.count(), 1)
+
+        run_pending()
+        self.assertEqual(AdEvent.objects.count(), 1)
+        self.assertEqual(UserStageHintAccess.objects.count(), 1)
+
+    def payload(self, transaction_id):
+        return {
+            "provider_user_id": "player",
+            "episode_id": self.stage.episode_id,
+            "stage_no": 2,
+            "transaction_id": transaction_id,
+        }
+
+    def test_warm_reward_costs_three_queries(self):
+        record_ad_reward_task(self.payload("warm-up"))
+        UserStageHintAccess.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as ctx:
+            record_ad_reward_task(self.payload("tx-2"))
+
+        # transaction_id 조회, AdEvent INSERT, 힌트 INSERT
+        self.assertEqual(len(self.statements(ctx)), 3)
+        self.assertTrue(UserStageHintAccess.objects.filter(user=self.user, stage=self.stage).exists())
+
+    def test_duplicate_does_not_touch_hint_table(self):
+        record_ad_reward_task(self.payload("tx-1"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            record_ad_reward_task(self.payload("tx-1"))
+        self.assertFalse(any("userstagehintaccess" in q["sql"] for q in ctx.captured_queries))
+        self.assertFalse(any(q["sql"].startswith("INSERT") for q in ctx.captured_queries))
+
+    def test_queue_failure_is_logged(self):
+        with mock.patch("commerce.views.enqueue", side_effect=DatabaseError("db down")):
+            with self.assertLogs("commerce.views", "ERROR"):
+                response = self.get(self.callback(self.key_a))
+        self.assertEqual(response.status_code, 500)
+
+    def test_unknown_user_fails_without_retry(self):
+        payload = self.payload("tx-1")
+        payload["provider_user_id"] = "nobody"
+        enqueue(AD_REWARD_TASK, payload)
+
+        self.assertEqual(run_pending(), (0, 1))
+        self.assertEqual(Job.objects.get().status, Job.STATUS_FAILED)
+
+    def test_ambiguous_episode_code_needs_series(self):
+        other = Series.objects.create(code="S2", title="Other")
+        episode = Episode.objects.create(
+            series=other,
+            code="EP1",
+            title="Other Episode",
+            price_unlock_stages=1000,
+            price_unlock_with_adfree=2000,
+        )
+        Stage.objects.create(episode=episode, stage_no=2, title="Two", image_key="", answer_text="X")
+
+        self.assertEqual(self.get(self.callback(self.key_a)).status_code, 400)
+
+        response = self.get(self.callback(self.key_a, custom_data="S1|EP1|2"))
+        self.assertEqual(response.status_code, 200)
+        run_pending()
+        self.assertEqual(AdEvent.objects.get().stage_id, self.stage.id)
+
+
+class EntitlementTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(provider="google", provider_user_id="buyer")
+        entitlements.invalidate_entitlements(self.user.id)
+
+    def request_user(self):
+        return ClaimsUser(self.user.id, True, token=None)
+
+    def grant(self, entitlement_type, expires_in=None):
+        expires_at = timezone.now() + expires_in if expires_in is not None else None
+        return UserEntitlement.objects.create(
+            user=self.user, entitlement_type=entitlement_type, expires_at=expires_at
+        )
+
+    def test_memoized_per_request_without_loading_user(self):
+        self.grant("ad_free")
+        user = self.request_user()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(entitlements.has_entitlement(user, "ad_free"))
+            self.assertTrue(entitlements.is_ad_free(user))
+            self.assertFalse(entitlements.has_entitlement(user, "unlock_stages"))
+
+    def test_worker_cache_is_shared_across_requests(self):
+        entitlements.has_entitlement(self.request_user(), "ad_free")
+
+        with self.assertNumQueries(0):
+            entitlements.has_entitlement(self.request_user(), "ad_free")
+
+    def test_bulk_lookup(self):
+        self.grant("ad_free")
+        self.grant("premium_pass", expires_in=-timedelta(days=1))
+
+        self.assertEqual(
+            entitlements.has_entitlements(self.request_user(), ["ad_free", "premium_pass"]),
+            {"ad_free": True, "premium_pass": False},
+        )
+
+    def test_grant_invalidates_cache(self):
+        self.assertFalse(entitlements.is_ad_free(self.request_user()))
+
+        self.grant("premium_pass", expires_in=timedelta(days=30))
+        self.assertTrue(entitlements.is_ad_free(self.request_user()))
+
+    def test_cached_entitlement_expires(self):
+        entitlement = self.grant("ad_free", expires_in=timedelta(hours=1))
+        cached = entitlements.get_cached_entitlements(self.user.id)
 
-# Create your tests here.
+        later = entitlement.expires_at + timedelta(seconds=1)
+        self.assertTrue(cached.has("ad_free", now=entitlement.expires_at - timedelta(seconds=1)))
+        self.assertFalse(cached.has("ad_free", now=later))
@@ -1,19 +1,19 @@
-import base64
-import requests
-from django.db import transaction
+import logging
+
+from django.db import DatabaseError
 from django.http import HttpResponse, HttpResponseBadRequest
 from django.views import View
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives.serialization import load_der_public_key
 
-from .models import AdEvent, UserStageHintAccess
-from accounts.models import User
-from contents.models import Stage
+from .admob import verify_admob_signature
+from .tasks import AD_REWARD_TASK
+from contents import catalog
+from jobs.queue import enqueue
+
+
+logger = logging.getLogger(__name__)
 
-class AdMobSSVView(View):
-    KEYS_URL = "https://www.gstatic.com/admob/reward/verifier-keys.json"
 
+class AdMobSSVView(View):
     def get(self, request):
         query_string = request.META.get('QUERY_STRING', '')
         user_social_id = request.GET.get('user_id')
@@ -25,64 +25,43 @@ class AdMobSSVView(View):
         if not all([user_social_id, custom_data_raw, transaction_id, signature, key_id]):
             return HttpResponseBadRequest("Missing parameters")
 
-        if AdEvent.objects.filter(transaction_id=transaction_id).exists():
-            return HttpResponse(status=200)
-
         if not self.verify_signature(query_string, signature, key_id):
             return HttpResponseBadRequest("Invalid signature")
 
-        try:
-            try:
-                ep_code, s_no = custom_data_raw.split('|')
-            except ValueError:
-                return HttpResponseBadRequest("Invalid custom_data format. Expected 'EP_CODE|STAGE_NO'")
-
-            with transaction.atomic():
-                user = User.objects.get(provider_user_id=user_social_id)
-                stage = Stage.objects.get(
-                    episode__code=ep_code, 
-                    stage_no=s_no
-                )
+        # 'EP_CODE|STAGE_NO', 에피소드 code 가 여러 시리즈에 있으면 'SERIES_CODE|EP_CODE|STAGE_NO'
+        parts = custom_data_raw.split('|')
+        if len(parts) not in (2, 3) or not parts[-1].isdigit():
+            return HttpResponseBadRequest("Invalid custom_data format. Expected 'EP_CODE|STAGE_NO'")
+        series_code = parts[0] if len(parts) == 3 else None
+        ep_code, s_no = parts[-2], int(parts[-1])
 
-                ad_event = AdEvent.objects.create(
-                    user=user,
-                    stage=stage,
-                    transaction_id=transaction_id
+        try:
+            stages = catalog.find_stages_by_code(ep_code, s_no, series_code)
+            if not stages:
+                return HttpResponseBadRequest("Stage not found")
+            if len(stages) > 1:
+                return HttpResponseBadRequest(
+                    "Ambiguous episode code. Expected 'SERIES_CODE|EP_CODE|STAGE_NO'"
                 )
 
-                UserStageHintAccess.objects.get_or_create(
-                    user=user,
-                    stage=stage,
-                    defaults={
-                        'ad_event': ad_event,
-                    }
-                )
-            
+            # 서명이 확인되면 바로 응답하고, 보상 기록과 힌트 해제는 워커에서 처리한다.
+            stage = stages[0]
+            enqueue(
+                AD_REWARD_TASK,
+                {
+                    "provider_user_id": user_social_id,
+                    "episode_id": stage.episode_id,
+                    "stage_no": stage.stage_no,
+                    "transaction_id": transaction_id,
+                },
+                unique_key=f"admob:{transaction_id}",
+            )
             return HttpResponse(status=200)
 
-        except User.DoesNotExist:
-            return HttpResponseBadRequest("User not found")
-        except Stage.DoesNotExist:
-            return HttpResponseBadRequest("Stage not found")
-        except Exception as e:
-            print(f"Error detail: {e}")
+        except DatabaseError:
+            # 500 을 받으면 AdMob 이 콜백을 다시 보내므로, 큐에 넣지 못한 경우만 여기서 기록한다.
+            logger.exception("AdMob SSV callback could not be queued (transaction_id=%s)", transaction_id)
             return HttpResponse(status=500)
-        
 
     def verify_signature(self, query_string, signature, key_id):
-        return True
-        try:
-            keys_res = requests.get(self.KEYS_URL, timeout=5)
-            keys = keys_res.json()['keys']
-            key_data = next((k for k in keys if str(k['key_id']) == key_id), None)
-            if not key_data:
-                return False
-            message = query_string.split("&signature=")[0].encode('utf-8')
-            public_key_der = base64.b64decode(key_data['base64_der'])
-            public_key = load_der_public_key(public_key_der)
-            sig_bytes = base64.urlsafe_b64decode(signature + '===')
-            public_key.verify(sig_bytes, message, ec.ECDSA(hashes.SHA256()))
-            return True
-        except Exception as e:
-            print(f"Signature Verification Failed: {e}")
-            return False
\ No newline at end of file
+        return verify_admob_signature(query_string, signature, key_id)
@@ -1,7 +1,9 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.utils.html import format_html
 from django.urls import reverse
-from contents.models import Series, Episode, Stage, Hint
+from contents.graph import StageGraph
+from contents.models import Series, Episode, Stage, Hint, AcceptedAnswer
+from utils.admin import select_related_filter
 
 
 @admin.register(Series)
@@ -141,6 +143,7 @@ class EpisodeAdmin(admin.ModelAdmin):
     )
 
     list_per_page = 25
+    list_select_related = ("series",)
 
     readonly_fields = (
         "created_at",
@@ -246,7 +249,7 @@ class StageAdmin(admin.ModelAdmin):
 
     list_filter = (
         "episode__series",
-        "episode",
+        ("episode", select_related_filter("series")),
         "is_free",
         "created_at",
     )
@@ -260,6 +263,7 @@ class StageAdmin(admin.ModelAdmin):
     )
 
     list_per_page = 50
+    list_select_related = ("episode__series", "next_stage__episode")
 
     readonly_fields = (
         "created_at",
@@ -290,6 +294,17 @@ class StageAdmin(admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+
+        graph = StageGraph.for_episode(obj.episode_id)
+        for issue in graph.issues:
+            self.message_user(
+                request,
+                f"[{obj.episode.title}] {issue.message}",
+                level=messages.WARNING,
+            )
+
     @admin.display(description="Episode", ordering="episode__code")
     def colored_episode(self, obj):
         color = "#2ecc71" if obj.is_free else "#5dade2"
@@ -378,7 +393,7 @@ class HintAdmin(admin.ModelAdmin):
 
     list_filter = (
         "stage__episode__series",
-        "stage__episode",
+        ("stage__episode", select_related_filter("series")),
     )
 
     search_fields = (
@@ -389,6 +404,7 @@ class HintAdmin(admin.ModelAdmin):
     )
 
     list_per_page = 50
+    list_select_related = ("stage__episode__series",)
 
     fieldsets = (
         ("연결 정보", {
@@ -441,4 +457,118 @@ class HintAdmin(admin.ModelAdmin):
             'text-decoration:none;'
             '">Edit</a>',
             url,
-        )
\ No newline at end of file
+        )
+
+
+@admin.register(AcceptedAnswer)
+class AcceptedAnswerAdmin(admin.ModelAdmin):
+    ordering = ("stage__episode__code", "stage__stage_no", "-is_primary")
+
+    class Media:
+        css = {
+            "all": ("admin/custom.css",)
+        }
+
+    list_display = (
+        "colored_stage",
+        "colored_answer",
+        "normalized_text",
+        "colored_primary",
+        "created_at",
+        "edit_button",
+    )
+
+    list_display_links = None
+
+    list_filter = (
+        "is_primary",
+        ("stage__episode", select_related_filter("series")),
+    )
+
+    search_fields = (
+        "answer_text",
+        "normalized_text",
+        "stage__title",
+        "stage__episode__code",
+    )
+
+    autocomplete_fields = (
+        "stage",
+    )
+
+    list_per_page = 50
+    list_select_related = ("stage__episode__series",)
+
+    readonly_fields = (
+        "normalized_text",
+        "is_primary",
+        "created_at",
+    )
+
+    fieldsets = (
+        ("연결 정보", {
+            "fields": (
+                "stage",
+            )
+        }),
+        ("정답", {
+            "fields": (
+                "answer_text",
+                "normalized_text",
+                "is_primary",
+            )
+        }),
+        ("메타 정보", {
+            "fields": (
+                "created_at",
+            )
+        }),
+    )
+
+    @admin.display(description="Stage", ordering="stage__stage_no")
+    def colored_stage(self, obj):
+        color = "#2ecc71" if obj.stage.is_free else "#5dade2"
+        return format_html(
+            '<span style="color:{}; font-weight:600;">{} | {}. {}</span>',
+            color,
+            obj.stage.episode.title,
+            obj.stage.stage_no,
+            obj.stage.title,
+        )
+
+    @admin.display(description="Answer")
+    def colored_answer(self, obj):
+        return format_html(
+            '<span style="font-family:monospace; font-weight:600;">{}</span>',
+            obj.answer_text,
+        )
+
+    @admin.display(description="Primary", boolean=True)
+    def colored_primary(self, obj):
+        return obj.is_primary
+
+    def has_delete_permission(self, request, obj=None):
+        # 대표 정답은 Stage.answer_text 로 관리한다.
+        if obj is not None and obj.is_primary:
+            return False
+        return super().has_delete_permission(request, obj)
+
+    def has_change_permission(self, request, obj=None):
+        if obj is not None and obj.is_primary:
+            return False
+        return super().has_change_permission(request, obj)
+
+    @admin.display(description="Edit")
+    def edit_button(self, obj):
+        url = reverse("admin:contents_acceptedanswer_change", args=[obj.pk])
+        return format_html(
+            '<a href="{}" style="'
+            'padding:4px 10px; '
+            'background:#34495e; '
+            'color:skyblue; '
+            'border-radius:4px; '
+            'font-weight:600; '
+            'text-decoration:none;'
+            '">Edit</a>',
+            url,
+        )
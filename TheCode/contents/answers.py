@@ -0,0 +1,68 @@
+import hashlib
+import hmac
+import re
+import unicodedata
+
+from django.conf import settings
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_answer(answer: str) -> str:
+    """
+    NFKC 로 조합형/전각 문자를 통일하고, 모든 공백을 제거한 뒤 소문자로 바꾼다.
+    """
+    answer = unicodedata.normalize("NFKC", answer)
+    return _WHITESPACE.sub("", answer).casefold()
+
+
+def hash_answer(normalized: str) -> str:
+    """
+    ANSWER_HASH_KEY 로 만든 HMAC-SHA256. 키를 바꾸면 rehash_answers 로 저장된 해시를 다시 계산한다.
+    """
+    return hmac.new(
+        settings.ANSWER_HASH_KEY.encode(),
+        normalized.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def answer_hash(answer: str) -> str:
+    return hash_answer(normalize_answer(answer))
+
+
+def sync_primary_answer(stage):
+    """
+    Stage.answer_text 를 대표 정답(is_primary) 행으로 맞춘다.
+    """
+    from contents.models import AcceptedAnswer
+
+    digest = answer_hash(stage.answer_text)
+    AcceptedAnswer.objects.filter(stage=stage, answer_hash=digest, is_primary=False).delete()
+    AcceptedAnswer.objects.update_or_create(
+        stage=stage,
+        is_primary=True,
+        defaults={"answer_text": stage.answer_text},
+    )
+
+
+def rehash_answers(batch_size=500):
+    """
+    저장된 normalized_text 로 모든 AcceptedAnswer 의 해시를 현재 ANSWER_HASH_KEY 로 다시 계산한다.
+    반환값: 바뀐 행 수
+    """
+    from contents.catalog import invalidate_catalog
+    from contents.models import AcceptedAnswer
+
+    changed = []
+    for answer in AcceptedAnswer.objects.only("id", "normalized_text", "answer_hash").iterator(chunk_size=batch_size):
+        digest = hash_answer(answer.normalized_text)
+        if digest != answer.answer_hash:
+            answer.answer_hash = digest
+            changed.append(answer)
+
+    AcceptedAnswer.objects.bulk_update(changed, ["answer_hash"], batch_size=batch_size)
+    # bulk_update 는 시그널을 보내지 않으므로 스냅샷을 직접 무효화한다.
+    invalidate_catalog()
+    return len(changed)
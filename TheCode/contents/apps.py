@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ContentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "contents"
+
+    def ready(self):
+        from contents import catalog, signals  # noqa: F401
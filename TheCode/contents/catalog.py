@@ -0,0 +1,286 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from contents.graph import StageGraph
+from contents.models import Series, Episode, Stage, Hint, AcceptedAnswer
+
+
+VERSION_CACHE_KEY = "contents:catalog:version"
+
+
+@dataclass(frozen=True)
+class SeriesEntry:
+    id: int
+    code: str
+    title: str
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class EpisodeEntry:
+    id: int
+    series_id: int
+    code: str
+    title: str
+    is_released: bool
+    stage_nos: tuple
+    fingerprint: str
+
+
+@dataclass(frozen=True)
+class StageEntry:
+    id: int
+    episode_id: int
+    stage_no: int
+    title: str
+    is_free: bool
+    image_key: str
+    answer_hashes: frozenset
+    next_stage_no: int | None
+    hint: str | None
+    updated_at: datetime
+    fingerprint: str
+
+
+class CatalogSnapshot:
+    """
+    Series → Episode → Stage → Hint 의 읽기 전용 스냅샷.
+    워커 프로세스마다 한 번 적재되며 (episode_id, stage_no) 로 조회한다.
+    """
+
+    def __init__(self, version, series, episodes, stages, graphs):
+        self.version = version
+        self.series = series
+        self.episodes = episodes
+        self.stages = stages
+        self.graphs = graphs
+        self.loaded_at = time.monotonic()
+
+        # 에피소드 code 는 시리즈 안에서만 유일하므로 code 하나에 여러 에피소드가 있을 수 있다.
+        self.episode_ids_by_code = {}
+        for episode in episodes.values():
+            self.episode_ids_by_code.setdefault(episode.code, []).append(episode.id)
+
+    @classmethod
+    def load(cls, version):
+        series = {
+            row["id"]: SeriesEntry(**row)
+            for row in Series.objects.values("id", "code", "title", "is_active")
+        }
+
+        hints = dict(Hint.objects.values_list("stage_id", "content"))
+
+        answer_hashes = {}
+        for stage_id, digest in AcceptedAnswer.objects.values_list("stage_id", "answer_hash"):
+            answer_hashes.setdefault(stage_id, set()).add(digest)
+
+        stage_rows = list(
+            Stage.objects.order_by("episode_id", "stage_no").values(
+                "id",
+                "episode_id",
+                "stage_no",
+                "title",
+                "is_free",
+                "image_key",
+                "next_stage_id",
+                "updated_at",
+            )
+        )
+
+        links = {}
+        for row in stage_rows:
+            links.setdefault(row["episode_id"], []).append(
+                (row["id"], row["stage_no"], row.pop("next_stage_id"))
+            )
+        graphs = {
+            episode_id: StageGraph.compile(episode_id, episode_links)
+            for episode_id, episode_links in links.items()
+        }
+
+        stages = {}
+        for row in stage_rows:
+            row["next_stage_no"] = graphs[row["episode_id"]].next_of(row["stage_no"])
+            row["hint"] = hints.get(row["id"])
+            stages[(row["episode_id"], row["stage_no"])] = StageEntry(
+                answer_hashes=frozenset(answer_hashes.get(row["id"], ())),
+                fingerprint=cls._fingerprint(row),
+                **row,
+            )
+
+        episodes = {}
+        for row in Episode.objects.values("id", "series_id", "code", "title", "is_released"):
+            stage_nos = graphs[row["id"]].stage_nos if row["id"] in graphs else ()
+            episode_stages = [stages[(row["id"], no)] for no in stage_nos]
+            episodes[row["id"]] = EpisodeEntry(
+                stage_nos=stage_nos,
+                fingerprint=cls._fingerprint(
+                    row, *(stage.fingerprint for stage in episode_stages)
+                ),
+                **row,
+            )
+
+        return cls(version, series, episodes, stages, graphs)
+
+    @staticmethod
+    def _fingerprint(*parts):
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, dict):
+                part = sorted(part.items())
+            digest.update(repr(part).encode())
+        return digest.hexdigest()
+
+    def is_expired(self, ttl):
+        return time.monotonic() - self.loaded_at >= ttl
+
+    def get_stage(self, episode_id, stage_no):
+        return self.stages.get((episode_id, stage_no))
+
+    def get_graph(self, episode_id):
+        return self.graphs.get(episode_id)
+
+    def get_episode(self, episode_id):
+        return self.episodes.get(episode_id)
+
+    def find_stages_by_code(self, episode_code, stage_no, series_code=None):
+        matches = []
+        for episode_id in self.episode_ids_by_code.get(episode_code, ()):
+            if series_code is not None:
+                series = self.series.get(self.episodes[episode_id].series_id)
+                if series is None or series.code != series_code:
+                    continue
+            stage = self.stages.get((episode_id, stage_no))
+            if stage is not None:
+                matches.append(stage)
+        return matches
+
+    def get_episode_stages(self, episode_id):
+        episode = self.episodes.get(episode_id)
+        if episode is None:
+            return ()
+        return tuple(self.stages[(episode_id, no)] for no in episode.stage_nos)
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def current_version():
+    """
+    Django 캐시(프로세스별 LocMemCache)에 있는 버전이라 다른 프로세스의 bump_version 은 보이지 않는다.
+    다른 프로세스에서 바뀐 내용은 CATALOG_SNAPSHOT_TTL 이 지나 스냅샷을 다시 적재할 때 반영된다.
+    """
+    return cache.get(VERSION_CACHE_KEY, 0)
+
+
+def bump_version():
+    try:
+        return cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.add(VERSION_CACHE_KEY, 1, timeout=None)
+        return cache.get(VERSION_CACHE_KEY, 1)
+
+
+def invalidate_catalog():
+    global _snapshot
+    bump_version()
+    _snapshot = None
+
+
+def get_catalog(force=False):
+    global _snapshot
+    version = current_version()
+    snapshot = _snapshot
+    if (
+        not force
+        and snapshot is not None
+        and snapshot.version == version
+        and not snapshot.is_expired(settings.CATALOG_SNAPSHOT_TTL)
+    ):
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if (
+            force
+            or snapshot is None
+            or snapshot.version != version
+            or snapshot.is_expired(settings.CATALOG_SNAPSHOT_TTL)
+        ):
+            snapshot = CatalogSnapshot.load(version)
+            _snapshot = snapshot
+        return snapshot
+
+
+def get_stage(episode_id, stage_no):
+    """
+    스냅샷에서 스테이지를 찾는다.
+    없으면 다른 워커에서 추가된 스테이지일 수 있으므로, 스냅샷이
+    CATALOG_MISS_RELOAD_INTERVAL 보다 오래된 경우에만 한 번 다시 적재한다.
+    """
+    snapshot = get_catalog()
+    stage = snapshot.get_stage(episode_id, stage_no)
+    if stage is None and snapshot.is_expired(settings.CATALOG_MISS_RELOAD_INTERVAL):
+        stage = get_catalog(force=True).get_stage(episode_id, stage_no)
+    return stage
+
+
+def get_stages(keys):
+    """
+    (episode_id, stage_no) 여러 개를 한 번에 찾는다. {key: StageEntry}
+    없는 키가 있으면 get_stage 와 같은 조건으로 스냅샷을 한 번만 다시 적재한다.
+    """
+    if not keys:
+        return {}
+    snapshot = get_catalog()
+    found = {key: snapshot.get_stage(*key) for key in keys}
+    if None in found.values() and snapshot.is_expired(settings.CATALOG_MISS_RELOAD_INTERVAL):
+        snapshot = get_catalog(force=True)
+        found = {key: snapshot.get_stage(*key) for key in keys}
+    return {key: stage for key, stage in found.items() if stage is not None}
+
+
+def find_stages_by_code(episode_code, stage_no, series_code=None):
+    """
+    (에피소드 code, stage_no) 에 해당하는 스테이지 목록.
+    다른 시리즈에 같은 code 가 있으면 둘 이상이 나오므로 호출하는 쪽에서 구분해야 한다.
+    """
+    snapshot = get_catalog()
+    stages = snapshot.find_stages_by_code(episode_code, stage_no, series_code)
+    if not stages and snapshot.is_expired(settings.CATALOG_MISS_RELOAD_INTERVAL):
+        stages = get_catalog(force=True).find_stages_by_code(episode_code, stage_no, series_code)
+    return stages
+
+
+def get_episode(episode_id):
+    snapshot = get_catalog()
+    if snapshot.get_episode(episode_id) is None and snapshot.is_expired(
+        settings.CATALOG_MISS_RELOAD_INTERVAL
+    ):
+        snapshot = get_catalog(force=True)
+    return snapshot.get_episode(episode_id), snapshot.get_episode_stages(episode_id)
+
+
+@receiver(post_save, sender=Series)
+@receiver(post_save, sender=Episode)
+@receiver(post_save, sender=Stage)
+@receiver(post_save, sender=Hint)
+@receiver(post_save, sender=AcceptedAnswer)
+@receiver(post_delete, sender=Series)
+@receiver(post_delete, sender=Episode)
+@receiver(post_delete, sender=Stage)
+@receiver(post_delete, sender=Hint)
+@receiver(post_delete, sender=AcceptedAnswer)
+def on_content_changed(sender, **kwargs):
+    # 커밋 전에 다른 요청이 옛 데이터로 스냅샷을 다시 만들 수 있으므로 커밋 후에도 한 번 더 무효화한다.
+    invalidate_catalog()
+    transaction.on_commit(invalidate_catalog)
@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ChainIssue:
+    kind: str  # dangling / cycle
+    stage_nos: tuple
+    message: str
+
+
+class StageGraph:
+    """
+    에피소드 하나의 스테이지 진행 순서.
+    관리자가 지정한 next_stage 링크를 우선 따르고, 링크가 없으면 stage_no 순서를 따른다.
+    다른 에피소드를 가리키는 링크(dangling)와 순환을 만드는 역방향 링크는 무시하고 issues 에 남긴다.
+    """
+
+    def __init__(self, episode_id, stage_nos, next_map, prev_map, issues):
+        self.episode_id = episode_id
+        self.stage_nos = stage_nos
+        self._next = next_map
+        self._prev = prev_map
+        self.issues = issues
+
+    @classmethod
+    def compile(cls, episode_id, stages):
+        """
+        stages: (stage_id, stage_no, next_stage_id) 의 iterable
+        """
+        stages = list(stages)
+        no_by_id = {stage_id: stage_no for stage_id, stage_no, _ in stages}
+        stage_nos = tuple(sorted(no_by_id.values()))
+        numeric = dict(zip(stage_nos, stage_nos[1:]))
+
+        issues = []
+        links = {}
+        for stage_id, stage_no, next_stage_id in stages:
+            if next_stage_id is None:
+                continue
+            if next_stage_id not in no_by_id:
+                issues.append(ChainIssue(
+                    "dangling",
+                    (stage_no,),
+                    f"{stage_no}번 스테이지의 다음 스테이지가 이 에피소드에 없습니다.",
+                ))
+                continue
+            links[stage_no] = no_by_id[next_stage_id]
+
+        while True:
+            next_map = {no: links.get(no, numeric.get(no)) for no in stage_nos}
+            cycle = cls._find_cycle(stage_nos, next_map)
+            if not cycle:
+                break
+            issues.append(ChainIssue(
+                "cycle",
+                cycle,
+                "스테이지 순서가 순환합니다: " + " → ".join(map(str, cycle + cycle[:1])),
+            ))
+            # stage_no 순서는 항상 앞으로 가므로, 순환에는 반드시 역방향 링크가 하나 이상 있다.
+            for no in cycle:
+                if no in links and links[no] <= no:
+                    del links[no]
+
+        # 첫 스테이지에서 시작하는 진행 경로를 우선으로 이전 스테이지를 정한다.
+        prev_map = {}
+        node = stage_nos[0] if stage_nos else None
+        while node is not None and next_map[node] is not None and next_map[node] not in prev_map:
+            prev_map[next_map[node]] = node
+            node = next_map[node]
+        for no in stage_nos:
+            nxt = next_map[no]
+            if nxt is not None:
+                prev_map.setdefault(nxt, no)
+
+        return cls(episode_id, stage_nos, next_map, prev_map, issues)
+
+    @classmethod
+    def for_episode(cls, episode_id):
+        from contents.models import Stage
+
+        return cls.compile(
+            episode_id,
+            Stage.objects.filter(episode_id=episode_id).values_list(
+                "id", "stage_no", "next_stage_id"
+            ),
+        )
+
+    @staticmethod
+    def _find_cycle(stage_nos, next_map):
+        state = {}
+        for start in stage_nos:
+            path = []
+            node = start
+            while node is not None and node not in state:
+                state[node] = start
+                path.append(node)
+                node = next_map.get(node)
+            if node is not None and state[node] == start:
+                return tuple(path[path.index(node):])
+        return ()
+
+    def next_of(self, stage_no):
+        return self._next.get(stage_no)
+
+    def prev_of(self, stage_no):
+        return self._prev.get(stage_no)
+
+    @property
+    def is_valid(self):
+        return not self.issues
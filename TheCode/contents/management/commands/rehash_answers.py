@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from contents.answers import rehash_answers
+
+
+class Command(BaseCommand):
+    help = "ANSWER_HASH_KEY 를 바꾼 뒤 저장된 정답 해시를 새 키로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        changed = rehash_answers(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{changed}개 정답 해시를 다시 계산했습니다."))
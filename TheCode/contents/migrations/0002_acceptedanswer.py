@@ -0,0 +1,86 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:02
+
+import hashlib
+import hmac
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# contents.answers 가 나중에 바뀌어도 이 마이그레이션의 결과가 달라지지 않도록 작성 당시 규칙을 옮겨 둔다.
+def normalize_answer(answer):
+    answer = unicodedata.normalize("NFKC", answer)
+    return re.sub(r"\s+", "", answer).casefold()
+
+
+def answer_hash(answer):
+    return hmac.new(
+        settings.ANSWER_HASH_KEY.encode(),
+        normalize_answer(answer).encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def backfill_primary_answers(apps, schema_editor):
+    Stage = apps.get_model("contents", "Stage")
+    AcceptedAnswer = apps.get_model("contents", "AcceptedAnswer")
+
+    AcceptedAnswer.objects.bulk_create(
+        [
+            AcceptedAnswer(
+                stage_id=stage_id,
+                answer_text=answer_text,
+                normalized_text=normalize_answer(answer_text),
+                answer_hash=answer_hash(answer_text),
+                is_primary=True,
+            )
+            for stage_id, answer_text in Stage.objects.values_list(
+                "id", "answer_text"
+            ).iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AcceptedAnswer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("answer_text", models.CharField(max_length=255)),
+                ("normalized_text", models.CharField(editable=False, max_length=255)),
+                ("answer_hash", models.CharField(editable=False, max_length=64)),
+                ("is_primary", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "stage",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="accepted_answers",
+                        to="contents.stage",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("stage", "answer_hash")},
+            },
+        ),
+        migrations.RunPython(backfill_primary_answers, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from contents.answers import normalize_answer, hash_answer
+
 
 class Series(models.Model):
     code = models.CharField(max_length=50, unique=True)
@@ -80,3 +83,47 @@ class Hint(models.Model):
 
     def __str__(self):
         return f"Hint for {self.stage}"
+
+
+class AcceptedAnswer(models.Model):
+    stage = models.ForeignKey(
+        Stage,
+        on_delete=models.CASCADE,
+        related_name="accepted_answers",
+    )
+    answer_text = models.CharField(max_length=255)
+
+    normalized_text = models.CharField(max_length=255, editable=False)
+    answer_hash = models.CharField(max_length=64, editable=False)
+
+    is_primary = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("stage", "answer_hash")
+
+    def _compute(self):
+        self.normalized_text = normalize_answer(self.answer_text)
+        self.answer_hash = hash_answer(self.normalized_text)
+
+    def clean(self):
+        self._compute()
+        if not self.normalized_text:
+            raise ValidationError({"answer_text": "정답이 비어 있습니다."})
+
+        duplicate = AcceptedAnswer.objects.filter(
+            stage_id=self.stage_id,
+            answer_hash=self.answer_hash,
+        ).exclude(pk=self.pk)
+        if self.stage_id and duplicate.exists():
+            raise ValidationError({"answer_text": "이미 등록된 정답입니다."})
+
+    def save(self, *args, **kwargs):
+        self._compute()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "answer_text" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "normalized_text", "answer_hash"}
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.stage} = {self.answer_text}"
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from contents.answers import sync_primary_answer
+from contents.models import Stage
+
+
+@receiver(post_save, sender=Stage)
+def on_stage_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_primary_answer(instance)
@@ -1,3 +1,390 @@
+import time
+from io import StringIO
+
+import boto3
+from django.conf import settings
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from commerce import entitlements, hint_access
+from commerce.models import UserStageHintAccess, UserEntitlement
+from contents import catalog
+from contents.graph import StageGraph
+from contents.answers import normalize_answer
+from contents.models import Series, Episode, Stage, Hint, AcceptedAnswer
+from utils.s3 import PresignedURLCache, S3Presigner
+
+
+class ContentsTestCase(TestCase):
+    def setUp(self):
+        catalog.invalidate_catalog()
+
+        self.user = User.objects.create_user(
+            provider="google",
+            provider_user_id="test-user",
+            email="test@test.com",
+            username="tester",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.series = Series.objects.create(code="S1", title="Series")
+        self.episode = Episode.objects.create(
+            series=self.series,
+            code="EP1",
+            title="Episode",
+            price_unlock_stages=1000,
+            price_unlock_with_adfree=2000,
+        )
+        self.stage1 = Stage.objects.create(
+            episode=self.episode, stage_no=1, title="One", image_key="", answer_text="Apple"
+        )
+        self.stage2 = Stage.objects.create(
+            episode=self.episode, stage_no=2, title="Two", image_key="", answer_text="Banana"
+        )
+        Hint.objects.create(stage=self.stage1, content="과일")
+
+        hint_access.invalidate_hint_access(self.user.id)
+        entitlements.invalidate_entitlements(self.user.id)
+        UserStageHintAccess.objects.create(user=self.user, stage=self.stage1)
+
+    def url(self, stage_no, suffix=""):
+        return f"/api/v1/contents/{self.episode.id}/{stage_no}/{suffix}"
+
+
+class CatalogSnapshotTests(ContentsTestCase):
+    def test_stage_reads_are_served_from_snapshot(self):
+        catalog.get_catalog()
+        hint_access.get_hint_access(self.user.id)
+
+        with self.assertNumQueries(0):
+            detail = self.client.get(self.url(1))
+            answer = self.client.post(self.url(1, "answer/"), {"answer": " apple "})
+            hint = self.client.get(self.url(1, "hint/"))
+
+        self.assertEqual(detail.data["data"]["next_stage_no"], 2)
+        self.assertTrue(answer.data["data"]["is_correct"])
+        self.assertEqual(hint.data["data"]["content"], "과일")
+
+    def test_change_from_another_process_is_seen_after_ttl(self):
+        snapshot = catalog.get_catalog()
+
+        # 시그널 없이 바뀐 행은 다른 프로세스에서 수정된 것과 같다.
+        Stage.objects.filter(pk=self.stage2.pk).update(title="Two (elsewhere)")
+        self.assertEqual(self.client.get(self.url(2)).data["data"]["title"], "Two")
+
+        snapshot.loaded_at -= settings.CATALOG_SNAPSHOT_TTL
+        self.assertEqual(self.client.get(self.url(2)).data["data"]["title"], "Two (elsewhere)")
+
+    def test_content_change_invalidates_snapshot(self):
+        catalog.get_catalog()
+
+        self.stage2.title = "Two (edited)"
+        self.stage2.save()
+
+        response = self.client.get(self.url(2))
+        self.assertEqual(response.data["data"]["title"], "Two (edited)")
+        self.assertIsNone(response.data["data"]["next_stage_no"])
+
+        self.client.get(self.url(1, "hint/"))
+        Hint.objects.filter(stage=self.stage1).delete()
+        response = self.client.get(self.url(1, "hint/"))
+        self.assertEqual(response.status_code, 404)
+
+    def test_next_stage_follows_admin_link(self):
+        stage3 = Stage.objects.create(
+            episode=self.episode, stage_no=3, title="Three", image_key="", answer_text="Cherry"
+        )
+        self.stage1.next_stage = stage3
+        self.stage1.save()
+
+        response = self.client.get(self.url(1))
+        self.assertEqual(response.data["data"]["next_stage_no"], 3)
+
+    def test_missing_stage_returns_404(self):
+        response = self.client.get(self.url(99))
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalGetTests(ContentsTestCase):
+    def test_stage_detail_revalidation(self):
+        response = self.client.get(self.url(1))
+        etag = response["ETag"]
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertNotIn("Last-Modified", response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url(1), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        # 다음 스테이지가 삭제되면 1번 스테이지의 next_stage_no 도 바뀐다.
+        Stage.objects.filter(pk=self.stage2.pk).delete()
+        response = self.client.get(self.url(1), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["data"]["next_stage_no"])
+
+    def test_if_modified_since_is_ignored(self):
+        # 수정 시각으로는 스테이지 삭제를 알 수 없으므로 If-Modified-Since 만으로는 304 를 주지 않는다.
+        since = http_date(time.time() + 3600)
+        self.client.get(self.url(1))
+        Stage.objects.filter(pk=self.stage2.pk).delete()
+
+        response = self.client.get(self.url(1), HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["data"]["next_stage_no"])
+
+    def test_hint_revalidation(self):
+        etag = self.client.get(self.url(1, "hint/"))["ETag"]
+
+        response = self.client.get(self.url(1, "hint/"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        hint = Hint.objects.get(stage=self.stage1)
+        hint.content = "빨간 과일"
+        hint.save()
+
+        response = self.client.get(self.url(1, "hint/"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["content"], "빨간 과일")
+
+
+class HintAccessTests(ContentsTestCase):
+    def setUp(self):
+        super().setUp()
+        Hint.objects.create(stage=self.stage2, content="노란 과일")
+
+    def test_locked_hint_is_forbidden(self):
+        response = self.client.get(self.url(2, "hint/"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_unlocked_hint_needs_no_query(self):
+        hint_access.get_hint_access(self.user.id)
+        catalog.get_catalog()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url(1, "hint/"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_grant_in_another_worker_is_picked_up(self):
+        self.assertEqual(self.client.get(self.url(2, "hint/")).status_code, 403)
+
+        # 다른 워커에서 해제되어 이 워커의 캐시는 그대로인 상황
+        UserStageHintAccess.objects.create(user=self.user, stage=self.stage2)
+        self.assertEqual(self.client.get(self.url(2, "hint/")).status_code, 200)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url(2, "hint/"))
+
+    def test_ad_free_entitlement_unlocks_every_hint(self):
+        UserEntitlement.objects.create(user=self.user, entitlement_type="ad_free")
+
+        self.assertEqual(self.client.get(self.url(2, "hint/")).status_code, 200)
+
+    def test_revalidation_skips_access_check(self):
+        UserEntitlement.objects.create(user=self.user, entitlement_type="ad_free")
+        etag = self.client.get(self.url(2, "hint/"))["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url(2, "hint/"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_follows_unlock_reason(self):
+        entitlement = UserEntitlement.objects.create(user=self.user, entitlement_type="ad_free")
+        etag = self.client.get(self.url(2, "hint/"))["ETag"]
+
+        entitlement.delete()
+        # 이용권은 요청마다 user 객체에 붙여 두므로, 새 요청처럼 user 를 다시 읽는다.
+        self.client.force_authenticate(User.objects.get(pk=self.user.pk))
+        response = self.client.get(self.url(2, "hint/"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
+        UserStageHintAccess.objects.create(user=self.user, stage=self.stage2)
+        response = self.client.get(self.url(2, "hint/"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_bitmap(self):
+        access = hint_access.HintAccess()
+        access.grant(7, 3)
+        access.grant(7, 64)
+
+        self.assertTrue(access.can_view(7, 3))
+        self.assertTrue(access.can_view(7, 64))
+        self.assertFalse(access.can_view(7, 4))
+        self.assertFalse(access.can_view(8, 3))
+
+
+class EpisodeManifestTests(ContentsTestCase):
+    def manifest_url(self):
+        return f"/api/v1/contents/{self.episode.id}/manifest/"
+
+    def test_manifest_lists_every_stage_without_queries(self):
+        catalog.get_catalog()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.manifest_url())
+
+        stages = response.data["data"]["stages"]
+        self.assertEqual([stage["stage_no"] for stage in stages], [1, 2])
+        self.assertEqual([stage["next_stage_no"] for stage in stages], [2, None])
+        self.assertEqual([stage["has_hint"] for stage in stages], [True, False])
+        self.assertIn("ETag", response)
+
+    def test_manifest_revalidation(self):
+        etag = self.client.get(self.manifest_url())["ETag"]
+
+        response = self.client.get(self.manifest_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.stage2.title = "Two (edited)"
+        self.stage2.save()
+
+        response = self.client.get(self.manifest_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_new_hint_changes_manifest(self):
+        first = self.client.get(self.manifest_url())
+        self.assertNotIn("Last-Modified", first)
+
+        Hint.objects.create(stage=self.stage2, content="노란 과일")
+
+        response = self.client.get(self.manifest_url(), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([stage["has_hint"] for stage in response.data["data"]["stages"]], [True, True])
+
+        since = http_date(time.time() + 3600)
+        response = self.client.get(self.manifest_url(), HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_episode_returns_404(self):
+        response = self.client.get("/api/v1/contents/9999/manifest/")
+        self.assertEqual(response.status_code, 404)
+
+
+class FakeSigner:
+    def __init__(self):
+        self.calls = []
+
+    def presign(self, bucket, key, signed_at, expires_in):
+        self.calls.append((signed_at, expires_in))
+        return f"https://s3/{key}?n={len(self.calls)}&date={signed_at}&expires={expires_in}"
+
+
+class PresignedURLCacheTests(TestCase):
+    def setUp(self):
+        self.signer = FakeSigner()
+        self.urls = PresignedURLCache(self.signer, "bucket", bucket_seconds=600, min_ttl=60)
+
+    def test_same_url_within_bucket(self):
+        first = self.urls.get_url("a.png", now=1200)
+        second = self.urls.get_url("a.png", now=1500)
+
+        self.assertEqual(first, second)
+        # 1800 에 끝나는 URL 은 서명 시각과 유효 기간이 고정이다.
+        self.assertEqual(self.signer.calls, [(1140, 660)])
+        self.assertEqual(self.urls.stats()["hits"], 1)
+        self.assertEqual(self.urls.stats()["misses"], 1)
+
+    def test_resigns_when_below_min_ttl(self):
+        first = self.urls.get_url("a.png", now=1200)
+        second = self.urls.get_url("a.png", now=1750)
+
+        self.assertNotEqual(first, second)
+        # 1750 은 다음 경계(1800)까지 50초뿐이라 그 다음 구간 끝(2400)까지 서명한다.
+        self.assertEqual(self.signer.calls, [(1140, 660), (1740, 660)])
+
+    def test_workers_sign_identical_urls(self):
+        session = boto3.session.Session(
+            aws_access_key_id="AKIDEXAMPLE",
+            aws_secret_access_key="secret",
+            region_name="ap-northeast-2",
+        )
+        # 워커마다 캐시와 서명 시점이 달라도 같은 구간이면 URL 이 같아야 한다.
+        worker_a = PresignedURLCache(S3Presigner(session), "bucket", bucket_seconds=600, min_ttl=60)
+        worker_b = PresignedURLCache(S3Presigner(session), "bucket", bucket_seconds=600, min_ttl=60)
+
+        url = worker_a.get_url("stages/a.png", now=1_700_000_000)
+        self.assertEqual(worker_b.get_url("stages/a.png", now=1_700_000_150), url)
+        self.assertIn("X-Amz-Date=20231114T220900Z", url)
+        self.assertIn("X-Amz-Expires=660", url)
+        self.assertNotEqual(worker_b.get_url("stages/a.png", now=1_700_000_550), url)
+
+
+class AcceptedAnswerTests(ContentsTestCase):
+    def answer(self, text, stage_no=1):
+        response = self.client.post(self.url(stage_no, "answer/"), {"answer": text})
+        return response.data["data"]["is_correct"]
+
+    def test_normalization(self):
+        self.assertEqual(normalize_answer(" Ｂａｎａｎａ "), "banana")
+        self.assertEqual(normalize_answer("비밀 번호"), "비밀번호")
+        self.assertEqual(normalize_answer("\u1100\u1161"), "가")
+
+    def test_primary_answer_follows_stage(self):
+        self.assertTrue(self.answer("ＡＰＰＬＥ"))
+
+        self.stage1.answer_text = "Orange"
+        self.stage1.save()
+
+        self.assertFalse(self.answer("apple"))
+        self.assertTrue(self.answer("orange"))
+        self.assertEqual(self.stage1.accepted_answers.count(), 1)
+
+    def test_alias_is_accepted(self):
+        AcceptedAnswer.objects.create(stage=self.stage1, answer_text="사과")
+
+        self.assertTrue(self.answer("사 과"))
+        self.assertFalse(self.answer("사과", stage_no=2))
+
+    def test_rehash_after_key_rotation(self):
+        AcceptedAnswer.objects.create(stage=self.stage1, answer_text="사과")
+
+        with self.settings(ANSWER_HASH_KEY="rotated"):
+            self.assertFalse(self.answer("사과"))
+            out = StringIO()
+            call_command("rehash_answers", stdout=out)
+            self.assertIn("3개", out.getvalue())
+            self.assertTrue(self.answer("사과"))
+            self.assertTrue(self.answer("apple"))
+
+
+class StageGraphTests(TestCase):
+    def test_numeric_order_without_links(self):
+        graph = StageGraph.compile(1, [(10, 1, None), (12, 3, None), (11, 2, None)])
+
+        self.assertEqual(graph.stage_nos, (1, 2, 3))
+        self.assertEqual(graph.next_of(1), 2)
+        self.assertIsNone(graph.next_of(3))
+        self.assertEqual(graph.prev_of(3), 2)
+        self.assertTrue(graph.is_valid)
+
+    def test_links_take_priority(self):
+        graph = StageGraph.compile(
+            1, [(10, 1, 12), (11, 2, 13), (12, 3, 11), (13, 4, None)]
+        )
+
+        self.assertEqual(graph.next_of(1), 3)
+        self.assertEqual(graph.next_of(3), 2)
+        self.assertEqual(graph.next_of(2), 4)
+        self.assertEqual(graph.prev_of(2), 3)
+        self.assertTrue(graph.is_valid)
+
+    def test_dangling_link_falls_back_to_numeric_order(self):
+        graph = StageGraph.compile(1, [(10, 1, 999), (11, 2, None)])
+
+        self.assertEqual(graph.next_of(1), 2)
+        self.assertEqual([issue.kind for issue in graph.issues], ["dangling"])
+
+    def test_cycle_is_reported_and_broken(self):
+        graph = StageGraph.compile(
+            1, [(10, 1, None), (11, 2, 12), (12, 3, 11), (13, 4, None)]
+        )
 
-# Create your tests here.
+        self.assertEqual([issue.kind for issue in graph.issues], ["cycle"])
+        self.assertEqual(graph.next_of(2), 3)
+        self.assertEqual(graph.next_of(3), 4)
@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import StageDetailView, StageAnswerView, StageHintView
+from .views import StageDetailView, StageAnswerView, StageHintView, EpisodeManifestView
 
 urlpatterns = [
+    path("<int:episode_id>/manifest/", EpisodeManifestView.as_view()),
     path("<int:episode_id>/<int:stage_no>/", StageDetailView.as_view()),
     path("<int:episode_id>/<int:stage_no>/answer/", StageAnswerView.as_view()),
     path("<int:episode_id>/<int:stage_no>/hint/", StageHintView.as_view()),
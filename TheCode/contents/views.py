@@ -1,61 +1,43 @@
-from contents.models import Hint, Stage
-from django.conf import settings
+import time
+
+from commerce.hint_access import hint_unlock
+from contents.answers import answer_hash
+from contents.catalog import get_episode, get_stage
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
+from utils.conditional import make_etag, is_not_modified, not_modified_response, set_validators
 from utils.response import success_response, error_response
-from utils.s3 import get_s3_client
-
-
-s3 = get_s3_client()
+from utils.s3 import presign_stage_image, presign_stage_images, stage_image_url_expiry
 
 
 class StageDetailView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request, episode_id, stage_no):
-        try:
-            stage = Stage.objects.select_related("episode").get(
-                episode_id=episode_id,
-                stage_no=stage_no,
-            )
-        except Stage.DoesNotExist:
+        stage = get_stage(episode_id, stage_no)
+        if stage is None:
             return error_response("스테이지가 존재하지 않습니다.", status=404)
 
-        next_stage = (
-            Stage.objects.filter(
-                episode_id=episode_id,
-                stage_no__gt=stage.stage_no,
-            )
-            .order_by("stage_no")
-            .first()
-        )
+        # Last-Modified 는 보내지 않는다. 스테이지 삭제나 다른 스테이지 수정으로 next_stage_no 가 바뀌어도
+        # 수정 시각으로는 알 수 없지만, fingerprint 에는 응답에 쓰이는 값이 모두 들어 있다.
+        now = time.time()
+        etag = make_etag(stage.fingerprint, stage_image_url_expiry(now))
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
 
-        next_stage_no = next_stage.stage_no if next_stage else None
-
-        image_url = None
-        if stage.image_key:
-            image_url = s3.generate_presigned_url(
-                ClientMethod="get_object",
-                Params={
-                    "Bucket": settings.AWS_STAGE_BUCKET,
-                    "Key": stage.image_key,
-                },
-                ExpiresIn=60,
-            )
+        image_url = presign_stage_image(stage.image_key, now=now)
 
-        return success_response(
+        response = success_response(
             message="스테이지 정보입니다.",
             data={
                 "stage_no": stage.stage_no,
                 "title": stage.title,
                 "image_url": image_url,
-                "next_stage_no": next_stage_no,
+                "next_stage_no": stage.next_stage_no,
             },
         )
+        return set_validators(response, etag)
     
 
-def normalize_answer(answer: str) -> str:
-    return answer.strip().lower()
-
 class StageAnswerView(APIView):
     permission_classes = [IsAuthenticated]
     def post(self, request, episode_id, stage_no):
@@ -63,15 +45,11 @@ class StageAnswerView(APIView):
         if not answer:
             return error_response("answer 값이 필요합니다.", status=400)
 
-        try:
-            stage = Stage.objects.get(
-                episode_id=episode_id,
-                stage_no=stage_no,
-            )
-        except Stage.DoesNotExist:
+        stage = get_stage(episode_id, stage_no)
+        if stage is None:
             return error_response("스테이지가 존재하지 않습니다.", status=404)
 
-        is_correct = normalize_answer(answer) == normalize_answer(stage.answer_text)
+        is_correct = answer_hash(str(answer)) in stage.answer_hashes
 
         if is_correct:
             return success_response(
@@ -88,22 +66,66 @@ class StageAnswerView(APIView):
 class StageHintView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request, episode_id, stage_no):
-        try:
-            stage = Stage.objects.get(
-                episode_id=episode_id,
-                stage_no=stage_no,
-            )
-        except Stage.DoesNotExist:
+        stage = get_stage(episode_id, stage_no)
+        if stage is None:
             return error_response("스테이지가 존재하지 않습니다.", status=404)
 
-        try:
-            hint = stage.hint
-        except Hint.DoesNotExist:
+        if stage.hint is None:
             return error_response("해당 문제에는 힌트가 없습니다.", status=404)
 
-        return success_response(
+        # 캐시로 열려 있음을 알 수 있으면 DB 를 조회하지 않고 재검증까지 끝난다.
+        unlocked = hint_unlock(request.user, stage)
+        if unlocked is None:
+            return error_response("광고 시청 후 힌트를 볼 수 있습니다.", status=403)
+
+        # 열람 근거(광고/이용권)가 바뀌면 같은 힌트라도 다시 내려 준다.
+        etag = make_etag(stage.fingerprint, unlocked)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        response = success_response(
             message="힌트 정보입니다.",
             data={
-                "content": hint.content,
+                "content": stage.hint,
             },
-        )
\ No newline at end of file
+        )
+        return set_validators(response, etag)
+
+
+class EpisodeManifestView(APIView):
+    permission_classes = [IsAuthenticated]
+    def get(self, request, episode_id):
+        episode, stages = get_episode(episode_id)
+        if episode is None:
+            return error_response("에피소드가 존재하지 않습니다.", status=404)
+
+        now = time.time()
+        image_url_expires_at = stage_image_url_expiry(now)
+
+        # 이미지 URL 이 바뀌는 시점에 ETag 도 바뀌어야 클라이언트가 만료된 URL 을 재사용하지 않는다.
+        etag = make_etag(episode.fingerprint, image_url_expires_at)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        image_urls = presign_stage_images([stage.image_key for stage in stages], now=now)
+
+        response = success_response(
+            message="에피소드 정보입니다.",
+            data={
+                "episode_id": episode.id,
+                "title": episode.title,
+                "image_url_expires_at": image_url_expires_at,
+                "stages": [
+                    {
+                        "stage_no": stage.stage_no,
+                        "title": stage.title,
+                        "is_free": stage.is_free,
+                        "image_url": image_urls.get(stage.image_key),
+                        "next_stage_no": stage.next_stage_no,
+                        "has_hint": stage.hint is not None,
+                    }
+                    for stage in stages
+                ],
+            },
+        )
+        return set_validators(response, etag)
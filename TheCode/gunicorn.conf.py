@@ -0,0 +1,5 @@
+def worker_exit(server, worker):
+    # 워커가 내려가기 전에 버퍼에 남은 로그를 쓴다.
+    from logs.sink import shutdown_log_sink
+
+    shutdown_log_sink()
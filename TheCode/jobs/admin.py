@@ -0,0 +1,137 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.html import format_html
+from django.urls import reverse
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    ordering = ("-created_at",)
+
+    class Media:
+        css = {
+            "all": ("admin/custom.css",)
+        }
+
+    list_display = (
+        "colored_id",
+        "name",
+        "colored_status",
+        "priority",
+        "attempts_display",
+        "run_at",
+        "locked_by",
+        "created_at",
+        "edit_button",
+    )
+
+    list_display_links = None
+
+    list_filter = (
+        "status",
+        "name",
+        "created_at",
+    )
+
+    search_fields = (
+        "name",
+        "=unique_key",
+    )
+
+    list_per_page = 25
+
+    actions = ("requeue_jobs",)
+
+    readonly_fields = (
+        "name",
+        "payload",
+        "attempts",
+        "locked_by",
+        "locked_at",
+        "unique_key",
+        "last_error",
+        "created_at",
+        "finished_at",
+    )
+
+    fieldsets = (
+        ("작업 정보", {
+            "fields": (
+                "name",
+                "payload",
+                "unique_key",
+            )
+        }),
+        ("실행 상태", {
+            "fields": (
+                "status",
+                "priority",
+                "run_at",
+                "attempts",
+                "max_attempts",
+                "locked_by",
+                "locked_at",
+            )
+        }),
+        ("결과", {
+            "fields": (
+                "last_error",
+                "created_at",
+                "finished_at",
+            )
+        }),
+    )
+
+    def _status_color(self, status):
+        return {
+            Job.STATUS_QUEUED: "#5dade2",     # 하늘
+            Job.STATUS_RUNNING: "#f39c12",    # 주황
+            Job.STATUS_SUCCEEDED: "#2ecc71",  # 초록
+            Job.STATUS_FAILED: "#e74c3c",     # 빨강
+        }.get(status, "#7f8c8d")
+
+    @admin.display(description="ID", ordering="id")
+    def colored_id(self, obj):
+        return format_html(
+            '<span style="color:{}; font-weight:600;">{}</span>',
+            self._status_color(obj.status),
+            obj.id,
+        )
+
+    @admin.display(description="Status", ordering="status")
+    def colored_status(self, obj):
+        return format_html(
+            '<span style="color:{}; font-weight:600;">{}</span>',
+            self._status_color(obj.status),
+            obj.get_status_display(),
+        )
+
+    @admin.display(description="Attempts")
+    def attempts_display(self, obj):
+        return f"{obj.attempts} / {obj.max_attempts}"
+
+    @admin.action(description="선택한 작업을 다시 대기열에 넣기")
+    def requeue_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.STATUS_RUNNING).update(
+            status=Job.STATUS_QUEUED,
+            attempts=0,
+            run_at=timezone.now(),
+            finished_at=None,
+        )
+        self.message_user(request, f"{updated}개 작업을 다시 대기열에 넣었습니다.")
+
+    @admin.display(description="Edit")
+    def edit_button(self, obj):
+        url = reverse("admin:jobs_job_change", args=[obj.pk])
+        return format_html(
+            '<a href="{}" style="'
+            'padding:4px 10px; '
+            'background:#34495e; '
+            'color:skyblue; '
+            'border-radius:4px; '
+            'font-weight:600; '
+            'text-decoration:none;'
+            '">Edit</a>',
+            url,
+        )
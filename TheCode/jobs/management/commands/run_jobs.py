@@ -0,0 +1,45 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.queue import run_worker
+
+
+class Command(BaseCommand):
+    help = "Job 테이블의 대기 작업을 가져와 실행하는 워커입니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.JOBS_BATCH_SIZE)
+        parser.add_argument("--poll-interval", type=float, default=settings.JOBS_POLL_INTERVAL)
+        parser.add_argument("--burst", action="store_true", help="대기 작업이 없으면 종료합니다.")
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def request_stop(signum, frame):
+            # 실행 중인 배치는 마치고 종료한다.
+            stopping.append(signum)
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        totals = {"succeeded": 0, "failed": 0}
+
+        def on_batch(succeeded, failed):
+            totals["succeeded"] += succeeded
+            totals["failed"] += failed
+            if options["verbosity"] >= 2:
+                self.stdout.write(f"succeeded={succeeded} failed={failed}")
+
+        run_worker(
+            poll_interval=options["poll_interval"],
+            batch_size=options["batch_size"],
+            burst=options["burst"],
+            stop=lambda: bool(stopping),
+            on_batch=on_batch,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"완료 {totals['succeeded']}건, 실패 {totals['failed']}건"
+        ))
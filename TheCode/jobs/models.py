@@ -0,0 +1,60 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, "대기"),
+        (STATUS_RUNNING, "실행 중"),
+        (STATUS_SUCCEEDED, "완료"),
+        (STATUS_FAILED, "실패"),
+    )
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+
+    # 값이 클수록 먼저 실행된다.
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    # 같은 작업이 두 번 들어가지 않도록 할 때 사용한다. (예: admob:<transaction_id>)
+    unique_key = models.CharField(max_length=255, null=True, blank=True, unique=True)
+    last_error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-priority", "run_at"],
+                condition=Q(status="queued"),
+                name="jobs_job_ready_idx",
+            ),
+            models.Index(
+                fields=["locked_at"],
+                condition=Q(status="running"),
+                name="jobs_job_running_idx",
+            ),
+            models.Index(
+                fields=["status", "finished_at"],
+                condition=Q(status__in=["succeeded", "failed"]),
+                name="jobs_job_finished_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,275 @@
+import os
+import random
+import socket
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import Job
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: object
+    priority: int
+    max_attempts: int
+    interval: int = 0
+
+
+class PermanentError(Exception):
+    """
+    다시 시도해도 성공할 수 없는 오류. 남은 시도 횟수와 관계없이 바로 실패 처리한다.
+    """
+
+
+_registry = {}
+
+
+def task(name, priority=0, max_attempts=None, interval=None):
+    """
+    payload(dict) 하나를 받는 함수를 작업 핸들러로 등록한다.
+    interval 이 있으면 run_jobs 워커가 interval 초마다 빈 payload 로 한 번씩 넣는다. (enqueue_periodic_jobs)
+    """
+    def decorator(func):
+        _registry[name] = Task(
+            name=name,
+            func=func,
+            priority=priority,
+            max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+            interval=interval or 0,
+        )
+        return func
+    return decorator
+
+
+def get_task(name):
+    return _registry.get(name)
+
+
+def enqueue(name, payload=None, priority=None, delay=None, run_at=None, unique_key=None):
+    """
+    작업을 큐에 넣는다. unique_key 가 이미 있으면 새로 넣지 않고 None 을 돌려준다.
+    """
+    registered = _registry.get(name)
+    if registered is None:
+        raise KeyError(f"등록되지 않은 작업입니다: {name}")
+
+    if run_at is None:
+        run_at = timezone.now() + timedelta(seconds=delay or 0)
+
+    job = Job(
+        name=name,
+        payload=payload or {},
+        priority=registered.priority if priority is None else priority,
+        max_attempts=registered.max_attempts,
+        run_at=run_at,
+        unique_key=unique_key,
+    )
+    if unique_key is None:
+        job.save(force_insert=True)
+        return job
+
+    try:
+        with transaction.atomic():
+            job.save(force_insert=True)
+    except IntegrityError:
+        return None
+    return job
+
+
+def enqueue_periodic_jobs(now=None, scheduled=None):
+    """
+    interval 이 있는 작업을 주기마다 하나씩 넣는다.
+    같은 주기에는 unique_key 가 같으므로 run_jobs 워커가 여럿이어도 한 번만 들어간다.
+    scheduled({작업 이름: 주기}) 를 넘기면 이미 넣은 주기는 DB 에 묻지 않고 건너뛴다.
+    반환값: 새로 넣은 작업 목록
+    """
+    now = now or timezone.now()
+    scheduled = {} if scheduled is None else scheduled
+
+    jobs = []
+    for registered in _registry.values():
+        if not registered.interval:
+            continue
+        slot = int(now.timestamp()) // registered.interval
+        if scheduled.get(registered.name) == slot:
+            continue
+        job = enqueue(registered.name, run_at=now, unique_key=f"{registered.name}:{slot}")
+        scheduled[registered.name] = slot
+        if job is not None:
+            jobs.append(job)
+    return jobs
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _ready_jobs(now):
+    return Job.objects.filter(status=Job.STATUS_QUEUED, run_at__lte=now).order_by(
+        "-priority", "run_at", "id"
+    )
+
+
+def claim_jobs(limit, locked_by, now=None):
+    """
+    실행할 작업을 limit 개까지 가져와 running 으로 바꾼다.
+    Postgres 는 SELECT ... FOR UPDATE SKIP LOCKED 로 다른 워커가 잡은 행을 건너뛰고,
+    SKIP LOCKED 가 없는 DB(SQLite) 는 status 를 조건으로 한 UPDATE 로 한 행씩 선점한다.
+    """
+    now = now or timezone.now()
+    claim = {
+        "status": Job.STATUS_RUNNING,
+        "locked_by": locked_by,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                _ready_jobs(now)
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:limit]
+            )
+            Job.objects.filter(id__in=ids).update(**claim)
+    else:
+        ids = []
+        for job_id in _ready_jobs(now).values_list("id", flat=True)[:limit]:
+            if Job.objects.filter(id=job_id, status=Job.STATUS_QUEUED).update(**claim):
+                ids.append(job_id)
+
+    if not ids:
+        return []
+    return list(Job.objects.filter(id__in=ids).order_by("-priority", "run_at", "id"))
+
+
+def retry_delay(attempts):
+    """
+    지수 백오프 + 지터. 같은 시각에 실패한 작업들이 한꺼번에 다시 몰리지 않게 한다.
+    """
+    delay = min(settings.JOBS_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.JOBS_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def run_job(job):
+    registered = _registry.get(job.name)
+    now = timezone.now()
+
+    try:
+        if registered is None:
+            raise PermanentError(f"등록되지 않은 작업입니다: {job.name}")
+        registered.func(job.payload)
+    except Exception as e:
+        job.last_error = traceback.format_exc()[-4000:]
+        job.locked_by = ""
+        job.locked_at = None
+        if isinstance(e, PermanentError) or job.attempts >= job.max_attempts:
+            job.status = Job.STATUS_FAILED
+            job.finished_at = now
+        else:
+            job.status = Job.STATUS_QUEUED
+            job.run_at = now + timedelta(seconds=retry_delay(job.attempts))
+        job.save(update_fields=["status", "run_at", "last_error", "locked_by", "locked_at", "finished_at"])
+        return False
+
+    job.status = Job.STATUS_SUCCEEDED
+    job.finished_at = now
+    job.locked_by = ""
+    job.locked_at = None
+    job.save(update_fields=["status", "finished_at", "locked_by", "locked_at"])
+    return True
+
+
+def release_stale_jobs(now=None):
+    """
+    lock 을 잡은 워커가 죽어 JOBS_LOCK_TIMEOUT 이 지나도록 running 인 작업을 정리한다.
+    시도 횟수는 선점할 때 이미 올라가 있으므로, max_attempts 를 다 쓴 작업은 실패 처리하고
+    (워커를 죽이는 작업이 끝없이 다시 실행되지 않도록) 나머지만 대기열로 돌린다.
+    반환값: (다시 대기열로 돌린 수, 실패 처리한 수)
+    """
+    now = now or timezone.now()
+    stale = Job.objects.filter(
+        status=Job.STATUS_RUNNING,
+        locked_at__lt=now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT),
+    )
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.STATUS_FAILED,
+        locked_by="",
+        locked_at=None,
+        finished_at=now,
+        last_error="실행 중 워커가 응답하지 않아 시도 횟수를 모두 썼습니다.",
+    )
+    requeued = stale.update(status=Job.STATUS_QUEUED, locked_by="", locked_at=None, run_at=now)
+    return requeued, failed
+
+
+def prune_finished_jobs(now=None, batch_size=None):
+    """
+    보관 기간이 지난 succeeded/failed 작업을 batch_size 개씩 삭제한다. 반환값: 삭제한 수
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or settings.JOBS_PRUNE_BATCH_SIZE
+    cutoffs = {
+        Job.STATUS_SUCCEEDED: now - timedelta(days=settings.JOBS_SUCCEEDED_RETENTION_DAYS),
+        Job.STATUS_FAILED: now - timedelta(days=settings.JOBS_FAILED_RETENTION_DAYS),
+    }
+
+    deleted = 0
+    for status, cutoff in cutoffs.items():
+        while True:
+            ids = list(
+                Job.objects.filter(status=status, finished_at__lt=cutoff)
+                .order_by()
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            deleted += Job.objects.filter(id__in=ids).delete()[0]
+            if len(ids) < batch_size:
+                break
+    return deleted
+
+
+def run_pending(limit=None, locked_by=None):
+    """
+    지금 실행할 수 있는 작업을 한 번 가져와 실행한다. (succeeded, failed) 수를 돌려준다.
+    """
+    jobs = claim_jobs(limit or settings.JOBS_BATCH_SIZE, locked_by or worker_id())
+    succeeded = sum(run_job(job) for job in jobs)
+    return succeeded, len(jobs) - succeeded
+
+
+def run_worker(poll_interval=None, batch_size=None, burst=False, stop=None, on_batch=None):
+    """
+    작업을 계속 가져와 실행한다. burst 이면 큐가 빌 때 종료한다.
+    """
+    poll_interval = settings.JOBS_POLL_INTERVAL if poll_interval is None else poll_interval
+    locked_by = worker_id()
+    last_maintenance = None
+    scheduled = {}
+
+    while stop is None or not stop():
+        close_old_connections()
+        enqueue_periodic_jobs(scheduled=scheduled)
+
+        if last_maintenance is None or time.monotonic() - last_maintenance >= settings.JOBS_LOCK_TIMEOUT:
+            release_stale_jobs()
+            prune_finished_jobs()
+            last_maintenance = time.monotonic()
+
+        succeeded, failed = run_pending(batch_size, locked_by)
+        if on_batch and (succeeded or failed):
+            on_batch(succeeded, failed)
+
+        if not succeeded and not failed:
+            if burst:
+                break
+            time.sleep(poll_interval)
@@ -0,0 +1,155 @@
+import io
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import Job
+from jobs.queue import PermanentError, claim_jobs, enqueue, run_pending, task
+
+
+calls = []
+
+
+@task("tests.record")
+def record(payload):
+    calls.append(payload["value"])
+
+
+@task("tests.flaky", max_attempts=2)
+def flaky(payload):
+    raise RuntimeError("boom")
+
+
+@task("tests.permanent")
+def permanent(payload):
+    raise PermanentError("nope")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        enqueue("tests.record", {"value": 1})
+
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(calls, [1])
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_unregistered_task_is_rejected(self):
+        with self.assertRaises(KeyError):
+            enqueue("tests.missing")
+
+    def test_priority_then_run_at(self):
+        enqueue("tests.record", {"value": "low"}, priority=0)
+        enqueue("tests.record", {"value": "high"}, priority=5)
+        enqueue("tests.record", {"value": "later"}, priority=9, delay=60)
+
+        run_pending()
+        self.assertEqual(calls, ["high", "low"])
+
+    def test_unique_key_deduplicates(self):
+        self.assertIsNotNone(enqueue("tests.record", {"value": 1}, unique_key="k"))
+        self.assertIsNone(enqueue("tests.record", {"value": 1}, unique_key="k"))
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_claimed_job_is_not_claimed_twice(self):
+        enqueue("tests.record", {"value": 1})
+
+        self.assertEqual(len(claim_jobs(10, "worker-a")), 1)
+        self.assertEqual(claim_jobs(10, "worker-b"), [])
+
+    def test_failure_retries_with_backoff_then_fails(self):
+        enqueue("tests.flaky")
+
+        self.assertEqual(run_pending(), (0, 1))
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("boom", job.last_error)
+
+        Job.objects.update(run_at=timezone.now())
+        run_pending()
+        self.assertEqual(Job.objects.get().status, Job.STATUS_FAILED)
+
+    def test_permanent_error_fails_immediately(self):
+        enqueue("tests.permanent")
+        run_pending()
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 1)
+
+    def test_retry_delay_grows(self):
+        with mock.patch.object(queue.random, "uniform", return_value=1):
+            self.assertEqual([queue.retry_delay(n) for n in (1, 2, 3)], [5, 10, 20])
+
+    def test_stale_running_job_is_released(self):
+        enqueue("tests.record", {"value": 1})
+        claim_jobs(1, "dead-worker")
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(queue.release_stale_jobs(), (1, 0))
+        self.assertEqual(run_pending(), (1, 0))
+
+    def test_job_that_keeps_killing_workers_fails(self):
+        enqueue("tests.flaky")
+        stale = timezone.now() - timedelta(hours=1)
+
+        # 두 번 모두 실행 중에 워커가 죽었다. (max_attempts=2)
+        for released in [(1, 0), (0, 1)]:
+            claim_jobs(1, "dead-worker")
+            Job.objects.update(locked_at=stale)
+            self.assertEqual(queue.release_stale_jobs(), released)
+
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(claim_jobs(1, "worker"), [])
+
+    def test_finished_jobs_are_pruned(self):
+        for value in range(3):
+            enqueue("tests.record", {"value": value})
+        enqueue("tests.permanent")
+        run_pending()
+        enqueue("tests.record", {"value": "pending"})
+
+        now = timezone.now()
+        self.assertEqual(queue.prune_finished_jobs(now + timedelta(days=8), batch_size=2), 3)
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_FAILED).count(), 1)
+        self.assertEqual(queue.prune_finished_jobs(now + timedelta(days=31)), 1)
+        self.assertEqual(Job.objects.get().status, Job.STATUS_QUEUED)
+
+    def test_periodic_job_is_enqueued_once_per_interval(self):
+        start = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        with mock.patch.dict(queue._registry):
+            task("tests.periodic", interval=60)(record)
+
+            # 같은 주기에는 워커가 여럿이어도 한 번만 들어간다.
+            self.assertEqual(len(queue.enqueue_periodic_jobs(start)), 1)
+            self.assertEqual(queue.enqueue_periodic_jobs(start + timedelta(seconds=30)), [])
+
+            scheduled = {}
+            self.assertEqual(len(queue.enqueue_periodic_jobs(start + timedelta(seconds=60), scheduled)), 1)
+            with self.assertNumQueries(0):
+                queue.enqueue_periodic_jobs(start + timedelta(seconds=90), scheduled)
+
+        self.assertEqual(Job.objects.filter(name="tests.periodic").count(), 2)
+
+    def test_run_jobs_command(self):
+        for value in range(3):
+            enqueue("tests.record", {"value": value})
+
+        out = io.StringIO()
+        call_command("run_jobs", "--burst", "--batch-size=2", stdout=out)
+
+        self.assertEqual(sorted(calls), [0, 1, 2])
+        self.assertIn("완료 3건", out.getvalue())
@@ -1,8 +1,9 @@
 from django.contrib import admin
 from logs.models import AppAccessLog, StageActivityLog
+from utils.admin import EstimatedCountMixin, select_related_filter
 
 @admin.register(AppAccessLog)
-class AppAccessLogAdmin(admin.ModelAdmin):
+class AppAccessLogAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = (
         "user",
         "event_type",
@@ -10,15 +11,20 @@ class AppAccessLogAdmin(admin.ModelAdmin):
         "app_version",
         "occurred_at",
     )
-    list_filter = ("platform", "event_type")
+    # 시각 필터는 범위 조건이라 PostgreSQL 에서 해당 달의 파티션만 읽는다.
+    list_filter = ("occurred_at", "platform", "event_type")
+    ordering = ("-occurred_at",)
+    list_select_related = ("user",)
     search_fields = ("user__email",)
 
 @admin.register(StageActivityLog)
-class StageActivityLogAdmin(admin.ModelAdmin):
+class StageActivityLogAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = (
         "user",
         "stage",
         "entered_at",
         "exited_at",
     )
-    list_filter = ("stage",)
+    list_filter = ("entered_at", ("stage", select_related_filter("episode__series")))
+    ordering = ("-entered_at",)
+    list_select_related = ("user", "stage__episode__series")
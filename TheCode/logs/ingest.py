@@ -0,0 +1,206 @@
+import json
+import zlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from contents.catalog import get_stages
+from logs.models import AppAccessLog, StageActivityLog
+
+
+STAGE_ACTIVITY = "stage_activity"
+APP_EVENT_TYPES = {value for value, _ in AppAccessLog.EVENT_TYPE_CHOICES}
+PLATFORMS = {value for value, _ in AppAccessLog.PLATFORM_CHOICES}
+
+# 기기 시계가 조금 빠른 경우까지는 허용한다.
+_CLOCK_SKEW = timedelta(minutes=5)
+
+_decoder = json.JSONDecoder()
+
+
+class PayloadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def decode_body(body, content_encoding):
+    """
+    gzip 이면 풀어서 돌려준다. 풀린 크기가 LOGS_BATCH_MAX_DECOMPRESSED_BYTES 를 넘으면 거기서 멈춘다.
+    """
+    if len(body) > settings.LOGS_BATCH_MAX_BYTES:
+        raise PayloadError("요청 본문이 너무 큽니다.", status=413)
+
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("", "identity"):
+        data = body
+    elif encoding == "gzip":
+        limit = settings.LOGS_BATCH_MAX_DECOMPRESSED_BYTES
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            data = decompressor.decompress(body, limit + 1)
+        except zlib.error:
+            raise PayloadError("gzip 본문을 해제할 수 없습니다.")
+        if len(data) > limit or decompressor.unconsumed_tail:
+            raise PayloadError("해제한 본문이 너무 큽니다.", status=413)
+    else:
+        raise PayloadError("지원하지 않는 Content-Encoding 입니다.", status=415)
+
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        raise PayloadError("본문은 UTF-8 JSON 이어야 합니다.")
+
+
+def _skip_ws(text, pos):
+    while pos < len(text) and text[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def iter_json_array(text, max_items):
+    """
+    JSON 배열의 원소를 하나씩 돌려준다.
+    전체를 한 번에 파싱하지 않으므로, max_items 를 넘는 요청은 나머지를 읽기 전에 거절된다.
+    """
+    pos = _skip_ws(text, 0)
+    if pos >= len(text) or text[pos] != "[":
+        raise PayloadError("본문은 JSON 배열이어야 합니다.")
+
+    pos = _skip_ws(text, pos + 1)
+    if pos < len(text) and text[pos] == "]":
+        return
+
+    count = 0
+    while True:
+        try:
+            item, pos = _decoder.raw_decode(text, pos)
+        except json.JSONDecodeError as e:
+            raise PayloadError(f"JSON 형식이 올바르지 않습니다. ({e.msg}, pos {e.pos})")
+
+        count += 1
+        if count > max_items:
+            raise PayloadError(f"이벤트는 최대 {max_items}개까지 보낼 수 있습니다.", status=413)
+        yield item
+
+        pos = _skip_ws(text, pos)
+        if pos < len(text) and text[pos] == ",":
+            pos = _skip_ws(text, pos + 1)
+        elif pos < len(text) and text[pos] == "]":
+            if _skip_ws(text, pos + 1) != len(text):
+                raise PayloadError("JSON 배열 뒤에 다른 값이 있습니다.")
+            return
+        else:
+            raise PayloadError("JSON 형식이 올바르지 않습니다.")
+
+
+def _parse_time(value, now, field, required=True):
+    if value is None and not required:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{field} 값이 필요합니다.")
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"{field} 형식이 올바르지 않습니다.")
+    if timezone.is_naive(parsed):
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    if parsed > now + _CLOCK_SKEW:
+        raise ValueError(f"{field} 이 미래 시각입니다.")
+    return parsed
+
+
+def _parse_int(value, field):
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise ValueError(f"{field} 값이 올바르지 않습니다.")
+    return value
+
+
+def _text(value, field, max_length, required=True):
+    if value is None and not required:
+        return ""
+    if not isinstance(value, str) or (required and not value):
+        raise ValueError(f"{field} 값이 필요합니다.")
+    return value[:max_length]
+
+
+def parse_event(item, now):
+    """
+    이벤트 하나를 검증한다. 스테이지는 아직 찾지 않고 (episode_id, stage_no) 로만 돌려준다.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("이벤트는 JSON 객체여야 합니다.")
+
+    event_type = item.get("type")
+    if event_type in APP_EVENT_TYPES:
+        platform = item.get("platform")
+        if platform not in PLATFORMS:
+            raise ValueError("platform 값이 올바르지 않습니다.")
+        return AppAccessLog, {
+            "event_type": event_type,
+            "platform": platform,
+            "app_version": _text(item.get("app_version"), "app_version", 50),
+            "device_info": _text(item.get("device_info"), "device_info", 255, required=False),
+            "occurred_at": _parse_time(item.get("occurred_at"), now, "occurred_at"),
+        }
+
+    if event_type == STAGE_ACTIVITY:
+        entered_at = _parse_time(item.get("entered_at"), now, "entered_at")
+        exited_at = _parse_time(item.get("exited_at"), now, "exited_at", required=False)
+        if exited_at is not None and exited_at < entered_at:
+            raise ValueError("exited_at 이 entered_at 보다 이릅니다.")
+        return StageActivityLog, {
+            "stage_key": (
+                _parse_int(item.get("episode_id"), "episode_id"),
+                _parse_int(item.get("stage_no"), "stage_no"),
+            ),
+            "entered_at": entered_at,
+            "exited_at": exited_at,
+        }
+
+    raise ValueError("type 값이 올바르지 않습니다.")
+
+
+def build_logs(user_id, items, now=None):
+    """
+    검증과 스테이지 조회를 마친 로그 객체와 항목별 결과를 돌려준다.
+    반환값: ([(index, 로그 객체)], rejected 목록)
+    """
+    now = now or timezone.now()
+    parsed, rejected = [], []
+
+    for index, item in enumerate(items):
+        try:
+            model, values = parse_event(item, now)
+        except ValueError as e:
+            rejected.append({"index": index, "reason": str(e)})
+        else:
+            parsed.append((index, model, values))
+
+    stages = get_stages(
+        {values["stage_key"] for _, model, values in parsed if model is StageActivityLog}
+    )
+
+    entries = []
+    for index, model, values in parsed:
+        if model is StageActivityLog:
+            stage = stages.get(values.pop("stage_key"))
+            if stage is None:
+                rejected.append({"index": index, "reason": "스테이지가 존재하지 않습니다."})
+                continue
+            values["stage_id"] = stage.id
+        entries.append((index, model(user_id=user_id, **values)))
+
+    rejected.sort(key=lambda r: r["index"])
+    return entries, rejected
+
+
+def write_logs(objects):
+    """
+    objects: {model: [objects]}
+    """
+    for model, rows in objects.items():
+        if rows:
+            model.objects.bulk_create(rows, batch_size=settings.LOGS_BULK_CREATE_BATCH_SIZE)
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from logs.partitions import drop_expired_partitions, ensure_partitions, supports_partitions
+
+
+class Command(BaseCommand):
+    help = "로그 테이블의 다음 달 파티션을 미리 만들고, 보관 기간이 지난 파티션을 떼어 내 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=settings.LOGS_PARTITION_MONTHS_AHEAD)
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=settings.LOGS_RETENTION_MONTHS,
+            help="0 이면 지우지 않습니다.",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if not supports_partitions():
+            self.stdout.write("파티션을 지원하지 않는 DB 입니다. 보관 기간만 DELETE 로 적용합니다.")
+        elif not options["dry_run"]:
+            created = ensure_partitions(months_ahead=options["months_ahead"])
+            self.stdout.write(f"생성한 파티션: {', '.join(created) or '없음'}")
+
+        result = drop_expired_partitions(
+            retention_months=options["retention_months"],
+            dry_run=options["dry_run"],
+        )
+        verb = "삭제 예정" if options["dry_run"] else "삭제"
+        for table, dropped in result.items():
+            if isinstance(dropped, int):
+                self.stdout.write(f"{table}: {dropped}개 행 {verb}")
+            else:
+                self.stdout.write(f"{table}: 파티션 {verb} {', '.join(dropped) or '없음'}")
+
+        self.stdout.write(self.style.SUCCESS("완료"))
@@ -0,0 +1,190 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:05
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import migrations, models
+from django.db.migrations.exceptions import IrreversibleError
+from django.utils import timezone
+
+# logs.partitions 가 나중에 바뀌어도 이 마이그레이션의 결과가 달라지지 않도록 작성 당시 규칙을 옮겨 둔다.
+PARTITION_KEYS = {
+    "logs_appaccesslog": "occurred_at",
+    "logs_stageactivitylog": "entered_at",
+}
+MONTHS_AHEAD = 3
+
+FOREIGN_KEYS = {
+    "AppAccessLog": ["user"],
+    "StageActivityLog": ["user", "stage"],
+}
+
+
+def supports_partitions(connection):
+    return connection.vendor == "postgresql"
+
+
+def month_floor(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(table, month):
+    return f"{table}_{month:%Y%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def create_month_partitions(schema_editor, start=None):
+    """
+    start(없으면 이번 달)부터 MONTHS_AHEAD 달 뒤까지의 월별 파티션을 만든다.
+    이 시점의 DEFAULT 파티션은 비어 있으므로 행을 옮길 필요가 없다.
+    """
+    quote = schema_editor.quote_name
+    current = month_floor(timezone.now())
+    last = add_months(current, MONTHS_AHEAD)
+
+    for table in PARTITION_KEYS:
+        month = month_floor(start) if start else current
+        while month <= last:
+            schema_editor.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote(partition_name(table, month))} "
+                f"PARTITION OF {quote(table)} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+            month = add_months(month, 1)
+
+
+def add_foreign_key(schema_editor, model, name):
+    """
+    파티션 테이블로 옮기며 잃은 외래 키와 그 컬럼의 인덱스를 다시 만든다.
+    """
+    quote = schema_editor.quote_name
+    field = model._meta.get_field(name)
+    table = model._meta.db_table
+    to_table = field.related_model._meta.db_table
+    to_column = field.target_field.column
+
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} "
+        f"ADD CONSTRAINT {quote(f'{table}_{field.column}_fk_{to_table}_{to_column}')} "
+        f"FOREIGN KEY ({quote(field.column)}) REFERENCES {quote(to_table)} ({quote(to_column)}) "
+        f"DEFERRABLE INITIALLY DEFERRED"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX {quote(f'{table}_{field.column}_idx')} ON {quote(table)} ({quote(field.column)})"
+    )
+
+
+def partition_activity_logs(apps, schema_editor):
+    """
+    PostgreSQL 에서 두 로그 테이블을 파티션 키 기준 월별 RANGE 파티션 테이블로 바꾼다.
+    기존 행은 새 테이블로 옮기고, 기본 키는 파티션 키를 포함한 (id, 시각) 이 된다.
+    """
+    if not supports_partitions(schema_editor.connection):
+        return
+
+    quote = schema_editor.quote_name
+    models_ = [apps.get_model("logs", name) for name in FOREIGN_KEYS]
+    first_month = None
+
+    for model in models_:
+        table = model._meta.db_table
+        old = f"{table}_unpartitioned"
+        schema_editor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(old)}")
+        schema_editor.execute(
+            f"CREATE TABLE {quote(table)} (LIKE {quote(old)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({quote(PARTITION_KEYS[table])})"
+        )
+        schema_editor.execute(
+            f"CREATE TABLE {quote(default_partition_name(table))} PARTITION OF {quote(table)} DEFAULT"
+        )
+
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT MIN({quote(PARTITION_KEYS[table])}) FROM {quote(old)}"
+            )
+            oldest = cursor.fetchone()[0]
+        if oldest is not None and (first_month is None or oldest < first_month):
+            first_month = oldest
+
+    # 기존 행이 DEFAULT 파티션이 아닌 월별 파티션으로 들어가도록 먼저 만든다.
+    create_month_partitions(schema_editor, start=first_month)
+
+    for model in models_:
+        table = model._meta.db_table
+        old = f"{table}_unpartitioned"
+        sequence = f"{table}_id_seq"
+
+        schema_editor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(old)}")
+        schema_editor.execute(f"DROP TABLE {quote(old)}")
+
+        schema_editor.execute(
+            f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(f'{table}_pkey')} "
+            f"PRIMARY KEY (id, {quote(PARTITION_KEYS[table])})"
+        )
+        schema_editor.execute(
+            f"CREATE SEQUENCE {quote(sequence)} OWNED BY {quote(table)}.id"
+        )
+        schema_editor.execute(
+            f"SELECT setval('{quote(sequence)}', COALESCE(MAX(id), 0) + 1, false) FROM {quote(table)}"
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {quote(table)} ALTER COLUMN id SET DEFAULT nextval('{quote(sequence)}')"
+        )
+
+        for name in FOREIGN_KEYS[model.__name__]:
+            add_foreign_key(schema_editor, model, name)
+
+
+def unpartition_activity_logs(apps, schema_editor):
+    if supports_partitions(schema_editor.connection):
+        raise IrreversibleError(
+            "파티션 테이블을 단일 테이블로 되돌리는 마이그레이션은 지원하지 않습니다."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contents", "0002_acceptedanswer"),
+        ("logs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="appaccesslog",
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name="stageactivitylog",
+            options={},
+        ),
+        migrations.RunPython(partition_activity_logs, unpartition_activity_logs),
+        migrations.AddIndex(
+            model_name="appaccesslog",
+            index=models.Index(fields=["occurred_at"], name="logs_app_occurred_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="appaccesslog",
+            index=models.Index(
+                fields=["user", "occurred_at"], name="logs_app_user_occurred_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="stageactivitylog",
+            index=models.Index(fields=["entered_at"], name="logs_stage_entered_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="stageactivitylog",
+            index=models.Index(
+                fields=["stage", "entered_at"], name="logs_stage_stage_entered_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from accounts.models import User
 from contents.models import Stage
 from django.db import models
+from django.utils import timezone
 
 class AppAccessLog(models.Model):
     EVENT_TYPE_CHOICES = [
@@ -33,10 +34,16 @@ class AppAccessLog(models.Model):
     app_version = models.CharField(max_length=50)
     device_info = models.CharField(max_length=255, blank=True)
 
-    occurred_at = models.DateTimeField(auto_now_add=True)
+    # 배치로 늦게 도착하는 이벤트도 있으므로 클라이언트가 보낸 시각을 저장한다.
+    occurred_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
-        ordering = ["-occurred_at"]
+        # PostgreSQL 에서는 occurred_at 기준 월별 파티션 테이블이다. (logs.partitions)
+        # 기본 정렬을 두지 않아 조건 없는 조회나 count 에 정렬이 붙지 않게 한다.
+        indexes = [
+            models.Index(fields=["occurred_at"], name="logs_app_occurred_idx"),
+            models.Index(fields=["user", "occurred_at"], name="logs_app_user_occurred_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.event_type} ({self.platform})"
@@ -59,7 +66,11 @@ class StageActivityLog(models.Model):
     exited_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        ordering = ["-entered_at"]
+        # PostgreSQL 에서는 entered_at 기준 월별 파티션 테이블이다. (logs.partitions)
+        indexes = [
+            models.Index(fields=["entered_at"], name="logs_stage_entered_idx"),
+            models.Index(fields=["stage", "entered_at"], name="logs_stage_stage_entered_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.stage}"
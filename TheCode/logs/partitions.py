@@ -0,0 +1,177 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+# 월 단위 RANGE 파티션을 쓰는 테이블과 파티션 키
+PARTITION_KEYS = {
+    "logs_appaccesslog": "occurred_at",
+    "logs_stageactivitylog": "entered_at",
+}
+
+
+def supports_partitions(using=None):
+    """
+    선언적 파티셔닝은 PostgreSQL 에서만 쓴다. (SQLite 개발 환경은 단일 테이블)
+    """
+    return (using or connection).vendor == "postgresql"
+
+
+def month_floor(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(table, month):
+    return f"{table}_{month:%Y%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def partition_month(table, name):
+    """
+    partition_name 으로 만든 이름이면 그 달의 시작 시각, 아니면 None.
+    """
+    suffix = name[len(table) + 1:] if name.startswith(f"{table}_") else ""
+    if len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return datetime(int(suffix[:4]), int(suffix[4:]), 1, tzinfo=dt_timezone.utc)
+
+
+def list_partitions(cursor, table):
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+        """,
+        [table],
+    )
+    return sorted(row[0] for row in cursor.fetchall())
+
+
+def _bound(month):
+    return f"'{month.isoformat()}'"
+
+
+def create_partition(cursor, table, month):
+    """
+    한 달짜리 파티션을 만든다.
+    DEFAULT 파티션에 이미 그 달의 행이 들어와 있으면(크론이 늦은 경우) 새 파티션으로 옮긴다.
+    """
+    quote = connection.ops.quote_name
+    column = quote(PARTITION_KEYS[table])
+    name = partition_name(table, month)
+    default = default_partition_name(table)
+    start, end = _bound(month), _bound(add_months(month, 1))
+    create_sql = (
+        f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(table)} "
+        f"FOR VALUES FROM ({start}) TO ({end})"
+    )
+
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {quote(default)} WHERE {column} >= {start} AND {column} < {end})"
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(create_sql)
+        return
+
+    with transaction.atomic():
+        cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(default)}")
+        cursor.execute(create_sql)
+        cursor.execute(
+            f"INSERT INTO {quote(table)} SELECT * FROM {quote(default)} "
+            f"WHERE {column} >= {start} AND {column} < {end}"
+        )
+        cursor.execute(f"DELETE FROM {quote(default)} WHERE {column} >= {start} AND {column} < {end}")
+        cursor.execute(f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(default)} DEFAULT")
+
+
+def ensure_partitions(months_ahead=None, now=None, start=None):
+    """
+    이번 달(또는 start)부터 months_ahead 달 뒤까지의 파티션을 미리 만든다.
+    반환값: 새로 만든 파티션 이름 목록
+    """
+    if not supports_partitions():
+        return []
+
+    if months_ahead is None:
+        months_ahead = settings.LOGS_PARTITION_MONTHS_AHEAD
+    current = month_floor(now or timezone.now())
+    first = month_floor(start) if start else current
+    last = add_months(current, months_ahead)
+
+    created = []
+    with connection.cursor() as cursor:
+        for table in PARTITION_KEYS:
+            existing = set(list_partitions(cursor, table))
+            month = first
+            while month <= last:
+                name = partition_name(table, month)
+                if name not in existing:
+                    create_partition(cursor, table, month)
+                    created.append(name)
+                month = add_months(month, 1)
+    return created
+
+
+def expired_partitions(cursor, table, cutoff):
+    return [
+        name
+        for name in list_partitions(cursor, table)
+        if (month := partition_month(table, name)) is not None and add_months(month, 1) <= cutoff
+    ]
+
+
+def drop_expired_partitions(retention_months=None, now=None, dry_run=False):
+    """
+    retention_months 보다 오래된 달의 파티션을 떼어 내고 통째로 지운다. (DELETE 없이)
+    DEFAULT 파티션에 섞여 들어온 오래된 행만 DELETE 로 지운다.
+    SQLite 처럼 파티션이 없는 DB 에서는 같은 기준으로 DELETE 한다.
+    반환값: {테이블: 지운 파티션 이름 목록 또는 지운 행 수}
+    """
+    if retention_months is None:
+        retention_months = settings.LOGS_RETENTION_MONTHS
+    if retention_months <= 0:
+        return {}
+
+    cutoff = add_months(month_floor(now or timezone.now()), -retention_months)
+    quote = connection.ops.quote_name
+    result = {}
+
+    with connection.cursor() as cursor:
+        for table, column in PARTITION_KEYS.items():
+            where = f"{quote(column)} < %s"
+            params = [connection.ops.adapt_datetimefield_value(cutoff)]
+
+            if not supports_partitions():
+                if dry_run:
+                    cursor.execute(f"SELECT COUNT(*) FROM {quote(table)} WHERE {where}", params)
+                    result[table] = cursor.fetchone()[0]
+                else:
+                    cursor.execute(f"DELETE FROM {quote(table)} WHERE {where}", params)
+                    result[table] = cursor.rowcount
+                continue
+
+            names = expired_partitions(cursor, table, cutoff)
+            result[table] = names
+            if dry_run:
+                continue
+
+            for name in names:
+                cursor.execute(f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}")
+                cursor.execute(f"DROP TABLE {quote(name)}")
+            cursor.execute(f"DELETE FROM {quote(default_partition_name(table))} WHERE {where}", params)
+
+    return result
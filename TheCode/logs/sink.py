@@ -0,0 +1,221 @@
+import atexit
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, close_old_connections
+
+from logs.ingest import write_logs
+
+
+DROP = "drop"
+BLOCK = "block"
+
+
+def group_by_model(objects):
+    grouped = {}
+    for obj in objects:
+        grouped.setdefault(type(obj), []).append(obj)
+    return grouped
+
+
+class LogSink:
+    """
+    워커 프로세스마다 하나씩 두는 로그 버퍼.
+    요청 처리 중에는 큐에 넣기만 하고, 백그라운드 스레드가 batch_size 개가 모이거나
+    flush_interval 초가 지나면 모델별로 bulk_create 한다.
+    잘못된 행이 섞여 쓰기가 실패하면 배치를 반씩 나눠 다시 쓰고, 문제가 된 행만 버린다(invalid).
+    큐가 가득 차면 policy 에 따라 버리거나(drop) block_timeout 초까지 기다린다(block).
+    """
+
+    def __init__(
+        self,
+        max_size=10000,
+        batch_size=500,
+        flush_interval=1.0,
+        policy=DROP,
+        block_timeout=0.05,
+        writer=write_logs,
+    ):
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"알 수 없는 policy 입니다: {policy}")
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.writer = writer
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.invalid = 0
+        self.flushes = 0
+
+        self._queue = queue.Queue(maxsize=max_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+                self._thread.start()
+
+    def submit(self, objects):
+        """
+        로그 객체를 순서대로 큐에 넣고, 넣은 개수를 돌려준다.
+        큐가 가득 차면 그 뒤의 객체는 넣지 않으므로, 호출한 쪽은 앞에서부터 n 개만 받아들여진 것으로 보면 된다.
+        """
+        self.start()
+
+        accepted = 0
+        for obj in objects:
+            try:
+                if self.policy == BLOCK:
+                    self._queue.put(obj, timeout=self.block_timeout)
+                else:
+                    self._queue.put_nowait(obj)
+            except queue.Full:
+                break
+            accepted += 1
+
+        with self._count_lock:
+            self.enqueued += accepted
+            self.dropped += len(objects) - accepted
+        return accepted
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        try:
+            for model, rows in group_by_model(batch).items():
+                self._write_rows(model, rows)
+        finally:
+            self.flushes += 1
+
+    def _write_rows(self, model, rows):
+        """
+        한 모델의 행을 쓴다. bulk_create 는 한 트랜잭션이라 실패하면 아무 행도 남지 않으므로,
+        행 자체의 문제(IntegrityError/DataError)이면 반씩 나눠 다시 써서 잘못된 행만 골라 버린다.
+        DB 장애처럼 행과 무관한 오류는 나눠도 소용없으므로 그대로 실패로 센다.
+        """
+        try:
+            self.writer({model: rows})
+        except (IntegrityError, DataError) as e:
+            if len(rows) == 1:
+                self.invalid += 1
+                print(f"Log sink dropped invalid {model.__name__} row: {e}")
+                return
+            middle = len(rows) // 2
+            self._write_rows(model, rows[:middle])
+            self._write_rows(model, rows[middle:])
+        except Exception as e:
+            self.failed += len(rows)
+            print(f"Log sink flush failed ({model.__name__}, {len(rows)} rows): {e}")
+        else:
+            self.written += len(rows)
+
+    def flush(self):
+        """
+        큐에 남은 로그를 지금 스레드에서 모두 쓴다.
+        """
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return
+                self._write(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            batch = []
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(timeout, 0.1)))
+                except queue.Empty:
+                    continue
+                batch.extend(self._drain(self.batch_size - len(batch)))
+
+            if batch:
+                with self._flush_lock:
+                    self._write(batch)
+                close_old_connections()
+
+    def close(self, timeout=5):
+        """
+        flush 스레드를 멈추고 남은 로그를 모두 쓴다.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+        close_old_connections()
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "invalid": self.invalid,
+            "flushes": self.flushes,
+        }
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_log_sink():
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = LogSink(
+                    max_size=settings.LOGS_SINK_MAX_SIZE,
+                    batch_size=settings.LOGS_BULK_CREATE_BATCH_SIZE,
+                    flush_interval=settings.LOGS_SINK_FLUSH_INTERVAL,
+                    policy=settings.LOGS_SINK_POLICY,
+                    block_timeout=settings.LOGS_SINK_BLOCK_TIMEOUT,
+                )
+                atexit.register(_sink.close)
+    return _sink
+
+
+def submit_logs(objects):
+    """
+    LOGS_SINK_MODE 가 sync 이면 바로 쓰고(테스트/관리 명령), 아니면 워커의 버퍼에 넣는다.
+    반환값: 앞에서부터 받아들인 개수
+    """
+    objects = list(objects)
+    if settings.LOGS_SINK_MODE == "sync":
+        write_logs(group_by_model(objects))
+        return len(objects)
+    return get_log_sink().submit(objects)
+
+
+def shutdown_log_sink():
+    """
+    gunicorn worker_exit 훅에서 호출한다.
+    """
+    if _sink is not None:
+        _sink.close()
@@ -0,0 +1,8 @@
+from jobs.queue import task
+from logs.partitions import drop_expired_partitions, ensure_partitions
+
+
+@task("logs.maintain_partitions", max_attempts=1)
+def maintain_partitions_task(payload):
+    ensure_partitions(months_ahead=payload.get("months_ahead"))
+    drop_expired_partitions(retention_months=payload.get("retention_months"))
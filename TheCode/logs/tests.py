@@ -1,3 +1,344 @@
-from django.test import TestCase
+import gzip
+import json
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from contents import catalog
+from contents.models import Series, Episode, Stage
+from logs.ingest import PayloadError, iter_json_array
+from logs.models import AppAccessLog, StageActivityLog
+from logs.partitions import (
+    add_months,
+    drop_expired_partitions,
+    ensure_partitions,
+    partition_month,
+    partition_name,
+    supports_partitions,
+)
+from logs.sink import BLOCK, LogSink
+
+
+@override_settings(LOGS_SINK_MODE="sync")
+class LogBatchTests(TestCase):
+    def setUp(self):
+        catalog.invalidate_catalog()
+
+        self.user = User.objects.create_user(provider="google", provider_user_id="player")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        series = Series.objects.create(code="S1", title="Series")
+        self.episode = Episode.objects.create(
+            series=series,
+            code="EP1",
+            title="Episode",
+            price_unlock_stages=1000,
+            price_unlock_with_adfree=2000,
+        )
+        self.stage = Stage.objects.create(
+            episode=self.episode, stage_no=1, title="One", image_key="", answer_text="a"
+        )
+
+    def post(self, events, compress=True, **extra):
+        body = json.dumps(events).encode()
+        if compress:
+            body = gzip.compress(body)
+            extra.setdefault("HTTP_CONTENT_ENCODING", "gzip")
+        return self.client.generic(
+            "POST", "/api/v1/logs/batch/", body, content_type="application/json", **extra
+        )
+
+    def app_event(self, event_type="app_open", **overrides):
+        return {
+            "type": event_type,
+            "platform": "android",
+            "app_version": "1.2.0",
+            "occurred_at": "2026-01-01T10:00:00Z",
+            **overrides,
+        }
+
+    def stage_event(self, stage_no=1, **overrides):
+        return {
+            "type": "stage_activity",
+            "episode_id": self.episode.id,
+            "stage_no": stage_no,
+            "entered_at": "2026-01-01T10:00:00Z",
+            "exited_at": "2026-01-01T10:03:00Z",
+            **overrides,
+        }
+
+    def test_mixed_batch_is_written_in_bulk(self):
+        events = [self.app_event(), self.stage_event(), self.app_event("app_background")]
+        catalog.get_catalog()
+
+        # 모델마다 INSERT 한 번
+        with self.assertNumQueries(2):
+            response = self.post(events)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["accepted"], [0, 1, 2])
+        self.assertEqual(AppAccessLog.objects.count(), 2)
+        self.assertEqual(StageActivityLog.objects.get().stage_id, self.stage.id)
+        self.assertEqual(
+            AppAccessLog.objects.earliest("occurred_at").occurred_at.isoformat(),
+            "2026-01-01T10:00:00+00:00",
+        )
+
+    def test_per_item_rejection(self):
+        response = self.post([
+            self.app_event(),
+            self.app_event(platform="windows"),
+            self.stage_event(stage_no=99),
+            self.stage_event(exited_at="2026-01-01T09:00:00Z"),
+            self.app_event(occurred_at="2999-01-01T00:00:00Z"),
+            "not-an-object",
+        ])
+
+        data = response.data["data"]
+        self.assertEqual(data["accepted"], [0])
+        self.assertEqual([r["index"] for r in data["rejected"]], [1, 2, 3, 4, 5])
+        self.assertEqual(AppAccessLog.objects.count(), 1)
+
+    def test_items_the_sink_could_not_take_are_rejected(self):
+        with mock.patch("logs.views.submit_logs", return_value=1):
+            response = self.post([self.app_event(platform="windows"), self.app_event(), self.app_event()])
+
+        data = response.data["data"]
+        self.assertEqual(data["accepted"], [1])
+        self.assertEqual([r["index"] for r in data["rejected"]], [0, 2])
+
+    def test_uncompressed_body(self):
+        response = self.post([self.app_event()], compress=False)
+        self.assertEqual(response.data["data"]["accepted"], [0])
+
+    @override_settings(LOGS_BATCH_MAX_EVENTS=2)
+    def test_too_many_events(self):
+        response = self.post([self.app_event()] * 3)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(AppAccessLog.objects.exists())
+
+    @override_settings(LOGS_BATCH_MAX_DECOMPRESSED_BYTES=1024)
+    def test_decompression_limit(self):
+        # 압축률이 높은 본문이 풀렸을 때의 크기로 제한된다.
+        events = [self.app_event(device_info="x" * 200)] * 50
+        self.assertEqual(self.post(events).status_code, 413)
+
+    @override_settings(LOGS_BATCH_MAX_BYTES=64)
+    def test_body_limit(self):
+        self.assertEqual(self.post([self.app_event()] * 5, compress=False).status_code, 413)
+
+    def test_malformed_payload(self):
+        response = self.client.generic(
+            "POST",
+            "/api/v1/logs/batch/",
+            b"not gzip",
+            content_type="application/json",
+            HTTP_CONTENT_ENCODING="gzip",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_streaming_parser(self):
+        self.assertEqual(list(iter_json_array(' [ {"a": 1} , 2 ,"x"] ', 10)), [{"a": 1}, 2, "x"])
+        self.assertEqual(list(iter_json_array("[]", 10)), [])
+
+        for text in ('{"a": 1}', "[1, 2", "[1 2]", "[1] 3"):
+            with self.assertRaises(PayloadError):
+                list(iter_json_array(text, 10))
+
+
+class FakeWriter:
+    def __init__(self, hold=False):
+        self.batches = []
+        self.written = threading.Event()
+        # hold 이면 release 될 때까지 첫 쓰기에서 멈춰, 큐가 비워지지 않는 상황을 만든다.
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def __call__(self, objects):
+        self.entered.set()
+        self.release.wait(5)
+        self.batches.append(sum(len(rows) for rows in objects.values()))
+        self.written.set()
+
+
+class LogSinkTests(TestCase):
+    def make_sink(self, writer, **kwargs):
+        sink = LogSink(writer=writer, **kwargs)
+        self.addCleanup(sink.close)
+        return sink
+
+    def logs(self, count):
+        return [AppAccessLog() for _ in range(count)]
+
+    def test_flushes_when_batch_is_full(self):
+        writer = FakeWriter()
+        sink = self.make_sink(writer, batch_size=3, flush_interval=60)
+
+        self.assertEqual(sink.submit(self.logs(3)), 3)
+        self.assertTrue(writer.written.wait(2))
+        self.assertEqual(writer.batches, [3])
+
+    def test_flushes_after_interval(self):
+        writer = FakeWriter()
+        sink = self.make_sink(writer, batch_size=100, flush_interval=0.1)
+
+        sink.submit(self.logs(2))
+        self.assertTrue(writer.written.wait(2))
+        self.assertEqual(writer.batches, [2])
+
+    def stalled_sink(self, **kwargs):
+        writer = FakeWriter(hold=True)
+        sink = self.make_sink(writer, max_size=2, batch_size=1, flush_interval=60, **kwargs)
+        # 정리는 역순이므로 close 보다 먼저 쓰기를 풀어 준다.
+        self.addCleanup(writer.release.set)
+        sink.submit(self.logs(1))
+        self.assertTrue(writer.entered.wait(2))
+        return sink
+
+    def test_drop_policy_counts_dropped(self):
+        sink = self.stalled_sink()
+
+        self.assertEqual(sink.submit(self.logs(5)), 2)
+        self.assertEqual(sink.stats()["dropped"], 3)
+        self.assertEqual(sink.stats()["enqueued"], 3)
+
+    def test_block_policy_gives_up_after_timeout(self):
+        sink = self.stalled_sink(policy=BLOCK, block_timeout=0.05)
+
+        started = time.monotonic()
+        self.assertEqual(sink.submit(self.logs(3)), 2)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(sink.stats()["dropped"], 1)
+
+    def test_close_writes_remaining_logs(self):
+        writer = FakeWriter()
+        sink = LogSink(writer=writer, batch_size=2, flush_interval=60)
+
+        sink.submit(self.logs(5))
+        sink.close()
+
+        self.assertEqual(sum(writer.batches), 5)
+        self.assertEqual(sink.stats()["written"], 5)
+        self.assertEqual(sink.stats()["queued"], 0)
+
+    def test_failed_flush_is_counted(self):
+        sink = LogSink(writer=mock.Mock(side_effect=RuntimeError("db down")), batch_size=10)
+        sink.submit(self.logs(2))
+        sink.close()
+
+        self.assertEqual(sink.stats()["failed"], 2)
+
+    def test_bad_row_is_dropped_alone(self):
+        written = []
+
+        def writer(objects):
+            rows = sum(objects.values(), [])
+            if any(getattr(row, "app_version", "") == "bad" for row in rows):
+                raise IntegrityError("bad row")
+            written.extend(rows)
+
+        logs = self.logs(7)
+        logs[4].app_version = "bad"
+        stages = [StageActivityLog() for _ in range(3)]
+        sink = LogSink(writer=writer, batch_size=20, flush_interval=60)
+        with mock.patch("builtins.print"):
+            sink.submit(logs + stages)
+            sink.close()
+
+        self.assertEqual(len(written), 9)
+        self.assertNotIn(logs[4], written)
+        self.assertEqual(sink.stats()["written"], 9)
+        self.assertEqual(sink.stats()["invalid"], 1)
+        self.assertEqual(sink.stats()["failed"], 0)
+
+    def test_models_are_written_separately(self):
+        def writer(objects):
+            if AppAccessLog in objects:
+                raise RuntimeError("db down")
+
+        sink = LogSink(writer=writer, batch_size=20, flush_interval=60)
+        with mock.patch("builtins.print"):
+            sink.submit(self.logs(2) + [StageActivityLog()])
+            sink.close()
+
+        self.assertEqual(sink.stats()["written"], 1)
+        self.assertEqual(sink.stats()["failed"], 2)
+        self.assertEqual(sink.stats()["invalid"], 0)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class LogPartitionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(provider="google", provider_user_id="player")
+
+    def app_log(self, occurred_at):
+        return AppAccessLog.objects.create(
+            user=self.user,
+            event_type="app_open",
+            platform="android",
+            app_version="1.0.0",
+            occurred_at=occurred_at,
+        )
+
+    def test_month_helpers(self):
+        self.assertEqual(add_months(utc(2026, 11, 1), 2), utc(2027, 1, 1))
+        self.assertEqual(add_months(utc(2026, 1, 1), -1), utc(2025, 12, 1))
+
+        name = partition_name("logs_appaccesslog", utc(2026, 3, 1))
+        self.assertEqual(name, "logs_appaccesslog_202603")
+        self.assertEqual(partition_month("logs_appaccesslog", name), utc(2026, 3, 1))
+        self.assertIsNone(partition_month("logs_appaccesslog", "logs_appaccesslog_default"))
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite 에서는 단일 테이블에 DELETE 로 적용된다.")
+    def test_retention_without_partitions(self):
+        now = utc(2026, 10, 18)
+        old = self.app_log(utc(2025, 9, 30))
+        kept = self.app_log(utc(2025, 10, 1))
+
+        self.assertEqual(ensure_partitions(now=now), [])
+        result = drop_expired_partitions(retention_months=12, now=now)
+
+        self.assertEqual(result["logs_appaccesslog"], 1)
+        self.assertFalse(AppAccessLog.objects.filter(pk=old.pk).exists())
+        self.assertTrue(AppAccessLog.objects.filter(pk=kept.pk).exists())
+
+    def test_command_dry_run_keeps_rows(self):
+        self.app_log(utc(2000, 1, 1))
+        out = StringIO()
+
+        call_command("maintain_log_partitions", "--dry-run", stdout=out)
+
+        self.assertEqual(AppAccessLog.objects.count(), 1)
+        self.assertIn("logs_appaccesslog", out.getvalue())
+
+    @skipUnless(supports_partitions(), "PostgreSQL 파티션 테이블에서만 확인할 수 있다.")
+    def test_time_bounded_query_scans_one_partition(self):
+        now = datetime.now(dt_timezone.utc)
+        ensure_partitions(now=now)
+        month = utc(now.year, now.month, 1)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "EXPLAIN SELECT * FROM logs_appaccesslog WHERE occurred_at >= %s AND occurred_at < %s",
+                [month, add_months(month, 1)],
+            )
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        self.assertIn(partition_name("logs_appaccesslog", month), plan)
+        self.assertNotIn(partition_name("logs_appaccesslog", add_months(month, 1)), plan)
+        self.assertNotIn("logs_appaccesslog_default", plan)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import LogBatchView
+
+urlpatterns = [
+    path("batch/", LogBatchView.as_view()),
+]
@@ -1,3 +1,55 @@
-from django.shortcuts import render
+from django.conf import settings
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 
-# Create your views here.
+from logs.ingest import PayloadError, build_logs, decode_body, iter_json_array
+from logs.sink import submit_logs
+from utils.response import success_response, error_response
+
+
+class LogBatchView(APIView):
+    """
+    앱/스테이지 로그를 JSON 배열로 한 번에 받는다. (Content-Encoding: gzip 지원)
+    항목별로 accepted/rejected 인덱스를 돌려주므로 클라이언트는 accepted 만 지우면 된다.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > settings.LOGS_BATCH_MAX_BYTES:
+            return error_response("요청 본문이 너무 큽니다.", status=413)
+
+        try:
+            text = decode_body(request.body, request.headers.get("Content-Encoding"))
+            # 원소를 파싱하는 대로 검증하며, 형식 오류나 개수 초과가 나오면 아무것도 저장하지 않는다.
+            entries, rejected = build_logs(
+                request.user.id,
+                iter_json_array(text, settings.LOGS_BATCH_MAX_EVENTS),
+            )
+        except PayloadError as e:
+            return error_response(e.message, status=e.status)
+
+        # 요청은 버퍼에 넣기만 한다. 버퍼가 가득 차 받지 못한 항목은 다시 보내도록 rejected 로 알려 준다.
+        submitted = submit_logs(obj for _, obj in entries)
+        accepted = [index for index, _ in entries[:submitted]]
+        if submitted < len(entries):
+            rejected = sorted(
+                rejected
+                + [
+                    {"index": index, "reason": "잠시 후 다시 보내 주세요."}
+                    for index, _ in entries[submitted:]
+                ],
+                key=lambda r: r["index"],
+            )
+
+        return success_response(
+            message="로그를 저장했습니다.",
+            data={
+                "accepted": accepted,
+                "rejected": rejected,
+            },
+        )
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from progress.models import UserEpisodeProgress
+from utils.admin import select_related_filter
 
 @admin.register(UserEpisodeProgress)
 class UserEpisodeProgressAdmin(admin.ModelAdmin):
@@ -12,5 +13,6 @@ class UserEpisodeProgressAdmin(admin.ModelAdmin):
         "started_at",
         "cleared_at",
     )
-    list_filter = ("is_cleared", "episode")
+    list_select_related = ("user", "episode__series")
+    list_filter = ("is_cleared", ("episode", select_related_filter("series")))
     search_fields = ("user__email", "user__username")
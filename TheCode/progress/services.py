@@ -0,0 +1,108 @@
+from contextlib import nullcontext
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from progress.models import UserEpisodeProgress
+
+
+ADVANCE = "advance"
+CLEAR = "clear"
+EVENT_TYPES = (ADVANCE, CLEAR)
+
+
+@dataclass
+class ProgressChange:
+    """
+    한 에피소드에 적용할 변경. 여러 이벤트를 합쳐도 결과가 같도록 멱등적인 값만 담는다.
+    """
+
+    episode_id: int
+    current_stage_no: int | None = None
+    highest_stage_no: int | None = None
+    cleared: bool = False
+
+    def add(self, event_type, stage_no=None):
+        if stage_no is not None:
+            self.current_stage_no = stage_no
+            self.highest_stage_no = max(self.highest_stage_no or 0, stage_no)
+        if event_type == CLEAR:
+            self.cleared = True
+
+    def update_values(self, now):
+        values = {}
+        if self.current_stage_no is not None:
+            values["current_stage_no"] = self.current_stage_no
+            values["highest_stage_no"] = Greatest(F("highest_stage_no"), Value(self.highest_stage_no))
+        if self.cleared:
+            # 이미 클리어했다면 처음 클리어한 시각을 유지한다.
+            values["is_cleared"] = True
+            values["cleared_at"] = Coalesce(F("cleared_at"), Value(now))
+        return values
+
+    def new_row(self, user_id, now):
+        stage_no = self.current_stage_no or 1
+        return UserEpisodeProgress(
+            user_id=user_id,
+            episode_id=self.episode_id,
+            current_stage_no=stage_no,
+            highest_stage_no=self.highest_stage_no or stage_no,
+            is_cleared=self.cleared,
+            cleared_at=now if self.cleared else None,
+        )
+
+
+def apply_changes(user_id, changes, now=None):
+    """
+    에피소드별 변경을 한 트랜잭션 안에서 적용한다.
+    행을 읽지 않고 조건식이 들어간 UPDATE 만 쓰므로, 두 기기에서 동시에 보내도 서로의 값을 덮어쓰지 않는다.
+    처음 플레이하는 에피소드는 충돌을 무시하는 INSERT 로 만들고, 그 사이 다른 요청이 먼저 만들었을 수 있으므로
+    같은 UPDATE 를 한 번 더 적용한다. (UPDATE 가 멱등적이라 두 번 적용해도 결과가 같다.)
+    여러 기기가 겹치는 에피소드를 서로 다른 순서로 보내도 교착 상태가 되지 않도록 episode_id 순서로 잠근다.
+    """
+    now = now or timezone.now()
+    changes = sorted(changes, key=lambda change: change.episode_id)
+    rows = UserEpisodeProgress.objects.filter(user_id=user_id)
+
+    # 변경이 하나면 UPDATE 한 문장으로 끝나므로 트랜잭션을 따로 열지 않는다.
+    with transaction.atomic() if len(changes) > 1 else nullcontext():
+        missing = [
+            change
+            for change in changes
+            if not rows.filter(episode_id=change.episode_id).update(**change.update_values(now))
+        ]
+        if not missing:
+            return
+
+        UserEpisodeProgress.objects.bulk_create(
+            [change.new_row(user_id, now) for change in missing],
+            ignore_conflicts=True,
+        )
+        for change in missing:
+            rows.filter(episode_id=change.episode_id).update(**change.update_values(now))
+
+
+def collapse_events(events):
+    """
+    순서대로 들어온 오프라인 이벤트를 에피소드별 변경 하나로 합친다.
+    """
+    changes = {}
+    for event in events:
+        change = changes.setdefault(event["episode_id"], ProgressChange(event["episode_id"]))
+        change.add(event["type"], event.get("stage_no"))
+    return list(changes.values())
+
+
+def advance_stage(user_id, episode_id, stage_no, now=None):
+    change = ProgressChange(episode_id)
+    change.add(ADVANCE, stage_no)
+    apply_changes(user_id, [change], now)
+
+
+def clear_episode(user_id, episode_id, stage_no=None, now=None):
+    change = ProgressChange(episode_id)
+    change.add(CLEAR, stage_no)
+    apply_changes(user_id, [change], now)
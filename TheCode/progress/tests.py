@@ -1,3 +1,235 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from contents import catalog
+from contents.models import Series, Episode, Stage
+from progress.models import UserEpisodeProgress
+from progress.services import advance_stage, clear_episode
+
+
+class ProgressFixture:
+    def setUp(self):
+        catalog.invalidate_catalog()
+
+        self.user = User.objects.create_user(provider="google", provider_user_id="player")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        series = Series.objects.create(code="S1", title="Series")
+        self.episodes = []
+        for code in ("EP1", "EP2"):
+            episode = Episode.objects.create(
+                series=series,
+                code=code,
+                title=code,
+                price_unlock_stages=1000,
+                price_unlock_with_adfree=2000,
+            )
+            for no in range(1, 6):
+                Stage.objects.create(
+                    episode=episode, stage_no=no, title=str(no), image_key="", answer_text="a"
+                )
+            self.episodes.append(episode.id)
+        self.episode_id = self.episodes[0]
+
+    def progress(self, episode_id=None):
+        return UserEpisodeProgress.objects.get(user=self.user, episode_id=episode_id or self.episode_id)
+
+    def advance(self, stage_no, episode_id=None):
+        return self.client.post(
+            f"/api/v1/progress/{episode_id or self.episode_id}/advance/", {"stage_no": stage_no}
+        )
+
+
+class ProgressTestCase(ProgressFixture, TestCase):
+    pass
+
+
+class ProgressUpdateTests(ProgressTestCase):
+    def test_first_play_creates_row(self):
+        self.assertEqual(self.advance(2).status_code, 200)
+
+        progress = self.progress()
+        self.assertEqual((progress.current_stage_no, progress.highest_stage_no), (2, 2))
+
+    def test_warm_advance_is_single_update(self):
+        self.advance(1)
+        catalog.get_catalog()
+
+        with self.assertNumQueries(1):
+            advance_stage(self.user.id, self.episode_id, 2)
+
+    def test_highest_stage_never_moves_back(self):
+        self.advance(4)
+        self.advance(2)
+
+        progress = self.progress()
+        self.assertEqual((progress.current_stage_no, progress.highest_stage_no), (2, 4))
+
+    def test_cleared_at_is_set_once(self):
+        first = timezone.now() - timedelta(days=1)
+        clear_episode(self.user.id, self.episode_id, now=first)
+        clear_episode(self.user.id, self.episode_id)
+
+        self.assertEqual(self.progress().cleared_at, first)
+
+    def test_clear_endpoint_records_last_stage(self):
+        response = self.client.post(f"/api/v1/progress/{self.episode_id}/clear/")
+
+        self.assertEqual(response.status_code, 200)
+        progress = self.progress()
+        self.assertTrue(progress.is_cleared)
+        self.assertEqual(progress.highest_stage_no, 5)
+
+    def test_unknown_stage(self):
+        self.assertEqual(self.advance(99).status_code, 404)
+        self.assertEqual(self.advance("x").status_code, 400)
+
+
+class ProgressSyncTests(ProgressTestCase):
+    def sync(self, events):
+        return self.client.post("/api/v1/progress/sync/", {"events": events}, format="json")
+
+    def test_events_are_collapsed_per_episode(self):
+        ep1, ep2 = self.episodes
+        self.advance(1, ep1)
+        self.advance(1, ep2)
+        catalog.get_catalog()
+
+        events = [{"type": "advance", "episode_id": ep1, "stage_no": no} for no in (2, 3, 4, 3)]
+        events += [
+            {"type": "advance", "episode_id": ep2, "stage_no": 5},
+            {"type": "clear", "episode_id": ep2},
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.sync(events)
+        # 에피소드마다 UPDATE 한 번 (테스트 트랜잭션 때문에 생기는 SAVEPOINT 는 제외)
+        statements = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(len(statements), 2)
+        self.assertEqual(response.data["data"]["accepted"], 6)
+
+        first, second = self.progress(ep1), self.progress(ep2)
+        self.assertEqual((first.current_stage_no, first.highest_stage_no), (3, 4))
+        self.assertTrue(second.is_cleared)
+        self.assertEqual(second.highest_stage_no, 5)
+
+    def test_rows_are_updated_in_episode_order(self):
+        ep1, ep2 = self.episodes
+        catalog.get_catalog()
+        events = [
+            {"type": "advance", "episode_id": ep2, "stage_no": 2},
+            {"type": "advance", "episode_id": ep1, "stage_no": 2},
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.sync(events)
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        # 처음 만드는 행을 다시 UPDATE 하는 단계까지 모두 episode_id 순서로 잠근다.
+        expected = [f'"episode_id" = {episode_id}' for episode_id in (ep1, ep2, ep1, ep2)]
+        self.assertEqual(len(updates), len(expected))
+        for sql, condition in zip(updates, expected):
+            self.assertIn(condition, sql)
+
+    def test_clear_matches_clear_endpoint(self):
+        ep1, ep2 = self.episodes
+        for episode_id in (ep1, ep2):
+            self.advance(2, episode_id)
+
+        self.client.post(f"/api/v1/progress/{ep1}/clear/")
+        self.sync([{"type": "clear", "episode_id": ep2}])
+
+        first, second = self.progress(ep1), self.progress(ep2)
+        self.assertEqual(
+            (second.is_cleared, second.current_stage_no, second.highest_stage_no),
+            (first.is_cleared, first.current_stage_no, first.highest_stage_no),
+        )
+        self.assertEqual(second.highest_stage_no, 5)
+
+    def test_first_play_in_batch(self):
+        ep1, ep2 = self.episodes
+        response = self.sync([
+            {"type": "advance", "episode_id": ep1, "stage_no": 3},
+            {"type": "advance", "episode_id": ep2, "stage_no": 2},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(UserEpisodeProgress.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(self.progress(ep1).highest_stage_no, 3)
+
+    def test_invalid_events_are_rejected(self):
+        response = self.sync([
+            {"type": "advance", "episode_id": self.episode_id, "stage_no": 2},
+            {"type": "advance", "episode_id": self.episode_id, "stage_no": 99},
+            {"type": "jump", "episode_id": self.episode_id, "stage_no": 1},
+            {"type": "advance", "episode_id": self.episode_id},
+        ])
+
+        self.assertEqual(response.data["data"]["accepted"], 1)
+        self.assertEqual(response.data["data"]["rejected"], [1, 2, 3])
+        self.assertEqual(self.progress().highest_stage_no, 2)
+
+    def test_empty_or_oversized_batch(self):
+        self.assertEqual(self.sync([]).status_code, 400)
+        with self.settings(PROGRESS_SYNC_MAX_EVENTS=1):
+            events = [{"type": "clear", "episode_id": self.episode_id}] * 2
+            self.assertEqual(self.sync(events).status_code, 400)
+
+    def test_list(self):
+        self.advance(3)
+
+        response = self.client.get("/api/v1/progress/")
+        self.assertEqual(response.data["data"]["progresses"][0]["highest_stage_no"], 3)
+
+
+@skipUnless(connection.vendor == "postgresql", "동시 요청은 행 잠금이 있는 PostgreSQL 에서만 확인할 수 있다.")
+class ConcurrentSyncTests(ProgressFixture, TransactionTestCase):
+    """
+    여러 스레드(각자 DB 연결)가 같은 사용자의 겹치는 에피소드를 서로 다른 순서로 동시에 동기화한다.
+    """
+
+    threads = 8
+
+    def test_devices_syncing_in_opposite_orders(self):
+        ep1, ep2 = self.episodes
+        barrier = threading.Barrier(self.threads)
+        responses = []
+
+        def worker(index):
+            order = [ep1, ep2] if index % 2 else [ep2, ep1]
+            if index == 0:
+                events = [{"type": "clear", "episode_id": episode_id} for episode_id in order]
+            else:
+                events = [
+                    {"type": "advance", "episode_id": episode_id, "stage_no": index % 4 + 1}
+                    for episode_id in order
+                ]
+            client = APIClient()
+            client.force_authenticate(self.user)
+            try:
+                barrier.wait()
+                responses.append(client.post("/api/v1/progress/sync/", {"events": events}, format="json"))
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        self.assertEqual([response.status_code for response in responses], [200] * self.threads)
+        self.assertEqual(UserEpisodeProgress.objects.filter(user=self.user).count(), 2)
+        for episode_id in self.episodes:
+            progress = self.progress(episode_id)
+            # 어느 기기의 값도 잃지 않는다. (클리어는 마지막 스테이지까지 진행한 것으로 기록된다)
+            self.assertTrue(progress.is_cleared)
+            self.assertEqual(progress.highest_stage_no, 5)
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import ProgressListView, StageAdvanceView, EpisodeClearView, ProgressSyncView
+
+urlpatterns = [
+    path("", ProgressListView.as_view()),
+    path("sync/", ProgressSyncView.as_view()),
+    path("<int:episode_id>/advance/", StageAdvanceView.as_view()),
+    path("<int:episode_id>/clear/", EpisodeClearView.as_view()),
+]
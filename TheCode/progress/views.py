@@ -1,3 +1,129 @@
-from django.shortcuts import render
+from django.conf import settings
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 
-# Create your views here.
+from contents.catalog import get_episode, get_stage
+from progress.models import UserEpisodeProgress
+from progress.services import (
+    ADVANCE,
+    EVENT_TYPES,
+    advance_stage,
+    apply_changes,
+    clear_episode,
+    collapse_events,
+)
+from utils.response import success_response, error_response
+
+
+def _parse_int(value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+class ProgressListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        progresses = UserEpisodeProgress.objects.filter(user_id=request.user.id).values(
+            "episode_id",
+            "current_stage_no",
+            "highest_stage_no",
+            "is_cleared",
+            "cleared_at",
+        )
+        return success_response(
+            message="진행 상황입니다.",
+            data={"progresses": list(progresses)},
+        )
+
+
+class StageAdvanceView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, episode_id):
+        stage_no = _parse_int(request.data.get("stage_no"))
+        if stage_no is None:
+            return error_response("stage_no 값이 필요합니다.", status=400)
+
+        if get_stage(episode_id, stage_no) is None:
+            return error_response("스테이지가 존재하지 않습니다.", status=404)
+
+        advance_stage(request.user.id, episode_id, stage_no)
+        return success_response(message="진행 상황을 저장했습니다.")
+
+
+class EpisodeClearView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, episode_id):
+        episode, stages = get_episode(episode_id)
+        if episode is None:
+            return error_response("에피소드가 존재하지 않습니다.", status=404)
+
+        last_stage_no = stages[-1].stage_no if stages else None
+        clear_episode(request.user.id, episode_id, last_stage_no)
+        return success_response(message="에피소드를 클리어했습니다.")
+
+
+class ProgressSyncView(APIView):
+    """
+    오프라인에서 쌓인 이벤트를 순서대로 받아 한 번에 반영한다.
+    events: [{"type": "advance" | "clear", "episode_id": 1, "stage_no": 3}, ...]
+    없는 에피소드/스테이지를 가리키는 이벤트는 건너뛰고 rejected 로 알려 준다.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        events = request.data.get("events")
+        if not isinstance(events, list) or not events:
+            return error_response("events 값이 필요합니다.", status=400)
+        if len(events) > settings.PROGRESS_SYNC_MAX_EVENTS:
+            return error_response(
+                f"events 는 최대 {settings.PROGRESS_SYNC_MAX_EVENTS}개까지 보낼 수 있습니다.",
+                status=400,
+            )
+
+        accepted, rejected = [], []
+        for index, event in enumerate(events):
+            parsed = self._parse_event(event)
+            if parsed is None:
+                rejected.append(index)
+            else:
+                accepted.append(parsed)
+
+        if accepted:
+            apply_changes(request.user.id, collapse_events(accepted))
+
+        return success_response(
+            message="진행 상황을 동기화했습니다.",
+            data={
+                "accepted": len(accepted),
+                "rejected": rejected,
+            },
+        )
+
+    def _parse_event(self, event):
+        if not isinstance(event, dict) or event.get("type") not in EVENT_TYPES:
+            return None
+
+        episode_id = _parse_int(event.get("episode_id"))
+        stage_no = _parse_int(event.get("stage_no"))
+        if episode_id is None:
+            return None
+
+        if stage_no is None:
+            if event["type"] == ADVANCE:
+                return None
+            episode, stages = get_episode(episode_id)
+            if episode is None:
+                return None
+            # EpisodeClearView 와 같이 마지막 스테이지까지 진행한 것으로 기록한다.
+            stage_no = stages[-1].stage_no if stages else None
+        elif get_stage(episode_id, stage_no) is None:
+            return None
+
+        return {"type": event["type"], "episode_id": episode_id, "stage_no": stage_no}
@@ -0,0 +1,37 @@
+import hashlib
+
+from rest_framework.response import Response
+
+
+# 인증이 필요한 응답이므로 공유 캐시에는 저장하지 않고, 재사용 전에는 항상 재검증하게 한다.
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts):
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def is_not_modified(request, etag):
+    """
+    If-None-Match 에 etag 가 있으면 True. If-Modified-Since 는 보지 않는다. (Last-Modified 를 보내지 않는다)
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    # If-None-Match 는 weak 비교를 사용한다.
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def set_validators(response, etag):
+    response["ETag"] = etag
+    response["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def not_modified_response(etag):
+    return set_validators(Response(status=304), etag)
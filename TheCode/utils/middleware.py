@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from utils.query_budget import QueryBudgetExceeded, budget_for, count_queries
+
+
+class QueryBudgetMiddleware:
+    """
+    DEBUG 에서만 켜지는 미들웨어. 요청마다 쿼리 수를 X-Query-Count 헤더로 알려 주고,
+    라우트별 예산(QUERY_BUDGETS)을 넘으면 QUERY_BUDGET_RAISE 에 따라 오류를 내거나 경고를 출력한다.
+    """
+
+    def __init__(self, get_response):
+        if not (settings.DEBUG and settings.QUERY_BUDGET_ENABLED):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with count_queries() as queries:
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        route = match.route if match else request.path_info.lstrip("/")
+        budget = budget_for(route)
+        response["X-Query-Count"] = str(len(queries))
+
+        if len(queries) > budget:
+            error = QueryBudgetExceeded(f"{request.method} /{route}", budget, queries)
+            if settings.QUERY_BUDGET_RAISE:
+                raise error
+            print(f"Query budget exceeded: {error}")
+        return response
@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# 트랜잭션 안(테스트 등)에서 생기는 SAVEPOINT 는 요청이 만든 쿼리로 세지 않는다.
+_IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, label, budget, queries):
+        self.label = label
+        self.budget = budget
+        self.queries = queries
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(queries, 1))
+        super().__init__(f"{label}: 쿼리 {len(queries)}개 (예산 {budget}개)\n{listing}")
+
+
+@contextmanager
+def count_queries(using=DEFAULT_DB_ALIAS):
+    """
+    블록 안에서 실행된 SQL 목록. DEBUG 여부와 관계없이 execute_wrapper 로 센다.
+    """
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(_IGNORED_PREFIXES):
+            queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connections[using].execute_wrapper(record):
+        yield queries
+
+
+@contextmanager
+def query_budget(budget, label="block", using=DEFAULT_DB_ALIAS):
+    """
+    블록의 쿼리가 budget 개를 넘으면 QueryBudgetExceeded.
+    """
+    with count_queries(using) as queries:
+        yield queries
+    if len(queries) > budget:
+        raise QueryBudgetExceeded(label, budget, queries)
+
+
+def budget_for(route):
+    """
+    QUERY_BUDGETS 에서 route(URL 패턴, 예: "api/v1/progress/<int:episode_id>/advance/")에
+    맞는 가장 구체적인(가장 긴) 패턴의 예산. 없으면 QUERY_BUDGET_DEFAULT.
+    """
+    matches = [pattern for pattern in settings.QUERY_BUDGETS if fnmatchcase(route, pattern)]
+    if not matches:
+        return settings.QUERY_BUDGET_DEFAULT
+    return settings.QUERY_BUDGETS[max(matches, key=len)]
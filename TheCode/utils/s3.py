@@ -1,10 +1,178 @@
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
 import boto3
+from botocore import UNSIGNED
+from botocore.auth import SIGV4_TIMESTAMP, S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
+from botocore.config import Config
 from django.conf import settings
 
-def get_s3_client():
-    return boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION,
+
+class _FixedTimeQueryAuth(S3SigV4QueryAuth):
+    """
+    S3SigV4QueryAuth 는 항상 현재 시각으로 서명한다. 주어진 시각(X-Amz-Date)으로 서명하도록 덮어쓴다.
+    """
+
+    def __init__(self, credentials, region_name, expires, signed_at):
+        super().__init__(credentials, "s3", region_name, expires=expires)
+        self._timestamp = datetime.fromtimestamp(signed_at, dt_timezone.utc).strftime(SIGV4_TIMESTAMP)
+
+    def _modify_request_before_signing(self, request):
+        request.context["timestamp"] = self._timestamp
+        super()._modify_request_before_signing(request)
+
+
+class S3Presigner:
+    """
+    GET presigned URL 을 지정한 서명 시각으로 만든다.
+    서명 시각과 ExpiresIn 이 같으면 어느 프로세스에서 만들어도 같은 URL 이 나온다.
+    주소(버킷 호스트, 키 인코딩)는 서명하지 않는 boto3 클라이언트로 만들고 서명만 직접 붙인다.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.region_name = session.region_name
+        self._client = session.client("s3", config=Config(signature_version=UNSIGNED))
+
+    def presign(self, bucket, key, signed_at, expires_in):
+        url = self._client.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={
+                "Bucket": bucket,
+                "Key": key,
+            },
+        )
+        credentials = self.session.get_credentials()
+        request = AWSRequest(method="GET", url=url)
+        _FixedTimeQueryAuth(
+            credentials.get_frozen_credentials() if credentials is not None else None,
+            self.region_name,
+            expires=expires_in,
+            signed_at=signed_at,
+        ).add_auth(request)
+        return request.url
+
+
+def get_s3_presigner():
+    return S3Presigner(
+        boto3.session.Session(
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION,
+        )
     )
+
+
+class PresignedURLCache:
+    """
+    presigned URL 캐시.
+    만료 시각을 bucket_seconds 단위의 고정 구간 경계에 맞추고, 서명 시각도 만료 시각에서 정해지는
+    값(signing_time)으로 쓰기 때문에, 같은 구간 안에서는 어느 워커에서든 모든 사용자가
+    같은 image_key 에 대해 같은 URL 을 받는다.
+    남은 유효 시간이 min_ttl 보다 짧아질 때만 다시 서명한다.
+    """
+
+    def __init__(self, signer, bucket, bucket_seconds, min_ttl, max_entries=10000):
+        if min_ttl >= bucket_seconds:
+            raise ValueError("min_ttl 은 bucket_seconds 보다 작아야 합니다.")
+
+        self.signer = signer
+        self.bucket = bucket
+        self.bucket_seconds = bucket_seconds
+        self.min_ttl = min_ttl
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def expiry_for(self, now):
+        expires_at = (int(now) // self.bucket_seconds + 1) * self.bucket_seconds
+        if expires_at - now < self.min_ttl:
+            expires_at += self.bucket_seconds
+        return expires_at
+
+    def signing_time(self, expires_at):
+        """
+        expires_at 으로 끝나는 URL 의 서명 시각. 유효 기간은 항상 bucket_seconds + min_ttl 이다.
+        expiry_for 가 expires_at 을 처음 돌려주는 시각과 같으므로 서명 시각이 현재보다 미래가 되지 않는다.
+        """
+        return expires_at - self.bucket_seconds - self.min_ttl
+
+    def get_url(self, key, now=None):
+        now = time.time() if now is None else now
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] - now >= self.min_ttl:
+                self.hits += 1
+                return entry[0]
+
+            expires_at = self.expiry_for(now)
+            signed_at = self.signing_time(expires_at)
+            url = self.signer.presign(self.bucket, key, signed_at, expires_at - signed_at)
+
+            if len(self._entries) >= self.max_entries:
+                self._purge(now)
+            self._entries[key] = (url, expires_at)
+            self.misses += 1
+            return url
+
+    def get_urls(self, keys, now=None):
+        now = time.time() if now is None else now
+        return {key: self.get_url(key, now=now) for key in keys if key}
+
+    def _purge(self, now):
+        expired = [k for k, (_, exp) in self._entries.items() if exp - now < self.min_ttl]
+        for k in expired:
+            del self._entries[k]
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+        }
+
+
+_stage_image_urls = None
+
+
+def get_stage_image_urls():
+    global _stage_image_urls
+    if _stage_image_urls is None:
+        _stage_image_urls = PresignedURLCache(
+            signer=get_s3_presigner(),
+            bucket=settings.AWS_STAGE_BUCKET,
+            bucket_seconds=settings.STAGE_IMAGE_URL_BUCKET_SECONDS,
+            min_ttl=settings.STAGE_IMAGE_URL_MIN_TTL,
+        )
+    return _stage_image_urls
+
+
+def presign_stage_image(image_key, now=None):
+    if not image_key:
+        return None
+    return get_stage_image_urls().get_url(image_key, now=now)
+
+
+def presign_stage_images(image_keys, now=None):
+    return get_stage_image_urls().get_urls(image_keys, now=now)
+
+
+def stage_image_url_expiry(now=None):
+    """
+    now 시점에 서명되는 URL 의 만료 시각. 같은 값이 유지되는 동안 캐시된 URL 도 바뀌지 않는다.
+    """
+    now = time.time() if now is None else now
+    return get_stage_image_urls().expiry_for(now)
@@ -0,0 +1,302 @@
+import json
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.contrib import admin
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.authentication import invalidate_user_state
+from accounts.models import User, StoredRefreshToken
+from analytics.funnel import invalidate_funnels
+from analytics.rollups import build_rollups
+from commerce import hint_access
+from commerce.entitlements import invalidate_entitlements
+from commerce.models import AdEvent, UserEntitlement, UserStageHintAccess
+from contents import catalog
+from contents.models import Series, Episode, Stage, Hint
+from jobs.models import Job
+from logs.models import AppAccessLog, StageActivityLog
+from progress.models import UserEpisodeProgress
+from utils.admin import EstimatedCountPaginator, estimate_row_count
+from utils.query_budget import QueryBudgetExceeded, budget_for, count_queries, query_budget
+
+
+def build_fixture(n):
+    """
+    관리자 화면에 등록된 모든 모델의 행을 하나 이상 만든다.
+    """
+    user = User.objects.create_user(provider="google", provider_user_id=f"player{n}", username=f"player{n}")
+    series = Series.objects.create(code=f"S{n}", title=f"Series {n}")
+    episode = Episode.objects.create(
+        series=series,
+        code=f"EP{n}",
+        title=f"Episode {n}",
+        price_unlock_stages=1000,
+        price_unlock_with_adfree=2000,
+    )
+    second = Stage.objects.create(episode=episode, stage_no=2, title="Two", image_key="", answer_text="b")
+    first = Stage.objects.create(
+        episode=episode, stage_no=1, title="One", image_key="", answer_text="a", next_stage=second
+    )
+    Hint.objects.create(stage=first, content="hint")
+
+    now = timezone.now()
+    StoredRefreshToken.objects.create(
+        user=user,
+        token_hash=f"{n:064d}",
+        device_fingerprint="device",
+        expires_at=now + timedelta(days=1),
+    )
+    ad_event = AdEvent.objects.create(user=user, stage=first, transaction_id=f"tx{n}")
+    UserStageHintAccess.objects.create(user=user, stage=first, ad_event=ad_event)
+    UserEntitlement.objects.create(user=user, entitlement_type="ad_free")
+    UserEpisodeProgress.objects.create(user=user, episode=episode, highest_stage_no=2, current_stage_no=2)
+    AppAccessLog.objects.create(user=user, event_type="app_open", platform="android", app_version="1.0.0")
+    StageActivityLog.objects.create(user=user, stage=first, entered_at=now, exited_at=now + timedelta(seconds=30))
+    Job.objects.create(name="test.job")
+    build_rollups()
+
+    return user, episode
+
+
+def api_routes(patterns=None, prefix=""):
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from api_routes(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern) and route.startswith("api/"):
+            yield route
+
+
+class QueryBudgetHelperTests(TestCase):
+    def test_budget_is_enforced(self):
+        with query_budget(1) as queries:
+            User.objects.count()
+        self.assertEqual(len(queries), 1)
+
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with query_budget(1, label="two"):
+                User.objects.count()
+                User.objects.exists()
+        self.assertIn("two: 쿼리 2개", str(ctx.exception))
+
+    @override_settings(QUERY_BUDGETS={"api/*": 5, "api/v1/progress/*": 2}, QUERY_BUDGET_DEFAULT=9)
+    def test_most_specific_route_wins(self):
+        self.assertEqual(budget_for("api/v1/progress/sync/"), 2)
+        self.assertEqual(budget_for("api/v1/logs/batch/"), 5)
+        self.assertEqual(budget_for("admin/"), 9)
+
+    @override_settings(DEBUG=True, QUERY_BUDGET_ENABLED=True, QUERY_BUDGETS={"api/v1/progress/": 0})
+    def test_middleware(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(provider="google", provider_user_id="p"))
+
+        with self.assertRaises(QueryBudgetExceeded), self.assertLogs("django.request", "ERROR"):
+            client.get("/api/v1/progress/")
+
+        with self.settings(QUERY_BUDGET_RAISE=False):
+            response = APIClient().get("/api/v1/progress/")
+        self.assertEqual(response["X-Query-Count"], "0")
+
+
+class BudgetTestCase(TestCase):
+    def setUp(self):
+        catalog.invalidate_catalog()
+        invalidate_funnels()
+
+    def reset_caches(self, user):
+        catalog.invalidate_catalog()
+        catalog.get_catalog()
+        invalidate_funnels()
+        invalidate_entitlements(user.id)
+        hint_access.invalidate_hint_access(user.id)
+        invalidate_user_state(user.id)
+
+
+class ApiQueryBudgetTests(BudgetTestCase):
+    """
+    모든 API 라우트를 QUERY_BUDGETS 예산 안에서 호출한다. (카탈로그 스냅샷은 적재된 상태)
+    로그인 API 로 받은 Bearer 토큰으로 인증하므로, 토큰 상태 캐시가 빈 경우의 인증 조회까지 센다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user, self.episode = build_fixture(0)
+        self.user.is_staff = True
+        self.user.save(update_fields=["is_staff"])
+        self.client = APIClient()
+        self.covered = set()
+
+    def login(self):
+        self.client.credentials()
+        verifier = mock.Mock()
+        verifier.verify.return_value = {"iss": "accounts.google.com", "sub": self.user.provider_user_id}
+        with mock.patch("accounts.views.get_google_verifier", return_value=verifier):
+            tokens = self.request("post", "/api/v1/auth/google/login/", {"id_token": "token"}).data["data"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+        return tokens
+
+    def request(self, method, path, data=None, status=None, **extra):
+        route = resolve(path.split("?")[0]).route
+        self.reset_caches(self.user)
+        with count_queries() as queries:
+            response = getattr(self.client, method)(path, data, **(extra or {"format": "json"}))
+        if status is None:
+            self.assertLess(response.status_code, 400, f"{path}: {response.content[:200]}")
+        else:
+            self.assertEqual(response.status_code, status, path)
+        if len(queries) > budget_for(route):
+            raise QueryBudgetExceeded(f"{method.upper()} /{route}", budget_for(route), queries)
+        self.covered.add(route)
+        return response
+
+    @override_settings(LOGS_SINK_MODE="sync")
+    def test_every_api_route_within_budget(self):
+        ep = self.episode.id
+
+        self.request("post", "/api/v1/auth/dev/login/")
+        tokens = self.login()
+        refreshed = self.request("post", "/api/v1/auth/refresh/", {"refresh_token": tokens["refresh_token"]})
+        refresh_token = refreshed.data["data"].get("refresh_token", tokens["refresh_token"])
+        self.request("post", "/api/v1/auth/logout/", {"refresh_token": refresh_token})
+        self.request("post", "/api/v1/auth/logout/all/")
+        # 전체 로그아웃으로 토큰이 모두 폐기되었으므로 다시 로그인한다.
+        self.login()
+        self.request("get", "/api/v1/auth/me/")
+
+        self.request("get", f"/api/v1/contents/{ep}/manifest/")
+        self.request("get", f"/api/v1/contents/{ep}/1/")
+        self.request("post", f"/api/v1/contents/{ep}/1/answer/", {"answer": "a"})
+        # 광고로 연 힌트, 이용권으로 연 힌트, 잠긴 힌트
+        Hint.objects.create(stage=Stage.objects.get(episode=self.episode, stage_no=2), content="hint")
+        self.request("get", f"/api/v1/contents/{ep}/1/hint/")
+        self.request("get", f"/api/v1/contents/{ep}/2/hint/")
+        UserEntitlement.objects.filter(user=self.user).delete()
+        self.request("get", f"/api/v1/contents/{ep}/2/hint/", status=403)
+
+        with mock.patch("commerce.views.verify_admob_signature", return_value=True):
+            self.request(
+                "get",
+                "/api/v1/commerce/admob-ssv/"
+                "?user_id=player0&custom_data=EP0|1&transaction_id=tx-new&signature=sig&key_id=1",
+            )
+
+        self.request("get", "/api/v1/progress/")
+        self.request("post", f"/api/v1/progress/{ep}/advance/", {"stage_no": 2})
+        self.request("post", f"/api/v1/progress/{ep}/clear/")
+        self.request(
+            "post",
+            "/api/v1/progress/sync/",
+            {"events": [{"type": "advance", "episode_id": ep, "stage_no": no} for no in (1, 2)]},
+        )
+
+        events = [
+            {"type": "app_open", "platform": "ios", "app_version": "1.0.0", "occurred_at": "2026-03-01T00:00:00Z"},
+            {"type": "stage_activity", "episode_id": ep, "stage_no": 1, "entered_at": "2026-03-01T00:00:00Z"},
+        ]
+        self.request("post", "/api/v1/logs/batch/", json.dumps(events), content_type="application/json")
+
+        self.request("get", "/api/v1/analytics/funnel/")
+
+        self.assertEqual(set(api_routes()) - self.covered, set())
+
+
+class AdminQueryBudgetTests(BudgetTestCase):
+    """
+    관리자 목록 화면은 행 수와 관계없이 같은 수의 쿼리로 그려져야 한다. (N+1 방지)
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user = User.objects.create_superuser(email="admin@example.com", username="admin")
+        self.client.force_login(self.admin_user)
+
+    def measure(self):
+        counts = {}
+        for model in admin.site._registry:
+            url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+            self.reset_caches(self.admin_user)
+            with count_queries() as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            counts[url] = queries
+        return counts
+
+    def test_changelists_do_not_grow_with_rows(self):
+        build_fixture(0)
+        small = self.measure()
+        for n in (1, 2):
+            build_fixture(n)
+        large = self.measure()
+
+        for url, queries in large.items():
+            with self.subTest(url=url):
+                budget = budget_for(resolve(url).route)
+                if len(queries) > budget:
+                    raise QueryBudgetExceeded(f"GET {url}", budget, queries)
+                self.assertEqual(len(queries), len(small[url]), "\n".join(queries))
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(provider="google", provider_user_id="player")
+        AppAccessLog.objects.bulk_create(
+            AppAccessLog(user=user, event_type="app_open", platform=platform, app_version="1.0.0")
+            for platform in ("android", "android", "android", "ios")
+        )
+        self.logs = AppAccessLog.objects.order_by("-id")
+
+    def paginator(self, queryset):
+        return EstimatedCountPaginator(queryset, 2)
+
+    def test_exact_count_without_estimates(self):
+        with mock.patch("utils.admin.supports_estimates", return_value=False):
+            paginator = self.paginator(self.logs.filter(platform="android"))
+            self.assertEqual((paginator.count, paginator.count_label), (3, 3))
+
+    @override_settings(ADMIN_COUNT_LIMIT=2)
+    @mock.patch("utils.admin.supports_estimates", return_value=True)
+    def test_unfiltered_uses_planner_estimate(self, _):
+        with mock.patch("utils.admin.estimate_row_count", return_value=5_000_000):
+            paginator = self.paginator(self.logs)
+            self.assertEqual(paginator.count, 5_000_000)
+        self.assertEqual(paginator.num_pages, 2_500_000)
+        self.assertEqual(paginator.count_label, "약 5000000")
+
+        # 추정치가 상한보다 작으면 정확히 센다.
+        with mock.patch("utils.admin.estimate_row_count", return_value=1):
+            self.assertEqual(self.paginator(self.logs).count, 4)
+
+    @override_settings(ADMIN_COUNT_LIMIT=2)
+    @mock.patch("utils.admin.supports_estimates", return_value=True)
+    def test_filtered_count_is_capped(self, _):
+        paginator = self.paginator(self.logs.filter(platform="android"))
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 2)
+        self.assertEqual(paginator.count_label, "2+")
+
+        paginator = self.paginator(self.logs.filter(platform="ios"))
+        self.assertEqual((paginator.count, paginator.count_label), (1, 1))
+
+    @override_settings(ADMIN_COUNT_LIMIT=2)
+    @mock.patch("utils.admin.supports_estimates", return_value=True)
+    def test_changelist_skips_full_count(self, _):
+        self.client.force_login(User.objects.create_superuser(email="admin@example.com", username="admin"))
+
+        with count_queries() as queries:
+            response = self.client.get("/admin/logs/appaccesslog/?platform__exact=android")
+        self.assertContains(response, "2+")
+        # 필터된 목록을 LIMIT 으로 한 번만 센다. (전체 행 수는 세지 않음)
+        counts = [sql for sql in queries if "COUNT(" in sql.upper()]
+        self.assertEqual(len(counts), 1)
+        self.assertIn("LIMIT", counts[0].upper())
+
+    @skipUnless(connection.vendor == "postgresql", "pg_class 통계는 PostgreSQL 전용")
+    def test_estimate_from_statistics(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(AppAccessLog._meta.db_table)}")
+        self.assertEqual(estimate_row_count(AppAccessLog, "default"), 4)
@@ -4,6 +4,7 @@ python TheCode/manage.py collectstatic --noinput
 python TheCode/manage.py migrate
 
 exec gunicorn Clavis.wsgi:application \
+    --config TheCode/gunicorn.conf.py \
     --chdir TheCode \
     --bind 0.0.0.0:8000 \
     --workers 3 \